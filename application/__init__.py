@@ -49,3 +49,12 @@ def load_user(user_id):
 
 # --- Útvonalak (route-ok) betöltése ---
 from application import routes
+
+# --- CLI parancsok betöltése ---
+from application import commands
+
+# --- PDF megjelenítési környezet előtöltése (betűtípus, stílusok), hogy az első riport se várjon rá ---
+# --- (a PDF folyamatkészletet a gunicorn worker indítja, lásd gunicorn.conf.py) ---
+if app.config['PDF_WARM_UP']:
+    from application.utils.pdf_generator import warm_up
+    warm_up()
@@ -0,0 +1,180 @@
+import click
+from application import app, db
+
+
+# ----------------------------------------------------------------------
+# FLASK CLI PARANCSOK
+# - Karbantartási műveletek (flask --app application <parancs>)
+# ----------------------------------------------------------------------
+
+# --- Havi reklamáció összesítő tábla újraépítése ---
+@app.cli.command('rebuild-rollup')
+def rebuild_rollup_command():
+    """A complaint_monthly_rollup tábla teljes újraépítése a complaints táblából."""
+    from application.utils.rollup import rebuild_rollup
+
+    try:
+        row_count = rebuild_rollup()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    click.echo(f"A havi összesítő újraépítve: {row_count} sor.")
+
+
+# --- Státusz kizárása a statisztikákból / visszavétele ---
+@app.cli.command('status-stats')
+@click.argument('status_name')
+@click.option('--exclude/--include', default=True,
+              help='Kizárja (alapértelmezett) vagy visszaveszi a státuszt a statisztikákba.')
+def status_stats_command(status_name, exclude):
+    """Egy státusz statisztikákba számításának beállítása és a reklamációk jelzőjének frissítése."""
+    from application.models import Status
+    from application.utils.rollup import set_status_stats_exclusion
+
+    status = Status.query.filter_by(name=status_name).first()
+    if status is None:
+        raise click.ClickException(f"Nincs ilyen státusz: {status_name}")
+
+    try:
+        affected = set_status_stats_exclusion(status, exclude)
+    except Exception:
+        db.session.rollback()
+        raise
+    state = 'kizárva a statisztikákból' if exclude else 'beleszámít a statisztikákba'
+    click.echo(f"'{status.display_name}' státusz: {state} ({affected} reklamáció frissítve).")
+
+
+# --- Reklamációk exportálása fájlba (CSV / XLSX) ---
+@app.cli.command('export-complaints')
+@click.option('--format', 'export_format', type=click.Choice(['csv', 'xlsx']), default='csv', show_default=True)
+@click.option('--start', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Időszak kezdete (ÉÉÉÉ-HH-NN).')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None, help='Időszak vége (ÉÉÉÉ-HH-NN).')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True), default=None,
+              help='Kimeneti fájl (alapértelmezés: reklamaciok_<időszak>.<formátum>, "-" = standard kimenet).')
+def export_complaints_command(export_format, start, end, output):
+    """Reklamációk streamelt exportálása állandó memóriaigénnyel."""
+    from application.utils.export import stream_export, export_filename
+
+    start = start.date() if start else None
+    end = end.date() if end else None
+    output = output or export_filename(export_format, start, end)
+
+    with click.open_file(output, 'wb') as target:
+        for chunk in stream_export(export_format, start, end):
+            target.write(chunk)
+    if output != '-':
+        click.echo(f"Export elkészült: {output}")
+
+
+# --- Olvasási modellek mérése: ORM objektumok vs. named tuple sorok ---
+@app.cli.command('bench-read-models')
+@click.option('--rows', 'row_limit', type=int, default=100000, show_default=True, help='Betöltendő reklamációk száma.')
+def bench_read_models_command(row_limit):
+    """A reklamáció lista betöltésének ideje és csúcsmemóriája ORM hidratálással és read modellel."""
+    import gc
+    import time
+    import tracemalloc
+    from sqlalchemy.orm import joinedload
+    from application.models import Reklamacio
+    from application.utils.read_models import reklamacio_rows_query, to_reklamacio_rows
+
+    def load_orm():
+        options = [joinedload(getattr(Reklamacio, name), innerjoin=True)
+                   for name in ('user', 'department', 'customer', 'product', 'defect_type', 'status')]
+        rows = Reklamacio.query.options(*options)\
+            .order_by(Reklamacio.complaint_date.desc(), Reklamacio.id.desc()).limit(row_limit).all()
+        return [(r.id, r.customer.display_name, r.product.display_name, r.status.name, r.user.surname) for r in rows]
+
+    def load_rows():
+        rows = to_reklamacio_rows(reklamacio_rows_query()
+                                  .order_by(Reklamacio.complaint_date.desc(), Reklamacio.id.desc()).limit(row_limit).all())
+        return [(r.id, r.customer, r.product_name, r.status, r.user_surname) for r in rows]
+
+    for name, loader in (('ORM objektumok', load_orm), ('Read model sorok', load_rows)):
+        db.session.expunge_all()
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        result = loader()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        click.echo(f"{name:<18} {len(result):>8} sor  {elapsed:8.3f} s  csúcsmemória: {peak / 1024 / 1024:8.1f} MiB")
+        del result
+
+
+# --- Dashboard statisztikák mérése: lekérdezésszám és futásidő ---
+@app.cli.command('bench-dashboard')
+@click.option('--repeat', type=int, default=50, show_default=True, help='Ismétlések száma.')
+def bench_dashboard_command(repeat):
+    """A dashboard statisztikák (get_dashboard_stats) lekérdezésszáma és átlagos futásideje, cache nélkül."""
+    import time
+    from sqlalchemy import event
+    from application.utils.helpers import get_dashboard_stats
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            get_dashboard_stats()
+        elapsed = (time.perf_counter() - started) / repeat
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+    click.echo(f"get_dashboard_stats: {len(statements) / repeat:.0f} lekérdezés / hívás  {elapsed * 1000:8.2f} ms / hívás")
+
+
+# --- PDF riport generálás mérése: megjelenítési környezet riportonként újratöltve vs. egyszer betöltve ---
+@app.cli.command('bench-pdf')
+@click.option('--reports', 'report_count', type=int, default=20, show_default=True, help='Generált riportok száma.')
+@click.option('--categories', type=int, default=10, show_default=True, help='Kategóriák száma riportonként.')
+def bench_pdf_command(report_count, categories):
+    """Egy riport PDF átlagos generálási ideje betűtípus/stílus újratöltéssel és előtöltött környezettel."""
+    import time
+    from application.utils.pdf_generator import generate_report_pdf, render_context, warm_up
+
+    labels = [f"Kategória {i + 1}" for i in range(categories)]
+    values = [float((i * 37) % 101 + 1) for i in range(categories)]
+
+    def cold():
+        render_context.cache_clear()
+        return generate_report_pdf(labels, values, "Mérés", 'bar')
+
+    def warm():
+        return generate_report_pdf(labels, values, "Mérés", 'bar')
+
+    warm_up()
+    for name, render in (('Újratöltéssel', cold), ('Előtöltve', warm)):
+        started = time.perf_counter()
+        for _ in range(report_count):
+            render()
+        elapsed = (time.perf_counter() - started) / report_count
+        click.echo(f"{name:<14} {report_count:>5} riport  {elapsed * 1000:8.1f} ms / riport")
+
+
+@app.cli.command('bench-pdf-charts')
+@click.option('--reports', 'report_count', type=int, default=5, show_default=True, help='Generált riportok száma esetenként.')
+def bench_pdf_charts_command(report_count):
+    """Riport PDF generálási ideje és mérete vektoros és PNG diagrammal, diagram típusonként és kategóriaszámonként."""
+    import time
+    from application.utils.pdf_generator import generate_report_pdf, warm_up
+
+    warm_up()
+    click.echo(f"{'Diagram':<6} {'Kat.':>5}  {'vektor ms':>10} {'PNG ms':>10}  {'vektor KB':>10} {'PNG KB':>10}")
+    for chart_type in ('bar', 'line', 'pie'):
+        for categories in (10, 100, 1000):
+            labels = [f"Kategória {i + 1}" for i in range(categories)]
+            values = [float((i * 37) % 101 + 1) for i in range(categories)]
+            results = {}
+            for chart_format in ('vector', 'png'):
+                started = time.perf_counter()
+                for _ in range(report_count):
+                    size = len(generate_report_pdf(labels, values, "Mérés", chart_type, chart_format=chart_format).getvalue())
+                results[chart_format] = ((time.perf_counter() - started) / report_count * 1000, size / 1024)
+            click.echo(f"{chart_type:<6} {categories:>5}  {results['vector'][0]:10.1f} {results['png'][0]:10.1f}"
+                       f"  {results['vector'][1]:10.1f} {results['png'][1]:10.1f}")
@@ -3,6 +3,8 @@ from wtforms import StringField, SubmitField, PasswordField, BooleanField, Selec
 from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError, NumberRange, Regexp
 from application.models import User, Reklamacio, Role, Position
 from wtforms_sqlalchemy.fields import QuerySelectField
+from application.utils.report_engine import report_choices, pivot_choices, measure_choices, REPORT_CRITERIA, TOP_N_CHOICES
+from application.utils.time_buckets import granularity_choices, comparison_choices, DEFAULT_GRANULARITY
 
 
 # ----------------------------------------------------------------------
@@ -207,15 +209,24 @@ class ReportFilterForm(FlaskForm):
     end_date = DateField('Záró dátum', format='%Y-%m-%d', validators=[DataRequired()])
     
     # --- Adatok csoportosítása ---
-    group_by = SelectField('Csoportosítás szempontja', choices=[
-        ('defect_type', 'Hiba típusa szerint'),
-        ('customer', 'Vevő szerint'),
-        ('product', 'Termék szerint'),
-        ('status', 'Státusz szerint'),
-        ('department', 'Üzemegység szerint'),
-        ('monthly_cost', 'Össz. költség havi bontásban'),
-        ('monthly_count', 'Össz. hiba havi bontásban')
-    ], validators=[DataRequired()])
+    # --- A választék a riport motor nyilvántartásából készül (report_engine.py) ---
+    group_by = SelectField('Csoportosítás szempontja', choices=report_choices(), validators=[DataRequired()])
+
+    # --- Mérőszám (pl. medián költség); üres: a szempont saját mérőszáma ---
+    measure = SelectField('Mérőszám', choices=measure_choices(), default='')
+
+    # --- Időbeli bontás időszak típusa (időbeli szempontnál és 'Időszak' bontásnál) ---
+    granularity = SelectField('Időszak', choices=granularity_choices(), default=DEFAULT_GRANULARITY)
+
+    # --- Összehasonlítás az előző időszakkal / előző évvel (egydimenziós riportnál) ---
+    compare = SelectField('Összehasonlítás', choices=comparison_choices(), default='')
+
+    # --- Top-N (Pareto) mód: a legnagyobb N kategória, a többi 'Egyéb' (havi bontásnál nincs hatása) ---
+    top_n = SelectField('Megjelenített kategóriák', choices=TOP_N_CHOICES, coerce=int, default=0)
+
+    # --- Második dimenzió (kereszttábla); üres: egydimenziós riport ---
+    pivot_by = SelectField('Bontás', choices=pivot_choices(), default='')
+    subtotals = BooleanField('Részösszegek')
 
     # --- Diagram típus ---
     chart_type = SelectField('Diagram típusa', choices=[
@@ -226,6 +237,17 @@ class ReportFilterForm(FlaskForm):
 
     submit = SubmitField('Riport generálása')
 
+    # --- Egyedi validátor: a bontás nem lehet azonos a csoportosítás dimenziójával ---
+    def validate_pivot_by(self, pivot_by):
+        criterion = REPORT_CRITERIA.get(self.group_by.data)
+        if pivot_by.data and criterion and criterion.dimension == pivot_by.data:
+            raise ValidationError("A bontás nem lehet azonos a csoportosítás szempontjával")
+
+    # --- Egyedi validátor: összehasonlítás csak bontás nélküli riportnál ---
+    def validate_compare(self, compare):
+        if compare.data and self.pivot_by.data:
+            raise ValidationError("Összehasonlítás kereszttáblás riportnál nem kérhető")
+
 
 # ----------------------------------------------------------------------
 # ELFELEJTETT JELSZÓ
@@ -266,5 +288,13 @@ class SendReportEmailForm(FlaskForm):
     start_date = StringField()
     end_date = StringField()
     group_by = StringField()
+    pivot_by = StringField()
+    subtotals = StringField()
+    top_n = StringField()
+    measure = StringField()
+    granularity = StringField()
+    compare = StringField()
     chart_type = StringField()
+    # --- Teljes riport (minden szempont egy PDF-ben) a jelenlegi riport helyett ---
+    bundle = BooleanField('Teljes riport (minden szempont)')
     submit = SubmitField('Küldés')
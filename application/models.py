@@ -1,4 +1,5 @@
 from application import db, login_manager
+from sqlalchemy.orm import validates, joinedload
 from flask_login import UserMixin
 from datetime import date
 
@@ -6,7 +7,8 @@ from datetime import date
 # --- Flask-Login: betölt egy felhasználót az ID alapján ---
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    # --- A szerepkör minden oldalon kell (menü, jogosultság), ezért egy lekérdezésben töltődik ---
+    return User.query.options(joinedload(User.role)).get(int(user_id))
 
 
 # ----------------------------------------------------------------------
@@ -110,6 +112,9 @@ class Status(db.Model):
     name = db.Column(db.String(50), nullable=False, unique=True)
     display_name = db.Column(db.String(100), nullable=False)
 
+    # --- Kimarad-e a statisztikákból (pl. visszautasított reklamációk) ---
+    excluded_from_stats = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
 
 
 # ----------------------------------------------------------------------
@@ -128,6 +133,11 @@ class Reklamacio(db.Model):
     shipping_date = db.Column(db.Date, nullable=True)
     total_cost = db.Column(db.Integer, nullable=True, default=0)
 
+    # --- PostgreSQL-en: generált 'search_vector' tsvector oszlop (csak migrációban, a search.py használja) ---
+
+    # --- Denormalizált jelző: beleszámít-e a statisztikákba (a státuszból, lásd set_status_flag) ---
+    counts_in_stats = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+
     # --- Külső kulcsok (Foreign Keys) ---
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), nullable=False)
@@ -144,7 +154,73 @@ class Reklamacio(db.Model):
     defect_type = db.relationship('DefectType', backref=db.backref('reklamaciok', lazy=True))
     status = db.relationship('Status', backref=db.backref('reklamaciok', lazy=True))
 
+    # --- Indexek a gyakori lekérdezésekhez ---
+    # - Listák és a legfrissebb reklamációk: (dátum, id) csökkenő sorrendben
+    # - Riportok: dátumtartomány szűrés + csoportosítás külső kulcs szerint
+    __table_args__ = (
+        db.Index('ix_complaints_date_desc_id_desc', complaint_date.desc(), id.desc()),
+        db.Index('ix_complaints_date_status', complaint_date, status_id),
+        db.Index('ix_complaints_date_defect_type', complaint_date, defect_type_id),
+        db.Index('ix_complaints_date_customer', complaint_date, customer_id),
+        db.Index('ix_complaints_date_product', complaint_date, product_id),
+        db.Index('ix_complaints_date_department', complaint_date, department_id),
+        db.Index('ix_complaints_stats_date', complaint_date,
+                 postgresql_where=counts_in_stats.is_(True), sqlite_where=counts_in_stats.is_(True)),
+        # - Lista keresés törzsadat megnevezésre: reklamációk a feloldott külső kulcs ID-k szerint
+        db.Index('ix_complaints_customer_id', customer_id),
+        db.Index('ix_complaints_product_id', product_id),
+        db.Index('ix_complaints_defect_type_id', defect_type_id),
+        db.Index('ix_complaints_user_id', user_id),
+    )
+
+    # --- Betöltési profilok: nézetenként egyetlen JOIN-os lekérdezés (N+1 helyett) ---
+    # - A csak olvasó listák és JSON API-k nem ORM objektumokat töltenek be (read_models.py)
+    # - detail: módosító / törlő oldal (űrlap mezők)
+    # - notification: értesítő e-mail sablon
+    LOAD_PROFILES = {
+        'detail': ('department', 'customer', 'product', 'defect_type', 'status'),
+        'notification': ('user', 'customer', 'product', 'defect_type', 'status'),
+    }
+
+    @classmethod
+    def loading(cls, profile):
+        """ A profil kapcsolatainak betöltési opciói, pl. query.options(*Reklamacio.loading('detail')). """
+        return [joinedload(getattr(cls, name), innerjoin=True) for name in cls.LOAD_PROFILES[profile]]
+
+    # --- A statisztikai jelző szinkronban tartása státusz beállításakor ---
+    @validates('status')
+    def set_status_flag(self, key, status):
+        self.counts_in_stats = not (status is not None and status.excluded_from_stats)
+        return status
+
     def __repr__(self):
         return f"<Reklamacio {self.complaint_number}>"
 
 
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓ HAVI ÖSSZESÍTŐ (Rollup)
+# - Inkrementálisan karbantartott havi összegek a dashboardokhoz és riportokhoz
+# ----------------------------------------------------------------------
+class ComplaintMonthlyRollup(db.Model):
+    __tablename__ = 'complaint_monthly_rollup'
+
+    # --- Összetett kulcs: időszak és dimenziók ---
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    month = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), primary_key=True, autoincrement=False)
+    customer_id = db.Column(db.Integer, db.ForeignKey('customers.id'), primary_key=True, autoincrement=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'), primary_key=True, autoincrement=False)
+    defect_type_id = db.Column(db.Integer, db.ForeignKey('defect_types.id'), primary_key=True, autoincrement=False)
+    status_id = db.Column(db.Integer, db.ForeignKey('statuses.id'), primary_key=True, autoincrement=False)
+
+    # --- Statisztikai jelző (a status_id-ből származik, lásd Status.excluded_from_stats) ---
+    counts_in_stats = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())
+
+    # --- Összesített értékek ---
+    complaint_count = db.Column(db.Integer, nullable=False, default=0)
+    quantity_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    cost_sum = db.Column(db.BigInteger, nullable=False, default=0)
+    return_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ComplaintMonthlyRollup {self.year}-{self.month:02d} ({self.complaint_count} db)>"
@@ -1,16 +1,30 @@
-from flask import render_template, redirect, url_for, flash, request, jsonify
+from flask import render_template, redirect, url_for, flash, request, jsonify, Response, stream_with_context, abort
 from flask_login import login_user, current_user, login_required, logout_user
 from application import app, db, bcrypt
 from application.models import User, Reklamacio, Department, Customer, Product, DefectType, Status, Role, Position
 from application.forms import NewUserForm, LoginForm, UpdateUserForm, DeactivateAccountForm, ActivateAccountForm, ChangePasswordForm, NewReklamacioForm, UpdateReklamacioForm, DeleteReklamation, ReportFilterForm, ForgotPasswordForm, ResetPasswordForm, SendReportEmailForm
 from application.utils.auth_role import roles_required
-from application.utils.helpers import get_or_create_dynamic, get_dashboard_stats, HONAPOK_TELJES
+from application.utils.helpers import get_or_create_dynamic, get_cached_dashboard_stats, get_cached_recent_reklamaciok, HONAPOK_TELJES
 from application.utils.email_service import send_password_reset_email, verify_reset_token, send_report_email, send_reklamacio_notification_email
-from sqlalchemy import func
 from datetime import date, timedelta, datetime
+import json
+import time
 from flask import send_file
-from application.utils.pdf_generator import generate_report_pdf
-
+from application.utils.pdf_pool import pdf_pool, PdfRenderUnavailable
+from application.utils.rollup import rollup_add, rollup_remove, rollup_snapshot
+from application.utils.report_engine import (
+    get_report, get_pivot, get_report_bundle, bundle_chart_type, REPORT_CRITERIA, DIMENSIONS, MEASURES,
+    InvalidPivotRequest, top_n_value
+)
+from application.utils.time_buckets import GRANULARITIES, DEFAULT_GRANULARITY, COMPARISONS
+from application.utils.cache import shared_cache, invalidate_complaint_data
+from application.utils.http_cache import conditional_json
+from application.utils.events import data_change_bus, dashboard_streams
+from application.utils.datatables import reklamaciok_datatable
+from application.utils.keyset import reklamaciok_page, InvalidPageRequest
+from application.utils.search import search_reklamaciok, DEFAULT_SEARCH_LIMIT
+from application.utils.export import stream_export, export_filename, EXPORT_FORMATS
+from application.utils.read_models import user_rows
 
 
 # ----------------------------------------------------------------------
@@ -19,8 +33,8 @@ from application.utils.pdf_generator import generate_report_pdf
 @app.route('/home')
 @login_required
 def home():
-    # --- Kiszervezett logika meghívása ---
-    count, cost, year_cost, return_count, monthly_data, dept_data = get_dashboard_stats()
+    # --- Kiszervezett logika meghívása (megosztott cache-en keresztül) ---
+    stats = get_cached_dashboard_stats()
     
     # --- Aktuális hónap sorszámának lekérése (1-12) és a listából a megfelelő név kiválasztása ---
     # --- A listák indexelése 0-tól (month - 1) ---
@@ -32,69 +46,129 @@ def home():
     # --- Változók átadása a sablonnak ---
     return render_template('main/dashboard.html', 
                          title='Áttekintés',
-                         current_month_count=count,
-                         current_month_cost=cost,
-                         current_year_cost=year_cost,
-                         current_return_count=return_count,
+                         current_month_count=stats.count,
+                         current_month_cost=stats.cost,
+                         current_year_cost=stats.year_cost,
+                         current_return_count=stats.return_count,
                          current_month_name=current_month_name,
                          current_year=current_year)
 
 
 # ----------------------------------------------------------------------
 # STATISZTIKAI API
+# - ETag / Last-Modified: változatlan adatnál 304 (http_cache.py)
 # ----------------------------------------------------------------------
 @app.route('/api/dashboard-stats')
 @login_required
+@conditional_json
 def dashboard_stats_api():
-    # --- Kiszervezett logika meghívása ---
-    count, cost, year_cost, return_count, monthly_data, dept_data = get_dashboard_stats()
+    # --- Kiszervezett logika meghívása (megosztott cache-en keresztül) ---
+    stats = get_cached_dashboard_stats()
     
     # --- Adatok visszaadása JSON formátumban ---
-    return jsonify({
-        'count': count,
-        'cost': cost,
-        'year_cost': year_cost,
-        'return_count': return_count,
-        'monthly_data': monthly_data,
-        'dept_data': dept_data
-    })
+    return jsonify(stats._asdict())
 
 
 # ----------------------------------------------------------------------
 # TÁBLÁZAT API
+# - ETag / Last-Modified: változatlan adatnál 304 (http_cache.py)
 # ----------------------------------------------------------------------
 @app.route('/api/recent-reklamaciok')
 @login_required
+@conditional_json
 def api_recent_reklamaciok():
-    # --- 5 legfrissebb reklamáció (dátum szerint rendezve) ---
-    recent_rekl = Reklamacio.query.order_by(
-        Reklamacio.complaint_date.desc(), 
-        Reklamacio.id.desc()
-    ).limit(5).all()
-    
-    # --- Lekért adatok JSON-kompatibilis alakítása ---
-    data = []
-    for r in recent_rekl:
-        data.append({
-            "id": r.id,
-            "date": r.complaint_date.strftime('%Y-%m-%d') if r.complaint_date else '-',
-            "customer": r.customer.display_name,
-            "product_name": r.product.display_name,
-            "product_id": r.product_identifier,
-            "defect": r.defect_type.display_name,
-            "quantity": r.quantity,
-            "status": r.status.name,
-            "complaint_number": r.complaint_number,
-            "department": r.department.display_name,
-            "requires_return": r.requires_return,
-            "shipping_date": r.shipping_date.strftime('%Y-%m-%d') if r.shipping_date else '-',
-            "cost": r.total_cost or 0,
-            "user": f"{r.user.surname} {r.user.forename}"
-        })
+    # --- 5 legfrissebb reklamáció (dátum szerint rendezve, megosztott cache-en keresztül) ---
+    data = get_cached_recent_reklamaciok()
         
     # --- DataTables kompatibilis JSON válasz ---
     return jsonify({"data": data})
 
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓK JSON API (keyset lapozás, külső eszközök számára)
+# - Szűrők: date_from, date_to, status, customer, department, product
+# - Következő oldal: a válasz next_cursor értéke a cursor paraméterben
+# ----------------------------------------------------------------------
+@app.route('/api/reklamaciok')
+@login_required
+@conditional_json
+def api_reklamaciok():
+    try:
+        page = reklamaciok_page(request.args)
+    except InvalidPageRequest as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(page)
+
+
+# ----------------------------------------------------------------------
+# ÉLŐ DASHBOARD STREAM (Server-Sent Events)
+# - Csak reklamáció írásakor (adatverzió változás) küld új adatot
+# - A workerek közötti értesítés a megosztott adatverzión keresztül (events.py)
+# - Workerenként legfeljebb SSE_MAX_STREAMS egyidejű stream (mindegyik egy szálat foglal);
+#   a korlát felett 503, a dashboard ekkor percenkénti lekérdezéssel frissül
+# ----------------------------------------------------------------------
+@app.route('/api/stream/dashboard')
+@login_required
+def dashboard_stream():
+    if not dashboard_streams.try_acquire(app.config['SSE_MAX_STREAMS']):
+        return Response("Túl sok élő dashboard kapcsolat, lekérdezéses frissítés.", status=503,
+                        headers={'Retry-After': str(app.config['SSE_MAX_DURATION'])}, mimetype='text/plain')
+
+    heartbeat = app.config['SSE_HEARTBEAT_INTERVAL']
+    deadline = time.monotonic() + app.config['SSE_MAX_DURATION']
+
+    # --- Újracsatlakozáskor a böngésző által utoljára látott esemény azonosítója ---
+    last_event_id = request.headers.get('Last-Event-ID')
+
+    def event_stream():
+        yield "retry: 5000\n\n"
+        version = data_change_bus.version()
+
+        # --- Kezdő adatcsomag, hacsak a kliens már ezt a változatot látta ---
+        event_id = f"{version}-{date.today()}"
+        if event_id != last_event_id:
+            yield _dashboard_event(event_id)
+
+        while time.monotonic() < deadline:
+            new_version = data_change_bus.wait_for_change(version, timeout=heartbeat)
+            if new_version == version:
+                # --- Életjel (komment sor), hogy a proxyk ne zárják le a kapcsolatot ---
+                yield ": keepalive\n\n"
+                continue
+
+            version = new_version
+            yield _dashboard_event(f"{version}-{date.today()}")
+
+    response = Response(stream_with_context(event_stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    # --- A hely a válasz lezárásakor szabadul fel (akkor is, ha a kliens az első adat előtt bontott) ---
+    response.call_on_close(dashboard_streams.release)
+    return response
+
+
+def _dashboard_event(event_id):
+    """ Egy 'dashboard' SSE esemény a statisztikákkal és a legfrissebb reklamációkkal. """
+    payload = {
+        'stats': get_cached_dashboard_stats()._asdict(),
+        'recent': get_cached_recent_reklamaciok()
+    }
+
+    # --- Az adatbázis-kapcsolat visszaadása a poolnak a következő eseményig ---
+    db.session.remove()
+    return f"id: {event_id}\nevent: dashboard\ndata: {json.dumps(payload)}\n\n"
+
+
+# ----------------------------------------------------------------------
+# CACHE STATISZTIKA API (Admin)
+# - Találat / hiány számlálók a megosztott cache-hez
+# ----------------------------------------------------------------------
+@app.route('/api/cache-stats')
+@login_required
+@roles_required('admin')
+def cache_stats_api():
+    return jsonify(shared_cache.stats())
+
     
 # ----------------------------------------------------------------------
 # REGISZTRÁCIÓ (Admin)
@@ -243,10 +317,8 @@ def account():
 @roles_required('admin')
 def profiles():
     status = request.args.get('status', 'active')
-    if status == 'inactive':
-        users = User.query.filter_by(is_active=False).order_by(User.id.desc()).all()
-    else:
-        users = User.query.filter_by(is_active=True).order_by(User.id.desc()).all()
+    # --- Csak a megjelenített oszlopok, a beosztás és a szerepkör megnevezésével (read_models.py) ---
+    users = user_rows(is_active=(status != 'inactive'))
     return render_template('user/users.html', title='Felhasználók', users=users, status=status)
 
 
@@ -487,9 +559,11 @@ def uj_reklamacio():
                 status=final_status
             )
 
-            # --- Tranzakció lezárása ---
+            # --- Tranzakció lezárása (havi összesítő frissítésével együtt) ---
             db.session.add(uj_reklamacio)
+            rollup_add(uj_reklamacio)
             db.session.commit()
+            invalidate_complaint_data()
             
             # --- E-mail értesítés ---
             send_reklamacio_notification_email("Új", uj_reklamacio)
@@ -515,13 +589,34 @@ def uj_reklamacio():
 
 # ----------------------------------------------------------------------
 # REKLAMÁCIÓK MEGJELENÍTÉSE
+# - A sorokat a táblázat a /api/reklamaciok/datatable végpontról tölti be oldalanként
 # ----------------------------------------------------------------------
 @app.route("/reklamaciok")
 @login_required
 def reklamaciok():
-    # --- Összes reklamációt csökkenő dátum szerint ---
-    rekl = Reklamacio.query.order_by(Reklamacio.complaint_date.desc()).all()
-    return render_template('reklamacio/reklamaciok.html', title='Reklamációk', rekl=rekl)
+    return render_template('reklamacio/reklamaciok.html', title='Reklamációk')
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓK TÁBLÁZAT API (DataTables szerveroldali feldolgozás)
+# - Szűrés, rendezés, lapozás SQL-ben (datatables.py)
+# ----------------------------------------------------------------------
+@app.route("/api/reklamaciok/datatable")
+@login_required
+def api_reklamaciok_datatable():
+    return jsonify(reklamaciok_datatable(request.args))
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓ KERESÉS API (relevancia szerint rendezve)
+# - PostgreSQL: teljes szöveges + trigram indexek (search.py)
+# ----------------------------------------------------------------------
+@app.route("/api/reklamaciok/search")
+@login_required
+@conditional_json
+def api_reklamaciok_search():
+    results = search_reklamaciok(request.args.get('q', ''), request.args.get('limit', DEFAULT_SEARCH_LIMIT, type=int))
+    return jsonify({"data": results})
 
 
 # ----------------------------------------------------------------------
@@ -534,8 +629,8 @@ def reklamaciok():
 @roles_required('super_user')
 def modosit_reklamacio(reklamacio_id):
     
-    # --- Reklamáció lekérése az adatbázisból (vagy 404) ---
-    reklamacio = Reklamacio.query.get_or_404(reklamacio_id)
+    # --- Reklamáció lekérése az adatbázisból a kapcsolataival együtt (vagy 404) ---
+    reklamacio = Reklamacio.query.options(*Reklamacio.loading('detail')).get_or_404(reklamacio_id)
     
     # --- Űrlap példányosítása az eredeti számmal a validáláshoz ---
     form = UpdateReklamacioForm(original_complaint_number=reklamacio.complaint_number)
@@ -578,6 +673,9 @@ def modosit_reklamacio(reklamacio_id):
 
         any_important_change = status_changed or quantity_changed or requires_return_changed or cost_changed
 
+        # --- Havi összesítő: a módosítás előtti hozzájárulás mentése ---
+        rollup_before = rollup_snapshot(reklamacio)
+
         # --- Adatok frissítése az objektumban (UPDATE) ---
         reklamacio.complaint_date = form.complaint_date.data
         reklamacio.complaint_number = form.complaint_number.data
@@ -595,9 +693,12 @@ def modosit_reklamacio(reklamacio_id):
         reklamacio.defect_type = final_defect
         reklamacio.status = final_status
 
-        # --- Tranzakció lezárása ---
+        # --- Tranzakció lezárása (havi összesítő frissítésével együtt) ---
         try:
+            rollup_remove(rollup_before)
+            rollup_add(reklamacio)
             db.session.commit()
+            invalidate_complaint_data()
             
             # --- E-mail értesítés ha fontos adat változott ---
             if any_important_change:
@@ -653,8 +754,8 @@ def modosit_reklamacio(reklamacio_id):
 @roles_required('super_user')
 def torol_reklamacio(reklamacio_id):
 
-    # --- Reklamáció lekérése az adatbázisból (vagy 404) ---
-    reklamacio = Reklamacio.query.get_or_404(reklamacio_id)
+    # --- Reklamáció lekérése az adatbázisból (vagy 404), az értesítő e-mail kapcsolataival együtt ---
+    reklamacio = Reklamacio.query.options(*Reklamacio.loading('notification')).get_or_404(reklamacio_id)
     form = DeleteReklamation()
 
     # --- Törlési szándék megerősítése (POST) ---
@@ -663,9 +764,12 @@ def torol_reklamacio(reklamacio_id):
         # --- E-mail értesítés elküldése még a törlés/tranzakció előtt ---
         send_reklamacio_notification_email("Törölt", reklamacio)
 
-        # --- Rekord eltávolítása és véglegesítés ---
+        # --- Rekord eltávolítása, havi összesítő frissítése és véglegesítés ---
+        rollup_before = rollup_snapshot(reklamacio)
         db.session.delete(reklamacio)
+        rollup_remove(rollup_before)
         db.session.commit()
+        invalidate_complaint_data()
         flash(f"A {reklamacio.complaint_number} reklamáció törlésre került.", "success")
         return redirect(url_for('reklamaciok'))
 
@@ -691,105 +795,77 @@ def reports():
     chart_labels = []
     chart_values = []
     chart_type = 'bar'
+    unit = 'db'
+    pivot = None
+    cumulative_percent = None
+    comparison = None
+    outliers = None
+    measure_label = None
 
     # --- Bejövő form adatok érvényesítése (POST) ---
     if form.validate_on_submit():
-        start = form.start_date.data
-        end = form.end_date.data
-        group_criterion = form.group_by.data
         chart_type = form.chart_type.data
 
-        # --- Lekérdezés alapja (inicializálás) ---
-        query = None
-
-        # --- Dinamikus lekérdezés összeállítása a kritérium alapján ---
-
-        # --- Hiba típus ---
-        if group_criterion == 'defect_type':
-            query = db.session.query(DefectType.display_name, func.count(Reklamacio.id))\
-                .join(Reklamacio.defect_type)\
-                .group_by(DefectType.display_name)
-        
-        # --- Vevő ---
-        elif group_criterion == 'customer':
-            query = db.session.query(Customer.display_name, func.count(Reklamacio.id))\
-                .join(Reklamacio.customer)\
-                .group_by(Customer.display_name)
-        
-        # --- Termék ---
-        elif group_criterion == 'product':
-            query = db.session.query(Product.display_name, func.count(Reklamacio.id))\
-                .join(Reklamacio.product)\
-                .group_by(Product.display_name)
-
-        # --- Státusz ---
-        elif group_criterion == 'status':
-            query = db.session.query(Status.display_name, func.count(Reklamacio.id))\
-                .join(Reklamacio.status)\
-                .group_by(Status.display_name)
-            
-        # --- Üzemegység ---
-        elif group_criterion == 'department':
-            query = db.session.query(Department.display_name, func.count(Reklamacio.id))\
-                .join(Reklamacio.department)\
-                .group_by(Department.display_name)
-
-        # --- Havi költség ---
-        elif group_criterion == 'monthly_cost':
-            month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-            query = db.session.query(month_format, func.sum(Reklamacio.total_cost))\
-                .group_by(month_format)\
-                .order_by(month_format)
-
-        # --- Havi darabszám ---   
-        elif group_criterion == 'monthly_count':
-            month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-            query = db.session.query(month_format, func.count(Reklamacio.id))\
-                .group_by(month_format)\
-                .order_by(month_format)
-
-        # --- Lekérdezés futtatása és szűrés ---
-        if query:
-            results = query.filter(Reklamacio.complaint_date.between(start, end)).all()
-
-            # --- Nulla-feltöltés a havi statisztikákhoz ---
-            if group_criterion in ['monthly_cost', 'monthly_count']:
-                # --- Szótár az SQL eredményekből a gyors kereséshez ---
-                result_dict = {str(row[0]): (float(row[1]) if row[1] is not None else 0) for row in results}
-
-                # --- Kezdő és végdátum ---
-                current_date = date(start.year, start.month, 1)
-                end_date_limit = date(end.year, end.month, 1)
-
-                while current_date <= end_date_limit:
-                    month_str = current_date.strftime('%Y-%m')
-                    chart_labels.append(month_str)
-                    
-                    # --- Ha van adat a szótárban bekerül, ha nincs, akkor 0.0 kerül be ---
-                    chart_values.append(result_dict.get(month_str, 0.0))
-
-                    # --- Léptetés a következő hónapra ---
-                    if current_date.month == 12:
-                        current_date = date(current_date.year + 1, 1, 1)
-                    else:
-                        current_date = date(current_date.year, current_date.month + 1, 1)
-
-            # --- Adatok szétválogatása a Chart.js számára ---
-            else:
-                for row in results:
-                    # --- row[0]: Kategória név vagy Hónap ---
-                    # --- row[1]: Darabszám vagy Összeg ---
-                    chart_labels.append(str(row[0]) if row[0] else "Nincs adat")
-                    
-                    # --- Biztonságos típuskonverzió: ha a sum() None-t adna vissza, legyen 0 ---
-                    val = row[1] if row[1] is not None else 0
-                    chart_values.append(float(val))
+        # --- Riport a riport motorból (report_engine.py, megosztott cache-en keresztül) ---
+        if form.pivot_by.data:
+            try:
+                pivot = get_pivot(form.group_by.data, form.pivot_by.data, form.start_date.data, form.end_date.data,
+                                  form.subtotals.data, form.granularity.data, form.measure.data or None)
+            except InvalidPivotRequest:
+                abort(400)
+            unit = pivot.unit
+        else:
+            report = get_report(form.group_by.data, form.start_date.data, form.end_date.data,
+                                form.top_n.data, form.granularity.data, form.compare.data or None,
+                                form.measure.data or None)
+            chart_labels = report.labels
+            chart_values = report.values
+            cumulative_percent = report.cumulative_percent
+            comparison = {'label': report.comparison_label, 'values': report.comparison_values} \
+                if report.comparison_values is not None else None
+            outliers = report.outliers
+            measure_label = report.measure_label
+            unit = report.unit
 
     return render_template('main/reports.html', 
                            form=form, 
                            labels=chart_labels, 
                            values=chart_values, 
-                           chart_type=chart_type)
+                           chart_type=chart_type,
+                           unit=unit,
+                           pivot=pivot,
+                           cumulative_percent=cumulative_percent,
+                           comparison=comparison,
+                           outliers=outliers,
+                           measure_label=measure_label)
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓK EXPORTÁLÁSA (CSV / XLSX)
+# - A riport oldal időszakára szűrve, streamelt válaszként (export.py)
+# - Csak super_user
+# ----------------------------------------------------------------------
+@app.route('/reports/export')
+@login_required
+@roles_required('super_user')
+def export_reklamaciok():
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        abort(400)
+
+    # --- Időszak (opcionális, ÉÉÉÉ-HH-NN) ---
+    try:
+        start = date.fromisoformat(request.args['start_date']) if request.args.get('start_date') else None
+        end = date.fromisoformat(request.args['end_date']) if request.args.get('end_date') else None
+    except ValueError:
+        abort(400)
+
+    filename = export_filename(export_format, start, end)
+    return Response(
+        stream_with_context(stream_export(export_format, start, end)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"', 'X-Accel-Buffering': 'no'}
+    )
 
 
 # ----------------------------------------------------------------------
@@ -804,6 +880,14 @@ def download_report_pdf():
     start_str = request.form.get('start_date')
     end_str = request.form.get('end_date')
     group_criterion = request.form.get('group_by')
+    pivot_by = request.form.get('pivot_by', '')
+    with_subtotals = request.form.get('subtotals') == 'true'
+    top_n = top_n_value(request.form.get('top_n'))
+    granularity = request.form.get('granularity', DEFAULT_GRANULARITY)
+    if granularity not in GRANULARITIES:
+        granularity = DEFAULT_GRANULARITY
+    compare = request.form.get('compare') if request.form.get('compare') in COMPARISONS else None
+    measure = request.form.get('measure') if request.form.get('measure') in MEASURES else None
 
     # --- Diagram típus és logaritmikus skála kinyerése (alapértelmezett: bar) ---
     chart_type = request.form.get('chart_type', 'bar')
@@ -814,102 +898,98 @@ def download_report_pdf():
     start = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else date.today()
     end = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else date.today()
 
-    # --- Lekérdezés újrafuttatása ---
-    query = None
-    title_suffix = ""
+    if group_criterion not in REPORT_CRITERIA or (pivot_by and pivot_by not in DIMENSIONS):
+        flash("Nincs adat a PDF generálásához!", "warning")
+        return redirect(url_for('reports'))
+
+    # --- Kereszttábla riport (bontással) ---
+    if pivot_by:
+        try:
+            pivot = get_pivot(group_criterion, pivot_by, start, end, with_subtotals, granularity, measure)
+        except InvalidPivotRequest:
+            abort(400)
+        if not pivot.row_labels:
+            flash("Nincs adat a PDF generálásához!", "warning")
+            return redirect(url_for('reports'))
+        try:
+            pdf_buffer = pdf_pool.render_pivot(pivot, chart_type, use_log_scale)
+        except PdfRenderUnavailable as e:
+            flash(str(e), "warning")
+            return redirect(url_for('reports'))
+        return send_file(
+            pdf_buffer,
+            as_attachment=True,
+            download_name=f"riport_{group_criterion}_{pivot_by}_{date.today()}.pdf",
+            mimetype='application/pdf'
+        )
 
-    # --- Hiba típus ---
-    if group_criterion == 'defect_type':
-        query = db.session.query(DefectType.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.defect_type).group_by(DefectType.display_name)
-        title_suffix = "Hiba típusok szerint"
-    
-    # --- Vevő ---
-    elif group_criterion == 'customer':
-        query = db.session.query(Customer.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.customer).group_by(Customer.display_name)
-        title_suffix = "Vevők szerint"
-
-    # --- Termék ---
-    elif group_criterion == 'product':
-        query = db.session.query(Product.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.product).group_by(Product.display_name)
-        title_suffix = "Termékek szerint"
-
-    # --- Státusz ---
-    elif group_criterion == 'status':
-        query = db.session.query(Status.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.status).group_by(Status.display_name)
-        title_suffix = "Státusz szerint"
-
-    # --- Üzemegység ---
-    elif group_criterion == 'department':
-        query = db.session.query(Department.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.department).group_by(Department.display_name)
-        title_suffix = "Üzemegységek szerint"
-
-    # --- Havi költség ---
-    elif group_criterion == 'monthly_cost':
-        month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-        query = db.session.query(month_format, func.sum(Reklamacio.total_cost))\
-            .group_by(month_format).order_by(month_format)
-        title_suffix = "Havi költségbontás"
-
-    # --- Havi darabszám ---
-    elif group_criterion == 'monthly_count':
-        month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-        query = db.session.query(month_format, func.count(Reklamacio.id))\
-            .group_by(month_format)\
-            .order_by(month_format)
-        title_suffix = "Havi hibaszám alakulása"
-
-    # --- Adatok kinyerése listákba ---
-    labels = []
-    values = []
+    # --- Riport a riport motorból (a riport oldal által már cache-elt eredmény) ---
+    report = get_report(group_criterion, start, end, top_n, granularity, compare, measure)
+
+    # --- PDF generálása és küldése ---
+    if not report.labels:
+        flash("Nincs adat a PDF generálásához!", "warning")
+        return redirect(url_for('reports'))
+
+    # --- paraméterek átadása (a PDF a generáló folyamatkészletben készül, pdf_pool.py) ---
+    try:
+        pdf_buffer = pdf_pool.render_report(report.labels, report.values, report.title, chart_type, use_log_scale,
+                                            report.cumulative_percent, report.comparison_values,
+                                            report.comparison_label, report.unit, report.outliers)
+    except PdfRenderUnavailable as e:
+        flash(str(e), "warning")
+        return redirect(url_for('reports'))
     
-    # --- Lekérdezés futtatása és szűrés ---
-    if query:
-        results = query.filter(Reklamacio.complaint_date.between(start, end)).all()
-        
-        # --- Nulla-feltöltés a havi statisztikákhoz ---
-        if group_criterion in ['monthly_cost', 'monthly_count']:
+    return send_file(
+        pdf_buffer,
+        as_attachment=True,
+        download_name=f"riport_{group_criterion}_{date.today()}.pdf",
+        mimetype='application/pdf'
+    )
 
-            # --- Szótár az SQL eredményekből a gyors kereséshez ---
-            result_dict = {str(row[0]): (float(row[1]) if row[1] is not None else 0) for row in results}
 
-            # --- Kezdő és végdátum ---
-            current_date = date(start.year, start.month, 1)
-            end_date_limit = date(end.year, end.month, 1)
+# ----------------------------------------------------------------------
+# TELJES RIPORT PDF-BEN (minden szempont, tartalomjegyzékkel)
+# - Az összes szempont két lekérdezéssel (report_engine.run_report_bundle), egy dokumentumban
+# - Csak super_user
+# ----------------------------------------------------------------------
+def _render_bundle_pdf(start, end, granularity, use_log_scale=False):
+    """ A teljes riport PDF-je (BytesIO) és címe; adat hiányában (None, cím). PdfRenderUnavailable továbbengedve. """
+    title = f"Teljes reklamációs riport ({start.strftime('%Y.%m.%d')} - {end.strftime('%Y.%m.%d')})"
+    reports = get_report_bundle(start, end, granularity)
+    if not any(report.labels and any(report.values) for report in reports):
+        return None, title
+    chart_types = [bundle_chart_type(report.criterion) for report in reports]
+    return pdf_pool.render_bundle(title, reports, chart_types, use_log_scale), title
 
-            while current_date <= end_date_limit:
-                month_str = current_date.strftime('%Y-%m')
-                labels.append(month_str)
-                values.append(result_dict.get(month_str, 0.0))
 
-                if current_date.month == 12:
-                    current_date = date(current_date.year + 1, 1, 1)
-                else:
-                    current_date = date(current_date.year, current_date.month + 1, 1)
-        
-        # --- Többi szűréshez (nem havi) ---
-        else:
-            for row in results:
-                labels.append(str(row[0]) if row[0] else "Nincs adat")
-                val = row[1] if row[1] is not None else 0
-                values.append(float(val))
+@app.route('/reports/download_bundle', methods=['POST'])
+@login_required
+@roles_required('super_user')
+def download_report_bundle_pdf():
+    start_str = request.form.get('start_date')
+    end_str = request.form.get('end_date')
+    granularity = request.form.get('granularity', DEFAULT_GRANULARITY)
+    if granularity not in GRANULARITIES:
+        granularity = DEFAULT_GRANULARITY
+    use_log_scale = request.form.get('log_scale', 'false') == 'true'
 
-    # --- PDF generálása és küldése ---
-    if not labels:
+    start = datetime.strptime(start_str, '%Y-%m-%d').date() if start_str else date.today()
+    end = datetime.strptime(end_str, '%Y-%m-%d').date() if end_str else date.today()
+
+    try:
+        pdf_buffer, _ = _render_bundle_pdf(start, end, granularity, use_log_scale)
+    except PdfRenderUnavailable as e:
+        flash(str(e), "warning")
+        return redirect(url_for('reports'))
+    if pdf_buffer is None:
         flash("Nincs adat a PDF generálásához!", "warning")
         return redirect(url_for('reports'))
 
-    # --- paraméterek átadása ---
-    pdf_buffer = generate_report_pdf(labels, values, title_suffix, chart_type, use_log_scale)
-    
     return send_file(
         pdf_buffer,
         as_attachment=True,
-        download_name=f"riport_{group_criterion}_{date.today()}.pdf",
+        download_name=f"teljes_riport_{start}_{end}.pdf",
         mimetype='application/pdf'
     )
 
@@ -1005,6 +1085,12 @@ def send_report_email_route():
     start_str = form.start_date.data
     end_str = form.end_date.data
     group_criterion = form.group_by.data
+    pivot_by = form.pivot_by.data or ''
+    with_subtotals = form.subtotals.data == 'true'
+    granularity = form.granularity.data if form.granularity.data in GRANULARITIES else DEFAULT_GRANULARITY
+    compare = form.compare.data if form.compare.data in COMPARISONS else None
+    measure = form.measure.data if form.measure.data in MEASURES else None
+    top_n = top_n_value(form.top_n.data)
     chart_type = form.chart_type.data
 
     # --- Dátumok visszaalakítása ---
@@ -1014,80 +1100,59 @@ def send_report_email_route():
     except (ValueError, TypeError):
         flash("Érvénytelen dátumformátum.", "danger")
         return redirect(url_for('reports'))
+    date_range = f"{start.strftime('%Y.%m.%d')} - {end.strftime('%Y.%m.%d')}"
 
-    # --- Lekérdezés összeállítása (azonos logika mint download_report_pdf-nél) ---
-    query = None
-    title_suffix = ""
-
-    if group_criterion == 'defect_type':
-        query = db.session.query(DefectType.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.defect_type).group_by(DefectType.display_name)
-        title_suffix = "Hiba típusok szerint"
-    elif group_criterion == 'customer':
-        query = db.session.query(Customer.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.customer).group_by(Customer.display_name)
-        title_suffix = "Vevők szerint"
-    elif group_criterion == 'product':
-        query = db.session.query(Product.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.product).group_by(Product.display_name)
-        title_suffix = "Termékek szerint"
-    elif group_criterion == 'status':
-        query = db.session.query(Status.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.status).group_by(Status.display_name)
-        title_suffix = "Státusz szerint"
-    elif group_criterion == 'department':
-        query = db.session.query(Department.display_name, func.count(Reklamacio.id))\
-            .join(Reklamacio.department).group_by(Department.display_name)
-        title_suffix = "Üzemegységek szerint"
-    elif group_criterion == 'monthly_cost':
-        month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-        query = db.session.query(month_format, func.sum(Reklamacio.total_cost))\
-            .group_by(month_format).order_by(month_format)
-        title_suffix = "Havi költségbontás"
-    elif group_criterion == 'monthly_count':
-        month_format = func.to_char(Reklamacio.complaint_date, 'YYYY-MM')
-        query = db.session.query(month_format, func.count(Reklamacio.id))\
-            .group_by(month_format).order_by(month_format)
-        title_suffix = "Havi hibaszám alakulása"
-
-    if not query:
+    # --- Teljes riport (minden szempont egy PDF-ben) ---
+    if form.bundle.data:
+        try:
+            pdf_buffer, title = _render_bundle_pdf(start, end, granularity)
+        except PdfRenderUnavailable as e:
+            flash(str(e), "warning")
+            return redirect(url_for('reports'))
+        if pdf_buffer is None:
+            flash("Nincs adat a megadott időszakban, a riport nem kerül elküldésre.", "warning")
+            return redirect(url_for('reports'))
+        if send_report_email(recipient, pdf_buffer, f"teljes_riport_{start}_{end}.pdf", title, date_range):
+            flash(f"A teljes riport sikeresen elküldve: {recipient}", "success")
+        else:
+            flash("A riport e-mail küldése sikertelen.", "danger")
+        return redirect(url_for('reports'))
+
+    # --- Riport a riport motorból (a riport oldal által már cache-elt eredmény) ---
+    if group_criterion not in REPORT_CRITERIA or (pivot_by and pivot_by not in DIMENSIONS):
         flash("Ismeretlen csoportosítási szempont.", "danger")
         return redirect(url_for('reports'))
 
-    results = query.filter(Reklamacio.complaint_date.between(start, end)).all()
-    labels = []
-    values = []
-
-    # --- Nulla-feltöltés a havi statisztikákhoz ---
-    if group_criterion in ['monthly_cost', 'monthly_count']:
-        result_dict = {str(row[0]): (float(row[1]) if row[1] is not None else 0) for row in results}
-        current_date = date(start.year, start.month, 1)
-        end_date_limit = date(end.year, end.month, 1)
-
-        while current_date <= end_date_limit:
-            month_str = current_date.strftime('%Y-%m')
-            labels.append(month_str)
-            values.append(result_dict.get(month_str, 0.0))
-
-            if current_date.month == 12:
-                current_date = date(current_date.year + 1, 1, 1)
-            else:
-                current_date = date(current_date.year, current_date.month + 1, 1)
+    if pivot_by:
+        try:
+            report = get_pivot(group_criterion, pivot_by, start, end, with_subtotals, granularity, measure)
+        except InvalidPivotRequest:
+            abort(400)
+        has_data = bool(report.row_labels)
     else:
-        labels = [str(row[0]) if row[0] else "Nincs adat" for row in results]
-        values = [float(row[1]) if row[1] is not None else 0.0 for row in results]
+        report = get_report(group_criterion, start, end, top_n, granularity, compare, measure)
+        has_data = bool(report.labels)
 
-    if not labels:
+    if not has_data:
         flash("Nincs adat a megadott időszakban, a riport nem kerül elküldésre.", "warning")
         return redirect(url_for('reports'))
 
-    # --- PDF generálása ---
-    pdf_buffer = generate_report_pdf(labels, values, title_suffix, chart_type, False)
+    # --- PDF generálása (a generáló folyamatkészletben, pdf_pool.py) ---
+    try:
+        if pivot_by:
+            pdf_buffer = pdf_pool.render_pivot(report, chart_type, False)
+            filename = f"riport_{group_criterion}_{pivot_by}_{date.today()}.pdf"
+        else:
+            pdf_buffer = pdf_pool.render_report(report.labels, report.values, report.title, chart_type, False,
+                                                report.cumulative_percent, report.comparison_values,
+                                                report.comparison_label, report.unit, report.outliers)
+            filename = f"riport_{group_criterion}_{date.today()}.pdf"
+    except PdfRenderUnavailable as e:
+        flash(str(e), "warning")
+        return redirect(url_for('reports'))
 
     # --- Küldés e-mailben ---
-    date_range = f"{start.strftime('%Y.%m.%d')} - {end.strftime('%Y.%m.%d')}"
-    filename = f"riport_{group_criterion}_{date.today()}.pdf"
-    success = send_report_email(recipient, pdf_buffer, filename, title_suffix, date_range)
+    success = send_report_email(recipient, pdf_buffer, filename, report.title, date_range)
 
     if success:
         flash(f"A riport sikeresen elküldve: {recipient}", "success")
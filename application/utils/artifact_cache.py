@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from flask import current_app
+
+
+# ----------------------------------------------------------------------
+# GENERÁLT FÁJLOK CACHE-E (diagram PNG, riport PDF)
+# - Tartalom szerint címzett: a kulcs a generálás bemeneteinek SHA-256 hash-e, így ugyanaz a riport
+#   (azonos adatok, cím, diagram típus) ismételt letöltése / e-mailben küldése csak egy fájl olvasás
+# - Közös könyvtár a gunicorn workerek és a PDF generáló folyamatok között (atomikus írás: os.replace)
+# - Korlátok: teljes méret (a legrégebben használt fájlok törlődnek először) és életkor (utolsó használat óta)
+# ----------------------------------------------------------------------
+
+# --- A diagramok / PDF-ek kinézetének változatásakor növelendő (a régi fájlok így nem kerülnek elő) ---
+RENDER_VERSION = 1
+
+
+class ArtifactCache:
+    """ Fájl alapú, tartalom szerint címzett cache; a példány picklezhető (a PDF generáló folyamatok is kapják). """
+
+    def __init__(self, directory, max_bytes, max_age):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    @staticmethod
+    def key(kind, *inputs):
+        """ A generálás fajtájából és bemeneteiből képzett kulcs (hex SHA-256). """
+        payload = json.dumps([RENDER_VERSION, kind, inputs], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, key + suffix)
+
+    def get(self, key, suffix):
+        """ A tárolt fájl tartalma (bytes), vagy None. Találatkor a módosítási idő frissül (LRU sorrend). """
+        path = self._path(key, suffix)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, suffix, data):
+        """ Tárolás ideiglenes fájlon keresztül (párhuzamos író / olvasó sosem lát félkész fájlt), majd a korlátok érvényesítése. """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key, suffix))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.prune()
+
+    def get_or_render(self, key, suffix, render):
+        """ Cache-elt tartalom, vagy a 'render()' eredménye (bytes), amit egyben el is tárol. """
+        data = self.get(key, suffix)
+        if data is None:
+            data = render()
+            self.put(key, suffix, data)
+        return data
+
+    def prune(self):
+        """ A 'max_age'-nél régebben használt fájlok törlése, majd a legrégebben használtaké 'max_bytes' alá. """
+        try:
+            entries = [entry for entry in os.scandir(self.directory) if entry.is_file()]
+        except FileNotFoundError:
+            return
+
+        now = time.time()
+        files = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            # --- Félbehagyott írások ideiglenes fájljai (egy óra után) ---
+            expired = now - stat.st_mtime > (3600 if entry.name.endswith('.tmp') else self.max_age)
+            if expired:
+                _remove(entry.path)
+            elif not entry.name.endswith('.tmp'):
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+
+def _remove(path):
+    """ Törlés; egy másik folyamat által már törölt fájl nem hiba. """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def artifact_cache():
+    """ Az alkalmazás konfigurációja szerinti cache, vagy None, ha ki van kapcsolva (ARTIFACT_CACHE_MAX_BYTES = 0). """
+    config = current_app.config
+    if config['ARTIFACT_CACHE_MAX_BYTES'] <= 0:
+        return None
+    return ArtifactCache(config['ARTIFACT_CACHE_DIR'], config['ARTIFACT_CACHE_MAX_BYTES'], config['ARTIFACT_CACHE_MAX_AGE'])
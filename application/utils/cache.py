@@ -0,0 +1,186 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app
+
+
+# ----------------------------------------------------------------------
+# MEGOSZTOTT CACHE (gunicorn workerek között)
+# - SQLite fájl alapú kulcs-érték tár, külső szerver nélkül
+# - TTL-lel lejáró bejegyzések, adatverzió alapú érvénytelenítés
+# - Találat / hiány számlálók: folyamaton belül memóriában, a közös táblába csak időnként
+#   (CACHE_STATS_FLUSH_INTERVAL) összevontan írva, így egy találat nem jár írási tranzakcióval
+# ----------------------------------------------------------------------
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value REAL NOT NULL)",
+    "INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('data_version', 0), ('data_updated_at', 0), ('hits', 0), ('misses', 0)",
+)
+
+
+class SharedCache:
+    """
+    Workerek között megosztott cache egy SQLite fájlban.
+    A kulcsok az aktuális adatverzióval együtt tárolódnak, így egy írás utáni érvénytelenítés
+    után egy korábban elkezdett (elavult) számítás eredménye sosem kerül visszaolvasásra.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0}
+        self._counters_pid = None
+        self._flushed_at = time.monotonic()
+
+    # --- Kapcsolat: szálanként és folyamatonként (fork után) külön ---
+    def _connection(self):
+        path = current_app.config['CACHE_DIR']
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid() and self._local.path == path:
+            return conn
+
+        os.makedirs(path, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(path, 'shared_cache.sqlite3'), timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        self._local.path = path
+        return conn
+
+    # --- Találat / hiány számlálás memóriában, időnkénti kiírással ---
+    def _bump(self, conn, counter):
+        with self._counter_lock:
+            # --- Fork után a szülő folyamat még ki nem írt számai nem ehhez a workerhez tartoznak ---
+            if self._counters_pid != os.getpid():
+                self._counters = {'hits': 0, 'misses': 0}
+                self._counters_pid = os.getpid()
+            self._counters[counter] += 1
+            if time.monotonic() - self._flushed_at < current_app.config['CACHE_STATS_FLUSH_INTERVAL']:
+                return
+            pending, self._counters = self._counters, {'hits': 0, 'misses': 0}
+            self._flushed_at = time.monotonic()
+        self._flush_counters(conn, pending)
+
+    def _flush_counters(self, conn, pending):
+        """ A folyamat összegyűlt számlálóinak hozzáadása a közös táblához (egy tranzakció); hiba esetén megtartva. """
+        try:
+            conn.executemany("UPDATE cache_meta SET value = value + ? WHERE name = ?",
+                             [(count, name) for name, count in pending.items() if count])
+        except sqlite3.Error as e:
+            current_app.logger.warning(f"Cache hiba (számlálók): {e}")
+            with self._counter_lock:
+                for name, count in pending.items():
+                    self._counters[name] += count
+
+    def _pending_counters(self):
+        with self._counter_lock:
+            if self._counters_pid != os.getpid():
+                return {'hits': 0, 'misses': 0}
+            return dict(self._counters)
+
+    # --- Adatverzió lekérdezése ---
+    def data_version(self):
+        """
+        Az aktuális adatverzió és az utolsó írás időpontja (unix timestamp).
+        Cache hiba esetén (None, None): az adatok aktualitása nem ismert, a hívó ne tekintse érvényesnek a tárolt adatot.
+        """
+        try:
+            rows = dict(self._connection().execute(
+                "SELECT name, value FROM cache_meta WHERE name IN ('data_version', 'data_updated_at')"
+            ).fetchall())
+            return int(rows['data_version']), rows['data_updated_at']
+        except sqlite3.Error as e:
+            current_app.logger.warning(f"Cache hiba (adatverzió): {e}")
+            return None, None
+
+    # --- Lekérés vagy számítás ---
+    def get_or_set(self, key, ttl, factory):
+        """
+        Visszaadja a kulcshoz tartozó, le nem járt értéket; hiány esetén a factory() eredményét
+        JSON-ként eltárolja 'ttl' másodpercre. Cache hiba esetén a factory() közvetlenül fut.
+        """
+        try:
+            conn = self._connection()
+            version, _ = self.data_version()
+            if version is None:
+                return factory()
+            versioned_key = f"{key}@v{version}"
+
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (versioned_key, time.time())
+            ).fetchone()
+            if row is not None:
+                self._bump(conn, 'hits')
+                return json.loads(row[0])
+
+            self._bump(conn, 'misses')
+        except sqlite3.Error as e:
+            current_app.logger.warning(f"Cache hiba (olvasás, {key}): {e}")
+            return factory()
+
+        value = factory()
+
+        try:
+            now = time.time()
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (versioned_key, json.dumps(value), now + ttl)
+            )
+        except sqlite3.Error as e:
+            current_app.logger.warning(f"Cache hiba (írás, {key}): {e}")
+        return value
+
+    # --- Érvénytelenítés írás után ---
+    def invalidate(self):
+        """ Adatverzió léptetése és az összes bejegyzés törlése. Visszatérési érték: az új adatverzió. """
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM cache_entries")
+                conn.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'data_version'")
+                conn.execute("UPDATE cache_meta SET value = ? WHERE name = 'data_updated_at'", (time.time(),))
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            current_app.logger.error(f"Cache hiba (érvénytelenítés): {e}")
+        return self.data_version()[0]
+
+    # --- Statisztika ---
+    def stats(self):
+        """
+        Találat / hiány számlálók, bejegyzésszám és adatverzió. A számlálók a közös táblába már kiírt értékek
+        és ennek a workernek a még ki nem írt számai (a többi worker legfeljebb CACHE_STATS_FLUSH_INTERVAL késéssel).
+        """
+        conn = self._connection()
+        meta = dict(conn.execute("SELECT name, value FROM cache_meta").fetchall())
+        entries = conn.execute("SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+        pending = self._pending_counters()
+        hits = int(meta.get('hits', 0)) + pending['hits']
+        misses = int(meta.get('misses', 0)) + pending['misses']
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+            'entries': entries,
+            'data_version': int(meta.get('data_version', 0)),
+        }
+
+
+# --- Folyamatonkénti példány ---
+shared_cache = SharedCache()
+
+
+def invalidate_complaint_data():
+    """ Reklamáció létrehozása, módosítása vagy törlése után hívandó (a commit után). """
+    return shared_cache.invalidate()
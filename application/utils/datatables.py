@@ -0,0 +1,142 @@
+from flask import current_app
+from sqlalchemy import or_, func, union, union_all, literal_column
+from application import db
+from application.models import Reklamacio, Customer, Product, DefectType, Status, Department, User
+from application.utils.cache import shared_cache
+from application.utils.read_models import reklamacio_rows_query, to_reklamacio_rows
+from application.utils.search import match_condition
+
+
+# ----------------------------------------------------------------------
+# DATATABLES SZERVEROLDALI FELDOLGOZÁS (reklamációk listája)
+# - draw / start / length / search[value] / order[i][column|dir] paraméterek
+# - szűrés, rendezés és lapozás SQL-ben, csak a látható oldal kerül lekérésre
+# ----------------------------------------------------------------------
+
+# --- Egy oldal maximális mérete (a "length=-1" / túl nagy kérés korlátozása) ---
+MAX_PAGE_LENGTH = 100
+
+# --- Rendezhető oszlopok: DataTables 'data' név -> SQL kifejezések ---
+SORTABLE_COLUMNS = {
+    'id': (Reklamacio.id,),
+    'date': (Reklamacio.complaint_date,),
+    'customer': (Customer.display_name,),
+    'product_name': (Product.display_name, Reklamacio.product_identifier),
+    'defect': (DefectType.display_name,),
+    'quantity': (Reklamacio.quantity,),
+    'status': (Status.display_name,),
+    'complaint_number': (Reklamacio.complaint_number,),
+    'department': (Department.display_name,),
+    'requires_return': (Reklamacio.requires_return,),
+    'shipping_date': (Reklamacio.shipping_date,),
+    'cost': (Reklamacio.total_cost,),
+    'user': (User.surname, User.forename),
+}
+
+# --- Globális keresés a kapcsolódó törzsadatok megnevezésében: külső kulcs -> (tábla ID, mezők) ---
+# - A saját szöveges mezőkben (szám, termékazonosító, leírás) a search.py keres, indexelten
+# - A külső kulcsos ágak indexei: ix_complaints_<kapcsolat>_id (a kis számosságú státusz / üzemegység
+#   egyezése a sorok nagy részét adja, ott a tábla olvasása a gyorsabb)
+LOOKUP_SEARCH_COLUMNS = (
+    (Reklamacio.customer_id, Customer.id, (Customer.display_name,)),
+    (Reklamacio.product_id, Product.id, (Product.display_name,)),
+    (Reklamacio.defect_type_id, DefectType.id, (DefectType.display_name,)),
+    (Reklamacio.status_id, Status.id, (Status.display_name,)),
+    (Reklamacio.department_id, Department.id, (Department.display_name,)),
+    (Reklamacio.user_id, User.id, (User.surname, User.forename)),
+)
+
+
+def _matching_lookup_ids(term):
+    """
+    A kifejezésre illeszkedő törzsadatok ID-i kapcsolatonként, egyetlen (UNION ALL) lekérdezéssel.
+    Visszatérési érték: {LOOKUP_SEARCH_COLUMNS index: [id, ...]} (csak a találatos kapcsolatok).
+    """
+    selects = [
+        db.select(literal_column(str(i)).label('lookup'), lookup_id.label('id'))
+        .where(or_(*[column.icontains(term, autoescape=True) for column in columns]))
+        for i, (_, lookup_id, columns) in enumerate(LOOKUP_SEARCH_COLUMNS)
+    ]
+    ids = {}
+    for lookup, lookup_id in db.session.execute(union_all(*selects)).all():
+        ids.setdefault(int(lookup), []).append(lookup_id)
+    return ids
+
+
+def _search_filter(search_value):
+    """
+    Szóközzel elválasztott kifejezések: mindegyiknek illeszkednie kell a reklamáció szöveges mezőire
+    (search.py) vagy valamelyik kapcsolódó törzsadat megnevezésére.
+    Kifejezésenként egy ID halmaz (UNION), amelynek minden ága külön indexet használ: a szöveges egyezés
+    a teljes szöveges / trigram indexeket, a törzsadat egyezés (előre feloldott ID-k) a külső kulcs indexét.
+    Egyetlen OR feltételbe vonva a PostgreSQL a teljes táblát olvasná (a listán és a darabszámon is).
+    """
+    conditions = []
+    for term in search_value.split():
+        id_sets = [db.select(Reklamacio.id).where(match_condition(term))]
+        for i, ids in _matching_lookup_ids(term).items():
+            id_sets.append(db.select(Reklamacio.id).where(LOOKUP_SEARCH_COLUMNS[i][0].in_(ids)))
+        if term.lstrip('#').isdigit():
+            id_sets.append(db.select(Reklamacio.id).where(Reklamacio.id == int(term.lstrip('#'))))
+        conditions.append(Reklamacio.id.in_(union(*id_sets) if len(id_sets) > 1 else id_sets[0]))
+    return conditions
+
+
+def _order_by(args):
+    """ ORDER BY kifejezések a DataTables order[i] paramétereiből; egyedi sorrendhez az ID zár. """
+    clauses = []
+    i = 0
+    while f'order[{i}][column]' in args:
+        column_index = args.get(f'order[{i}][column]', type=int)
+        data_name = args.get(f'columns[{column_index}][data]')
+        descending = args.get(f'order[{i}][dir]') == 'desc'
+        for expression in SORTABLE_COLUMNS.get(data_name, ()):
+            clauses.append(expression.desc() if descending else expression.asc())
+        i += 1
+
+    # --- Alapértelmezés: legfrissebb elöl (ix_complaints_date_desc_id_desc index) ---
+    if not clauses:
+        clauses.append(Reklamacio.complaint_date.desc())
+    clauses.append(Reklamacio.id.desc())
+    return clauses
+
+
+def _records_total():
+    """ Az összes reklamáció száma, a workerek között megosztott cache-ből (íráskor érvénytelenül). """
+    return shared_cache.get_or_set(
+        "reklamaciok_total",
+        current_app.config['DASHBOARD_CACHE_TTL'],
+        lambda: db.session.query(func.count(Reklamacio.id)).scalar()
+    )
+
+
+def reklamaciok_datatable(args):
+    """
+    A DataTables szerveroldali protokolljának megfelelő válasz a reklamációk listájához.
+    'args': a kérés paraméterei (request.args). Visszatérési érték: jsonify-olható szótár.
+    """
+    draw = args.get('draw', 0, type=int)
+    start = max(args.get('start', 0, type=int), 0)
+    length = args.get('length', 10, type=int)
+    if length <= 0 or length > MAX_PAGE_LENGTH:
+        length = MAX_PAGE_LENGTH
+
+    records_total = _records_total()
+    query = reklamacio_rows_query()
+
+    # --- Keresés: csak ekkor kell külön szűrt darabszám ---
+    search_value = (args.get('search[value]') or '').strip()
+    if search_value:
+        query = query.filter(*_search_filter(search_value))
+        records_filtered = query.order_by(None).count()
+    else:
+        records_filtered = records_total
+
+    rows = to_reklamacio_rows(query.order_by(*_order_by(args)).offset(start).limit(length).all())
+
+    return {
+        'draw': draw,
+        'recordsTotal': records_total,
+        'recordsFiltered': records_filtered,
+        'data': [r.to_json() for r in rows],
+    }
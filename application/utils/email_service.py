@@ -2,6 +2,8 @@ import resend
 from flask import current_app, url_for, render_template
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadSignature
 import base64
+from application import db
+from application.models import Reklamacio
 
 
 # ----------------------------------------------------------------------
@@ -122,13 +124,18 @@ def send_reklamacio_notification_email(action: str, reklamacio) -> bool:
     Értesítést küld egy reklamáció létrehozásáról, állapotváltozásáról vagy törléséről.
     Az értesítési címet a REKLAMACIOS_KOR_EMAIL konfig adja meg.
     """
-    if reklamacio.user and not reklamacio.user.is_active:
-        return False
-
     to_email = current_app.config.get('REKLAMACIOS_KOR_EMAIL')
     if not to_email:
         return False
 
+    # --- A sablon kapcsolatainak betöltése egyetlen lekérdezéssel (commit után lejárt objektumnál is) ---
+    reklamacio = db.session.get(
+        Reklamacio, reklamacio.id, options=Reklamacio.loading('notification'), populate_existing=True
+    ) or reklamacio
+
+    if reklamacio.user and not reklamacio.user.is_active:
+        return False
+
     resend.api_key = current_app.config['RESEND_API_KEY']
     
     subject = f"{action} reklamáció: {reklamacio.complaint_number}"
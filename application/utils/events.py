@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from flask import current_app
+from application.utils.cache import shared_cache
+
+
+# ----------------------------------------------------------------------
+# ADATVÁLTOZÁS ESEMÉNYBUSZ (Server-Sent Events kiszolgálásához)
+# - A workerek közös "busza" a megosztott cache adatverziója (cache.py, SQLite fájl)
+# - Workerenként egyetlen figyelő szál olvassa, a várakozó streamek egy
+#   threading.Condition-on alszanak, így a kapcsolatok száma nem növeli a terhelést
+# ----------------------------------------------------------------------
+class DataChangeBus:
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._version = None
+        self._pid = None
+
+    # --- Figyelő szál indítása (folyamatonként egyszer, fork után újra) ---
+    def _ensure_watcher(self):
+        if self._pid == os.getpid():
+            return
+        with self._condition:
+            if self._pid == os.getpid():
+                return
+            self._version = shared_cache.data_version()[0]
+            self._pid = os.getpid()
+            app = current_app._get_current_object()
+            watcher = threading.Thread(target=self._watch, args=(app,), name='data-change-bus', daemon=True)
+            watcher.start()
+
+    def _watch(self, app):
+        """ Az adatverzió periodikus figyelése; változáskor minden várakozó stream felébresztése. """
+        interval = app.config['DATA_CHANGE_POLL_INTERVAL']
+        with app.app_context():
+            while True:
+                time.sleep(interval)
+                version = shared_cache.data_version()[0]
+                # --- Olvasási hiba (None): nincs értesítés, a következő sikeres olvasásig az utolsó ismert verzió ---
+                if version is not None and version != self._version:
+                    with self._condition:
+                        self._version = version
+                        self._condition.notify_all()
+
+    def version(self):
+        """ Az utoljára észlelt adatverzió. """
+        self._ensure_watcher()
+        return self._version
+
+    def wait_for_change(self, known_version, timeout):
+        """
+        Blokkol, amíg az adatverzió el nem tér a 'known_version' értéktől, vagy le nem jár a 'timeout'.
+        Visszatérési érték: az aktuális adatverzió.
+        """
+        self._ensure_watcher()
+        with self._condition:
+            self._condition.wait_for(lambda: self._version != known_version, timeout=timeout)
+            return self._version
+
+
+# --- Folyamatonkénti példány ---
+data_change_bus = DataChangeBus()
+
+
+# ----------------------------------------------------------------------
+# EGYIDEJŰ STREAMEK KORLÁTJA
+# - A szálas (gthread) workerben minden nyitott stream egy kérés-kiszolgáló szálat foglal le a stream
+#   teljes idejére; a korlát felett a stream 503-at kap (a dashboard lekérdezéses frissítésre vált),
+#   így a többi kéréshez mindig marad szabad szál
+# ----------------------------------------------------------------------
+class StreamSlots:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = 0
+        self._pid = None
+
+    def try_acquire(self, limit):
+        """ Foglal egy helyet, ha a workerben 'limit'-nél kevesebb stream fut. Visszatérési érték: sikerült-e. """
+        with self._lock:
+            # --- Fork után a szülő folyamat streamjei nem ebben a workerben futnak ---
+            if self._pid != os.getpid():
+                self._active = 0
+                self._pid = os.getpid()
+            if self._active >= limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active = max(self._active - 1, 0)
+
+    @property
+    def active(self):
+        return self._active if self._pid == os.getpid() else 0
+
+
+# --- Folyamatonkénti példány a dashboard streamekhez ---
+dashboard_streams = StreamSlots()
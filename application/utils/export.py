@@ -0,0 +1,239 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from xml.sax.saxutils import escape
+from application import db
+from application.models import Reklamacio, Customer, Product, DefectType, Status, Department, User
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓK EXPORTÁLÁSA (CSV / XLSX), ÁLLANDÓ MEMÓRIAIGÉNNYEL
+# - A sorok szerveroldali kurzorról érkeznek (yield_per), ORM objektumok nélkül
+# - A kimenet generátorként, darabokban készül: streamelt HTTP válasz vagy fájl
+# ----------------------------------------------------------------------
+
+# --- Egyszerre a kurzorból lekért sorok száma, egyben a kimeneti darabok mérete ---
+EXPORT_BATCH_SIZE = 1000
+
+# --- Támogatott formátumok: kiterjesztés -> MIME típus ---
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# --- Oszlopok: fejléc és lekérdezett kifejezés ---
+EXPORT_COLUMNS = (
+    ('ID', Reklamacio.id),
+    ('Dátum', Reklamacio.complaint_date),
+    ('Rekl. szám', Reklamacio.complaint_number),
+    ('Vevő', Customer.display_name),
+    ('Termék', Product.display_name),
+    ('Termékazonosító', Reklamacio.product_identifier),
+    ('Hiba', DefectType.display_name),
+    ('Mennyiség', Reklamacio.quantity),
+    ('Státusz', Status.display_name),
+    ('Üzemegység', Department.display_name),
+    ('Visszáru', Reklamacio.requires_return),
+    ('Kiszállítás', Reklamacio.shipping_date),
+    ('Költség (Ft)', Reklamacio.total_cost),
+    ('Rögzítette', User.surname + ' ' + User.forename),
+    ('Leírás', Reklamacio.description),
+)
+
+
+def iter_export_rows(start=None, end=None):
+    """
+    Reklamációk sorai (tuple-ök) a [start, end] zárt időszakra, dátum és ID szerint növekvő sorrendben.
+    Szerveroldali kurzorral, EXPORT_BATCH_SIZE soronként olvas, így a memóriaigény nem függ a sorok számától.
+    """
+    query = db.session.query(*[expression for _, expression in EXPORT_COLUMNS])\
+        .select_from(Reklamacio)\
+        .join(Reklamacio.customer)\
+        .join(Reklamacio.product)\
+        .join(Reklamacio.defect_type)\
+        .join(Reklamacio.status)\
+        .join(Reklamacio.department)\
+        .join(Reklamacio.user)
+
+    if start:
+        query = query.filter(Reklamacio.complaint_date >= start)
+    if end:
+        query = query.filter(Reklamacio.complaint_date <= end)
+
+    query = query.order_by(Reklamacio.complaint_date, Reklamacio.id)\
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    for row in query:
+        yield tuple(row)
+
+
+def _batches(rows):
+    """ Sorok csoportosítása EXPORT_BATCH_SIZE méretű listákba. """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ----------------------------------------------------------------------
+# CSV (Excel-barát: UTF-8 BOM, pontosvessző elválasztó)
+# ----------------------------------------------------------------------
+def _csv_value(value):
+    if isinstance(value, bool):
+        return 'Igen' if value else 'Nem'
+    if isinstance(value, date):
+        return value.isoformat()
+    return '' if value is None else value
+
+
+def stream_csv(rows):
+    """ CSV kimenet darabokban (bytes), a fejléccel kezdve. """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';', lineterminator='\r\n')
+
+    buffer.write('\ufeff')
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for batch in _batches(rows):
+        writer.writerows([_csv_value(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+# ----------------------------------------------------------------------
+# XLSX (SpreadsheetML, folyamatosan írt ZIP, inline stringekkel)
+# - Nincs megosztott string tábla, így a munkalap egy menetben, sorról sorra írható
+# ----------------------------------------------------------------------
+_XLSX_STATIC_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Reklamációk" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # --- Stílusok: 0 = alapértelmezett, 1 = dátum (ÉÉÉÉ-HH-NN), 2 = félkövér fejléc ---
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy\\-mm\\-dd"/></numFmts>'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="3">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '</cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+
+# --- Excel dátum sorszám kezdőnapja ---
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+def _xlsx_cell(value, style=0):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        value = 'Igen' if value else 'Nem'
+    elif isinstance(value, date):
+        return f'<c s="1"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    elif isinstance(value, (int, float)):
+        return f'<c><v>{value}</v></c>'
+    style_attr = f' s="{style}"' if style else ''
+    return f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+def _xlsx_row(values, style=0):
+    return '<row>' + ''.join(_xlsx_cell(v, style) for v in values) + '</row>'
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """ Nem kereshető, csak írható puffer: a ZIP író ide ír, a generátor innen üríti ki a darabokat. """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_xlsx(rows):
+    """ XLSX kimenet darabokban (bytes); a ZIP adatleírókkal, visszaugrás nélkül készül. """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield buffer.drain()
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetViews><sheetView workbookViewId="0"><pane ySplit="1" topLeftCell="A2" state="frozen"/></sheetView></sheetViews>'
+                '<sheetData>' + _xlsx_row([header for header, _ in EXPORT_COLUMNS], style=2)
+            ).encode('utf-8'))
+
+            for batch in _batches(rows):
+                sheet.write(''.join(_xlsx_row(row) for row in batch).encode('utf-8'))
+                yield buffer.drain()
+
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
+
+
+def stream_export(export_format, start=None, end=None):
+    """ A kért formátumú export darabjainak generátora a [start, end] időszakra. """
+    rows = iter_export_rows(start, end)
+    if export_format == 'xlsx':
+        return stream_xlsx(rows)
+    return stream_csv(rows)
+
+
+def export_filename(export_format, start=None, end=None):
+    """ Letöltési fájlnév az időszakkal, pl. reklamaciok_2024-01-01_2024-12-31.csv """
+    period = f"{start or 'kezdettol'}_{end or date.today()}"
+    return f"reklamaciok_{period}.{export_format}"
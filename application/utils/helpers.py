@@ -1,9 +1,13 @@
 import re
 import unicodedata
 from application import db
-from sqlalchemy import func, extract
+from flask import current_app
+from sqlalchemy import func, case, and_
 from datetime import datetime, date
-from application.models import Reklamacio, Status, Department
+from typing import NamedTuple
+from application.models import Reklamacio, Department, ComplaintMonthlyRollup
+from application.utils.cache import shared_cache
+from application.utils.read_models import reklamacio_rows_query, to_reklamacio_rows
 
 
 # --- Hónap nevek ---
@@ -72,103 +76,100 @@ def get_or_create_dynamic(model, input_value):
             return None
     
 
+# ----------------------------------------------------------------------
+# Dátum segédfüggvény: hónap léptetése
+# ----------------------------------------------------------------------
+def add_months(day, months):
+    """
+    A megadott dátum hónapjának első napjától számítva
+    'months' hónappal eltolt hónap első napját adja vissza.
+    """
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+# ----------------------------------------------------------------------
+# Dashboard eredmény típusa
+# ----------------------------------------------------------------------
+class DashboardStats(NamedTuple):
+    """
+    A dashboard kártyák, a gördülő 12 hónapos grafikon és az üzemegységi megoszlás adatai.
+    Tuple-ként is kibontható, a mezőnevek megegyeznek a JSON API kulcsaival.
+    """
+    count: int
+    cost: int
+    year_cost: int
+    return_count: int
+    monthly_data: dict
+    dept_data: list
+
+
 # ----------------------------------------------------------------------
 # Dashboard segédfüggvény: 
 # ----------------------------------------------------------------------
 def get_dashboard_stats():
-
+    """
+    Az összes dashboard adatot egyetlen, üzemegységenként csoportosított lekérdezéssel számolja ki
+    a havi összesítő táblából (complaint_monthly_rollup), így a futásidő nem nő a reklamációk számával.
+    Az időszakok félig nyitott hónaptartományok (>= kezdet, < vég); a kártyák értékei
+    az üzemegységi sorok összegeként állnak elő.
+    """
     now = datetime.now()
-    EXCLUDED_STATUS_NAME = 'visszautasitva'
-
-    # ----------------------------------------------------------------------
-    # Dashboard Kártyák
-    # ----------------------------------------------------------------------
-    # --- 1.Kártya / Aktuális havi reklamációk darabszámának lekérdezése ---
-    count = Reklamacio.query.join(Status).filter(
-        extract('year', Reklamacio.complaint_date) == now.year,
-        extract('month', Reklamacio.complaint_date) == now.month,
-        Status.name != EXCLUDED_STATUS_NAME
-    ).count()
-
-    # --- 2.Kártya / Aktuális havi reklamációs költségek összesítése ---
-    cost_result = db.session.query(func.sum(Reklamacio.total_cost))\
-        .join(Status)\
-        .filter(
-            extract('year', Reklamacio.complaint_date) == now.year,
-            extract('month', Reklamacio.complaint_date) == now.month,
-            Status.name != EXCLUDED_STATUS_NAME
-        ).scalar()
-    
-    # --- None kezelése (None -> 0) ---
-    cost = cost_result if cost_result else 0
+    R = ComplaintMonthlyRollup
+
+    # --- Időszakhatárok hónap-sorszámként (év * 12 + hónap - 1, félig nyitott tartományok) ---
+    month_start = date(now.year, now.month, 1)
+    current_period = now.year * 12 + now.month - 1
+    year_first_period = now.year * 12
+    next_year_period = (now.year + 1) * 12
 
-    # --- 3.Kártya / Éves összesített költség ---
-    year_cost_result = db.session.query(func.sum(Reklamacio.total_cost))\
-        .join(Status)\
-        .filter(
-            extract('year', Reklamacio.complaint_date) == now.year,
-            Status.name != EXCLUDED_STATUS_NAME
-        ).scalar()
-    
-    # --- None kezelése (None -> 0) ---
-    year_cost = year_cost_result if year_cost_result else 0
-
-    # --- 4.Kártya / Éves visszaszállítást igénylő reklamációk száma ---
-    return_count = Reklamacio.query.join(Status).filter(
-        extract('year', Reklamacio.complaint_date) == now.year,
-        Status.name != EXCLUDED_STATUS_NAME,
-        Reklamacio.requires_return == True
-    ).count()
-    
-    # ----------------------------------------------------------------------
-    # Reklamáció oszlop grafikon
-    # ----------------------------------------------------------------------
     # --- Időtengely előkészítése (Gördülő 12 hónap) ---
     labels = []
-    counts = [0] * 12
-    year_months = []
+    periods = []
+    year_change_index = -1
 
-    # --- Dátumválasztó (év) ---
-    year_change_index = -1 
-    curr_y = now.year
-    curr_m = now.month
-
-    # --- Ciklus az elmúlt 12 hónap listájához (visszafelé 11-től 0-ig) ---
     for i in range(11, -1, -1):
-        m = curr_m - i
-        y = curr_y
-        if m <= 0:
-            m += 12
-            y -= 1
-
-        year_months.append((y, m))
-        labels.append(HONAPOK_TELJES[m - 1])
-        
-        # --- Ha a hónap Január, és nem az utolsó (aktuális) hónap, akkor index mentése ---
-        if m == 1 and i < 11:
+        m_start = add_months(month_start, -i)
+        periods.append(m_start.year * 12 + m_start.month - 1)
+        labels.append(HONAPOK_TELJES[m_start.month - 1])
+
+        # --- Ha a hónap Január, és nem az első oszlop, akkor index mentése ---
+        if m_start.month == 1 and i < 11:
             year_change_index = 11 - i
 
-    # --- A kezdő dátum a legelső vizsgált hónap 1. napja ---
-    start_date = date(year_months[0][0], year_months[0][1], 1)
-    
-    # --- Adatok lekérdezése a kezdő dátumtól ---
-    monthly_counts = db.session.query(
-        extract('year', Reklamacio.complaint_date).label('year'),
-        extract('month', Reklamacio.complaint_date).label('month'),
-        func.count(Reklamacio.id)
-    ).join(Status).filter(
-        Reklamacio.complaint_date >= start_date,
-        Status.name != EXCLUDED_STATUS_NAME
-    ).group_by('year', 'month').all()
-
-    # --- A lekérdezett számok elhelyezése a megfelelő oszlopba ---
-    for y, m, count_val in monthly_counts:
-        try:
-            idx = year_months.index((int(y), int(m)))
-            counts[idx] = count_val
-        except ValueError:
-            # --- Ha valamiért kilógna az adat, átugrás ---
-            pass
+    range_first_period = min(periods[0], year_first_period)
+    period = R.year * 12 + R.month - 1
+    in_month = period == current_period
+    in_year = and_(period >= year_first_period, period < next_year_period)
+
+    # --- Feltételes aggregátumok: kártyák, éves darabszám és a 12 havi oszlop ---
+    columns = [
+        Department.display_name,
+        func.sum(case((in_month, R.complaint_count), else_=0)),
+        func.sum(case((in_month, R.cost_sum), else_=0)),
+        func.sum(case((in_year, R.cost_sum), else_=0)),
+        func.sum(case((in_year, R.return_count), else_=0)),
+        func.sum(case((in_year, R.complaint_count), else_=0)),
+    ]
+    for p in periods:
+        columns.append(func.sum(case((period == p, R.complaint_count), else_=0)))
+
+    rows = db.session.query(*columns)\
+        .select_from(R)\
+        .join(Department)\
+        .filter(
+            R.year.between(range_first_period // 12, now.year),
+            period >= range_first_period,
+            period < next_year_period,
+            R.counts_in_stats.is_(True)
+        ).group_by(Department.id, Department.display_name).all()
+
+    # --- Kártyák és havi oszlopok összesítése az üzemegységi sorokból (None -> 0) ---
+    count = sum(int(row[1] or 0) for row in rows)
+    cost = sum(int(row[2] or 0) for row in rows)
+    year_cost = sum(int(row[3] or 0) for row in rows)
+    return_count = sum(int(row[4] or 0) for row in rows)
+    counts = [sum(int(row[6 + i] or 0) for row in rows) for i in range(12)]
 
     # --- Adatok becsomagolása a grafikonnak ---
     monthly_data = {
@@ -177,23 +178,44 @@ def get_dashboard_stats():
         'year_change_index': year_change_index
     }
 
-    # ----------------------------------------------------------------------
-    # Üzemegység kártya
-    # ----------------------------------------------------------------------
-    dept_query = db.session.query(
-        Department.display_name, 
-        func.count(Reklamacio.id)
-    ).select_from(Reklamacio)\
-     .join(Department)\
-     .join(Status)\
-     .filter(
-        extract('year', Reklamacio.complaint_date) == now.year,
-        Status.name != EXCLUDED_STATUS_NAME
-    ).group_by(Department.display_name)\
-     .order_by(func.count(Reklamacio.id).desc()).all()
-
-    # --- Szótár list létrehozása ---
-    dept_data = [{'name': dept_name, 'count': count} for dept_name, count in dept_query]
+    # --- Üzemegység kártya: csak az idei évben érintett egységek, csökkenő sorrendben ---
+    dept_rows = sorted((row for row in rows if row[5]), key=lambda row: (-row[5], row[0]))
+    dept_data = [{'name': row[0], 'count': int(row[5])} for row in dept_rows]
 
     # --- Visszatérési értékek ---
-    return count, cost, year_cost, return_count, monthly_data, dept_data
\ No newline at end of file
+    return DashboardStats(count, cost, year_cost, return_count, monthly_data, dept_data)
+
+
+# ----------------------------------------------------------------------
+# Legfrissebb reklamációk (dashboard táblázat)
+# ----------------------------------------------------------------------
+def get_recent_reklamaciok(limit=5):
+    """ A 'limit' legfrissebb reklamáció (dátum, majd ID szerint csökkenő sorrendben). """
+    recent_rekl = to_reklamacio_rows(reklamacio_rows_query().order_by(
+        Reklamacio.complaint_date.desc(),
+        Reklamacio.id.desc()
+    ).limit(limit).all())
+    return [r.to_json() for r in recent_rekl]
+
+
+# ----------------------------------------------------------------------
+# Megosztott cache-en keresztüli lekérdezések (cache.py)
+# - Írás (új / módosított / törölt reklamáció) után azonnal érvénytelenednek
+# ----------------------------------------------------------------------
+def get_cached_dashboard_stats():
+    """ get_dashboard_stats() eredménye a workerek között megosztott cache-ből. """
+    data = shared_cache.get_or_set(
+        f"dashboard_stats:{date.today()}",
+        current_app.config['DASHBOARD_CACHE_TTL'],
+        lambda: get_dashboard_stats()._asdict()
+    )
+    return DashboardStats(**data)
+
+
+def get_cached_recent_reklamaciok():
+    """ A dashboard táblázat adatai a workerek között megosztott cache-ből. """
+    return shared_cache.get_or_set(
+        "recent_reklamaciok",
+        current_app.config['DASHBOARD_CACHE_TTL'],
+        get_recent_reklamaciok
+    )
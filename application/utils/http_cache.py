@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime, date, timezone
+from functools import wraps
+from flask import request, make_response
+from application.utils.cache import shared_cache
+
+
+# ----------------------------------------------------------------------
+# FELTÉTELES HTTP VÁLASZOK (ETag / Last-Modified / 304)
+# - Az adatverzió (cache.py) alapján, a nézetfüggvény futtatása nélkül
+# - Ha az adatverzió nem olvasható (cache hiba), nincs validátor: mindig teljes 200 válasz
+# ----------------------------------------------------------------------
+
+# --- A kulcsképzésből kihagyott paraméterek (pl. jQuery / DataTables cache-buster) ---
+_IGNORED_ARGS = {'_'}
+
+
+def _current_validators():
+    """
+    ETag és Last-Modified az aktuális adatverzió, az útvonal, a lekérdezési paraméterek
+    és a mai nap alapján (a dashboard adatai napváltáskor is változhatnak).
+    Nem olvasható adatverzió esetén (None, None).
+    """
+    version, updated_at = shared_cache.data_version()
+    if version is None:
+        return None, None
+    today = date.today()
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if k not in _IGNORED_ARGS)
+
+    raw = f"{request.endpoint}|{args}|{version}|{today.isoformat()}"
+    etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    # --- Utolsó módosítás: az utolsó írás vagy a nap kezdete, amelyik későbbi ---
+    day_start = datetime(today.year, today.month, today.day).astimezone(timezone.utc)
+    written_at = datetime.fromtimestamp(updated_at, tz=timezone.utc) if updated_at else day_start
+    last_modified = max(written_at, day_start).replace(microsecond=0)
+    return etag, last_modified
+
+
+def _not_modified(etag, last_modified):
+    """ Igaz, ha a kliens gyorsítótárában lévő változat még aktuális. """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return request.if_modified_since >= last_modified
+    return False
+
+
+def conditional_json(f):
+    """
+    Dekorátor JSON API-khoz: ETag és Last-Modified fejléceket ad a válaszhoz, és
+    If-None-Match / If-Modified-Since egyezés esetén 304 Not Modified választ ad
+    a nézetfüggvény (és így az adatbázis-lekérdezések) futtatása nélkül.
+    """
+    @wraps(f)
+    def decorated_view(*args, **kwargs):
+        etag, last_modified = _current_validators()
+        if etag is None:
+            # --- Az adatok aktualitása nem ismert: a tárolt változat sem ellenőrizhető, teljes válasz ---
+            response = make_response(f(*args, **kwargs))
+            response.cache_control.no_store = True
+            return response
+
+        if _not_modified(etag, last_modified):
+            response = make_response('', 304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        # --- Böngésző: mindig újraellenőriz, de a tárolt választ felhasználhatja ---
+        response.set_etag(etag, weak=True)
+        response.last_modified = last_modified
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+    return decorated_view
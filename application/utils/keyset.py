@@ -0,0 +1,109 @@
+from datetime import date
+from flask import current_app
+from itsdangerous import URLSafeSerializer, BadSignature
+from sqlalchemy import tuple_
+from application.models import Reklamacio
+from application.utils.read_models import reklamacio_rows_query, to_reklamacio_rows
+
+
+# ----------------------------------------------------------------------
+# KEYSET (SEEK) LAPOZÁS A REKLAMÁCIÓK JSON API-HOZ
+# - Rendezés: (complaint_date, id) csökkenő, az ix_complaints_date_desc_id_desc index szerint
+# - A következő oldal a legutolsó sor kulcsa utáni tartomány, így nincs OFFSET-es átlépés:
+#   az 1000. oldal lekérése ugyanannyiba kerül, mint az elsőé
+# ----------------------------------------------------------------------
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+# --- Külső kulcsos szűrők: lekérdezési paraméter -> oszlop (többször is megadható) ---
+FILTER_COLUMNS = {
+    'status': Reklamacio.status_id,
+    'customer': Reklamacio.customer_id,
+    'department': Reklamacio.department_id,
+    'product': Reklamacio.product_id,
+}
+
+
+class InvalidPageRequest(ValueError):
+    """ Hibás lekérdezési paraméter vagy kurzor (400 Bad Request). """
+
+
+def _serializer():
+    """ Aláírt, URL-biztos kurzor a SECRET_KEY alapján (a kliens számára átlátszatlan). """
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='reklamaciok-cursor')
+
+
+def encode_cursor(row):
+    """ A sor rendezési kulcsa (dátum, id) kurzor tokenként. """
+    return _serializer().dumps([row.complaint_date.isoformat(), row.id])
+
+
+def decode_cursor(token):
+    """ Kurzor token -> (dátum, id). Hibás vagy módosított token esetén InvalidPageRequest. """
+    try:
+        complaint_date, reklamacio_id = _serializer().loads(token)
+        return date.fromisoformat(complaint_date), int(reklamacio_id)
+    except (BadSignature, TypeError, ValueError):
+        raise InvalidPageRequest("Érvénytelen kurzor.")
+
+
+def _parse_date(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise InvalidPageRequest(f"Érvénytelen dátum ({name}): {value}")
+
+
+def _filters(args):
+    """ Dátumtartomány (date_from, date_to; zárt) és külső kulcsos szűrők WHERE feltételei. """
+    conditions = []
+    date_from = _parse_date(args, 'date_from')
+    date_to = _parse_date(args, 'date_to')
+    if date_from:
+        conditions.append(Reklamacio.complaint_date >= date_from)
+    if date_to:
+        conditions.append(Reklamacio.complaint_date <= date_to)
+
+    for name, column in FILTER_COLUMNS.items():
+        values = args.getlist(name)
+        if not values:
+            continue
+        try:
+            ids = [int(v) for v in values]
+        except ValueError:
+            raise InvalidPageRequest(f"Érvénytelen azonosító ({name}).")
+        conditions.append(column.in_(ids))
+    return conditions
+
+
+def reklamaciok_page(args):
+    """
+    Egy oldal reklamáció a szűrők és a kurzor alapján.
+    'args': a kérés paraméterei (limit, cursor, date_from, date_to, status, customer, department, product).
+    Visszatérési érték: {'data': [...], 'next_cursor': token vagy None}
+    """
+    limit = args.get('limit', DEFAULT_PAGE_LIMIT, type=int)
+    limit = min(max(limit, 1), MAX_PAGE_LIMIT)
+
+    query = reklamacio_rows_query().filter(*_filters(args))
+
+    # --- Seek feltétel: a kurzor kulcsánál (dátum, id) szigorúan kisebb sorok ---
+    cursor = args.get('cursor')
+    if cursor:
+        query = query.filter(tuple_(Reklamacio.complaint_date, Reklamacio.id) < tuple_(*decode_cursor(cursor)))
+
+    # --- Eggyel több sor lekérése: ebből derül ki, van-e következő oldal ---
+    rows = to_reklamacio_rows(
+        query.order_by(Reklamacio.complaint_date.desc(), Reklamacio.id.desc()).limit(limit + 1).all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        'data': [r.to_json() for r in rows],
+        'next_cursor': encode_cursor(rows[-1]) if has_more else None,
+    }
@@ -1,148 +1,466 @@
 import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.ticker import PercentFormatter, FuncFormatter, NullFormatter
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from io import BytesIO
+from functools import lru_cache
+from typing import NamedTuple
+from xml.sax.saxutils import escape
 import os
 import matplotlib.font_manager as fm
-from flask import current_app
+from application.utils.vector_charts import report_drawing, pivot_drawing
 
-def generate_report_pdf(labels, values, title, chart_type='bar', use_log_scale=False):
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    
-    # --- A Flask current_app.root_path megadja az 'application' mappa teljes útvonalát ---
-    font_filename = 'arial.ttf' 
-    font_path = os.path.join(current_app.root_path, 'static', 'fonts', font_filename)
 
-    if not os.path.exists(font_path):
-        FONT_NAME = 'Helvetica'
-        custom_font_prop = None
-    else:
-        try:
-            # --- ReportLab regisztráció ---
-            pdfmetrics.registerFont(TTFont('CustomFont', font_path))
-            FONT_NAME = 'CustomFont'
-            
-            # --- Matplotlib font tulajdonságok betöltése a fájlból ---
-            custom_font_prop = fm.FontProperties(fname=font_path)
-        except Exception as e:
-            FONT_NAME = 'Helvetica'
-            custom_font_prop = None
+# ----------------------------------------------------------------------
+# PDF MEGJELENÍTÉSI KÖRNYEZET
+# - Betűtípus (ReportLab regisztráció + Matplotlib rcParams), bekezdés- és táblázatstílusok
+# - Folyamatonként egyszer töltődik be (első használatkor vagy warm_up() hívással a worker indulásakor),
+#   a riportok csak olvassák
+# ----------------------------------------------------------------------
+
+# --- Az alkalmazás saját betűtípusa (a Flask alkalmazás kontextusától függetlenül elérhető útvonalon) ---
+FONT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static', 'fonts', 'arial.ttf')
+
+
+class RenderContext(NamedTuple):
+    """ A PDF generálás közös, csak olvasott erőforrásai. """
+    font_name: str
+    styles: object
+    report_table_style: TableStyle
+    pivot_table_style: TableStyle
+
+
+def _register_font():
+    """
+    Egyedi betűtípus regisztrálása (ReportLab) és beállítása alapértelmezettként (Matplotlib rcParams);
+    hiányában Helvetica, illetve a Matplotlib alapértelmezése. Visszatérési érték: a ReportLab betűtípus neve.
+    """
+    if not os.path.exists(FONT_PATH):
+        return 'Helvetica'
+    try:
+        pdfmetrics.registerFont(TTFont('CustomFont', FONT_PATH))
+        fm.fontManager.addfont(FONT_PATH)
+        matplotlib.rcParams['font.family'] = fm.FontProperties(fname=FONT_PATH).get_name()
+        return 'CustomFont'
+    except Exception:
+        return 'Helvetica'
+
+
+@lru_cache(maxsize=None)
+def render_context():
+    """ A folyamat PDF megjelenítési környezete (első híváskor jön létre). """
+    # --- Feliratok szó szerint, mathtext nélkül: a mathtext értelmező közös, nem szálbiztos objektum ---
+    matplotlib.rcParams['text.parse_math'] = False
+    font_name = _register_font()
 
     styles = getSampleStyleSheet()
-    styles['Title'].fontName = FONT_NAME
-    styles['Normal'].fontName = FONT_NAME
+    styles['Title'].fontName = font_name
+    styles['Normal'].fontName = font_name
+    styles['Heading1'].fontName = font_name
 
-    # --- CÍMSOR ---
-    elements.append(Paragraph(f"Reklamációs Riport: {title}", styles['Title']))
-    elements.append(Spacer(1, 20))
+    report_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    pivot_table_style = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ('FONTNAME', (0, 0), (-1, -1), font_name),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ])
+    return RenderContext(font_name, styles, report_table_style, pivot_table_style)
+
+
+def warm_up():
+    """
+    A megjelenítési környezet betöltése és egy üres diagram kirajzolása (Agg backend, betűtípus cache),
+    hogy az első riport kérés ne fizesse meg az inicializálás költségét.
+    """
+    figure, axes = _new_figure((1, 1))
+    axes.bar([0], [1])
+    axes.set_title("Á")
+    _render_png(figure)
+
+
+# ----------------------------------------------------------------------
+# DIAGRAMOK (Matplotlib objektum-orientált API, Agg vászon)
+# - Minden diagram saját Figure / Axes objektumot kap, a pyplot globális állapota nélkül,
+#   így több szál párhuzamosan is rajzolhat (gunicorn gthread workerek)
+# ----------------------------------------------------------------------
+BAR_COLOR = (54/255, 162/255, 235/255, 0.7)
+EDGE_COLOR = (54/255, 162/255, 235/255, 1.0)
+COMPARISON_COLOR = (150/255, 150/255, 150/255, 0.8)
+OUTLIER_COLOR = (220/255, 53/255, 69/255, 0.8)
+PARETO_COLOR = (255/255, 99/255, 132/255, 1.0)
+
+# --- Színes paletta kördiagramhoz ---
+PIE_COLORS = [
+    (54/255, 162/255, 235/255, 0.6), (255/255, 99/255, 132/255, 0.6),
+    (255/255, 206/255, 86/255, 0.6), (75/255, 192/255, 192/255, 0.6),
+    (153/255, 102/255, 255/255, 0.6), (255/255, 159/255, 64/255, 0.6)
+]
 
-    # --- MATPLOTLIB GRAFIKON ---
-    plt.figure(figsize=(7, 4))
-    bar_color = (54/255, 162/255, 235/255, 0.7)
-    edge_color = (54/255, 162/255, 235/255, 1.0)
 
-    # --- Színes paletta kördiagramhoz ---
-    pie_colors = [
-        (54/255, 162/255, 235/255, 0.6), (255/255, 99/255, 132/255, 0.6),
-        (255/255, 206/255, 86/255, 0.6), (75/255, 192/255, 192/255, 0.6),
-        (153/255, 102/255, 255/255, 0.6), (255/255, 159/255, 64/255, 0.6)
-    ]
+def _new_figure(size):
+    """ Új, önálló ábra Agg vászonnal és egyetlen tengelypárral (a megjelenítési környezet betöltése után). """
+    render_context()
+    figure = Figure(figsize=size)
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
 
-    # --- KÖRDIAGRAM ---
-    if chart_type == 'pie':
 
-        patches, texts, autotexts = plt.pie(
+def _render_png(figure, dpi=150):
+    """ Az ábra PNG képe (BytesIO, az elejére tekerve). """
+    img_buffer = BytesIO()
+    figure.savefig(img_buffer, format='png', dpi=dpi)
+    img_buffer.seek(0)
+    return img_buffer
+
+
+def _set_log_scale(axes, values):
+    """
+    Logaritmikus Y tengely egyszerű számfeliratokkal (a 10^n alakú mathtext feliratok helyett).
+    Pozitív érték nélkül (üres vagy csupa nulla adatsor) a lineáris skála marad, ezt a Matplotlib nem tudja ábrázolni.
+    """
+    if not any(value > 0 for value in values):
+        return
+    axes.set_yscale('log')
+    axes.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"{value:,.10g}".replace(",", " ")))
+    axes.yaxis.set_minor_formatter(NullFormatter())
+
+
+def render_report_chart(labels, values, title, chart_type='bar', use_log_scale=False, cumulative_percent=None,
+                        comparison_values=None, comparison_label=None, outliers=None):
+    """ Egydimenziós riport diagramja PNG-ként (BytesIO). """
+    figure, axes = _new_figure((7, 4))
+
+    # --- KÖRDIAGRAM (csupa nulla értéknél nincs mit felosztani) ---
+    if chart_type == 'pie' and not any(value > 0 for value in values):
+        axes.text(0.5, 0.5, "Nincs megjeleníthető adat", ha='center', va='center', transform=axes.transAxes)
+        axes.axis('off')
+    elif chart_type == 'pie':
+        axes.pie(
             values, 
             labels=labels, 
             autopct='%1.1f%%', 
             startangle=140, 
-            colors=pie_colors
+            colors=PIE_COLORS
         )
-        # --- Font beállítása a kördiagram feliratokhoz ---
-        if custom_font_prop:
-            for text in texts + autotexts:
-                text.set_fontproperties(custom_font_prop)
-        
-        plt.axis('equal')
+        axes.axis('equal')
 
     # --- VONALDIAGRAM ---
     elif chart_type == 'line':
-        plt.plot(labels, values, marker='o', color=edge_color, linewidth=2, linestyle='-')
-        plt.grid(True, linestyle='--', alpha=0.5)
+        axes.plot(labels, values, marker='o', color=EDGE_COLOR, linewidth=2, linestyle='-', label="Aktuális időszak")
+        axes.grid(True, linestyle='--', alpha=0.5)
         
-        plt.fill_between(labels, values, color=bar_color, alpha=0.3)
+        axes.fill_between(labels, values, color=BAR_COLOR, alpha=0.3)
+
+        # --- Kiugró értékek piros ponttal ---
+        if outliers:
+            flagged = [i for i, flag in enumerate(outliers) if flag]
+            axes.scatter([labels[i] for i in flagged], [values[i] for i in flagged], color=OUTLIER_COLOR, zorder=3)
+
+        # --- Összevetett időszak szaggatott vonallal ---
+        if comparison_values is not None:
+            axes.plot(labels, comparison_values, marker='o', color=COMPARISON_COLOR, linewidth=2, linestyle='--',
+                      label=comparison_label)
 
     # --- OSZLOPDIAGRAM (alapértelmezett) ---
     else:
-        plt.bar(labels, values, color=bar_color, edgecolor=edge_color)
-        plt.grid(axis='y', linestyle='--', alpha=0.3)
+        positions = list(range(len(labels)))
+
+        # --- Összevetett időszak: az oszlopok párban, egymás mellett ---
+        if comparison_values is not None:
+            width = 0.4
+            axes.bar([p - width / 2 for p in positions], values, width=width, color=BAR_COLOR, edgecolor=EDGE_COLOR,
+                     label="Aktuális időszak")
+            axes.bar([p + width / 2 for p in positions], comparison_values, width=width, color=COMPARISON_COLOR,
+                     label=comparison_label)
+        elif outliers:
+            # --- Kiugró értékek piros oszloppal ---
+            axes.bar(positions, values, color=[OUTLIER_COLOR if flag else BAR_COLOR for flag in outliers],
+                     edgecolor=EDGE_COLOR)
+        else:
+            axes.bar(positions, values, color=BAR_COLOR, edgecolor=EDGE_COLOR)
+        axes.set_xticks(positions, labels)
+        axes.grid(axis='y', linestyle='--', alpha=0.3)
+
+        # --- Pareto: kumulált részesedés vonala a jobb oldali (0-100%) tengelyen ---
+        if cumulative_percent:
+            percent_axes = axes.twinx()
+            percent_axes.plot(positions, cumulative_percent, marker='o', color=PARETO_COLOR, linewidth=2)
+            percent_axes.set_ylim(0, 105)
+            percent_axes.yaxis.set_major_formatter(PercentFormatter())
+
+    # --- Cím (a betűtípus a megjelenítési környezet rcParams beállításából) ---
+    axes.set_title(title, fontsize=14)
 
     # --- TENGELYEK ÉS LOGARITMIKUS SKÁLA ---
     if chart_type != 'pie':
-        # --- Logaritmikus skála beállítása ---
         if use_log_scale:
-            plt.yscale('log')
-        
-        # --- Cím és tengelyfeliratok fontja ---
-        if custom_font_prop:
-            plt.title(title, fontproperties=custom_font_prop, fontsize=14)
-            plt.xticks(rotation=30, ha='right', fontproperties=custom_font_prop)
-            plt.yticks(fontproperties=custom_font_prop)
-        else:
-            plt.title(title, fontsize=14)
-            plt.xticks(rotation=30, ha='right')
-        
-        plt.tight_layout()
-    else:
-        if custom_font_prop:
-            plt.title(title, fontproperties=custom_font_prop, fontsize=14)
+            _set_log_scale(axes, list(values) + list(comparison_values or []))
+        axes.tick_params(axis='x', labelrotation=30)
+        for tick_label in axes.get_xticklabels():
+            tick_label.set_horizontalalignment('right')
+
+        # --- Jelmagyarázat az összevetett időszakhoz ---
+        if comparison_values is not None:
+            axes.legend(fontsize=8)
+
+    figure.tight_layout()
+    return _render_png(figure)
+
+
+def render_pivot_chart(pivot, chart_type='bar', use_log_scale=False):
+    """ Kereszttábla diagramja PNG-ként: kördiagram helyett csoportosított oszlopdiagram. """
+    figure, axes = _new_figure((10, 4.5))
+    positions = range(len(pivot.row_labels))
+    series_count = max(len(pivot.column_labels), 1)
+    bar_width = 0.8 / series_count
+
+    for j, column_label in enumerate(pivot.column_labels):
+        series = [row[j] for row in pivot.cells]
+        if chart_type == 'line':
+            axes.plot(pivot.row_labels, series, marker='o', linewidth=2, label=column_label)
         else:
-            plt.title(title, fontsize=14)
-        plt.tight_layout()
+            axes.bar([p + (j - (series_count - 1) / 2) * bar_width for p in positions], series,
+                     width=bar_width, label=column_label)
+
+    if chart_type != 'line':
+        axes.set_xticks(list(positions), pivot.row_labels)
+    axes.grid(axis='y', linestyle='--', alpha=0.3)
+
+    # --- Logaritmikus skála beállítása ---
+    if use_log_scale:
+        _set_log_scale(axes, [value for row in pivot.cells for value in row])
+
+    # --- Cím, tengelyfeliratok és jelmagyarázat ---
+    axes.set_title(pivot.title, fontsize=14)
+    axes.tick_params(axis='x', labelrotation=30)
+    for tick_label in axes.get_xticklabels():
+        tick_label.set_horizontalalignment('right')
+    if pivot.column_labels:
+        axes.legend(fontsize=8, loc='upper left', bbox_to_anchor=(1.01, 1))
+    figure.tight_layout()
+    return _render_png(figure)
 
-    # --- Kép mentése ---
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150)
-    plt.close()
-    img_buffer.seek(0)
 
-    chart_img = Image(img_buffer, width=480, height=260)
-    elements.append(chart_img)
+def _format_value(val, is_cost):
+    if is_cost:
+        return f"{val:,.0f}".replace(",", " ") + " Ft"
+    return f"{int(val)} db"
+
+
+# --- Diagram formátumok: 'vector' = ReportLab Drawing (vector_charts.py), 'png' = Matplotlib kép ---
+# --- Logaritmikus skálánál mindig PNG (a ReportLab diagramok lineáris tengelyűek) ---
+CHART_FORMATS = ('vector', 'png')
+
+
+def _chart_png(chart_cache, render, *args):
+    """ A diagram PNG képe; 'chart_cache' (artifact_cache.ArtifactCache) esetén a bemenetek szerint cache-elve. """
+    if chart_cache is None:
+        return render(*args)
+    key = chart_cache.key(render.__name__, *args)
+    return BytesIO(chart_cache.get_or_render(key, '.png', lambda: render(*args).getvalue()))
+
+
+def generate_report_pdf(labels, values, title, chart_type='bar', use_log_scale=False, cumulative_percent=None,
+                        comparison_values=None, comparison_label=None, unit=None, outliers=None, chart_cache=None,
+                        chart_format='vector'):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = render_context().styles
+
+    # --- CÍMSOR ---
+    elements = [Paragraph(f"Reklamációs Riport: {title}", styles['Title']), Spacer(1, 20)]
+    elements += _report_elements(labels, values, title, chart_type, use_log_scale, cumulative_percent,
+                                 comparison_values, comparison_label, unit, outliers, chart_cache, chart_format)
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def _report_elements(labels, values, title, chart_type, use_log_scale, cumulative_percent, comparison_values,
+                     comparison_label, unit, outliers, chart_cache, chart_format):
+    """ Egydimenziós riport diagramja, megjegyzései és táblázata (flowable lista, a címsor nélkül). """
+    elements = []
+    context = render_context()
+    styles = context.styles
+
+    # --- GRAFIKON: vektoros (ReportLab), logaritmikus skálánál / kérésre Matplotlib PNG ---
+    if chart_format == 'vector' and not use_log_scale:
+        elements.append(report_drawing(labels, values, title, context.font_name, chart_type, cumulative_percent,
+                                       comparison_values, comparison_label, outliers))
+    else:
+        img_buffer = _chart_png(chart_cache, render_report_chart, labels, values, title, chart_type, use_log_scale,
+                                cumulative_percent, comparison_values, comparison_label, outliers)
+        elements.append(Image(img_buffer, width=480, height=260))
     elements.append(Spacer(1, 30))
 
+    if comparison_label:
+        elements.append(Paragraph(f"Összevetés: {escape(comparison_label)}", styles['Normal']))
+        elements.append(Spacer(1, 10))
+
+    if outliers:
+        elements.append(Paragraph("Kiugró értékek (az átlagtól jelentősen eltérő kategóriák) piros színnel jelölve.",
+                                  styles['Normal']))
+        elements.append(Spacer(1, 10))
+
     # --- TÁBLÁZAT ---
-    is_cost = "költség" in title.lower()
+    is_cost = unit == 'Ft' if unit else "költség" in title.lower()
     data = [[Paragraph("<b>Kategória / Időszak</b>", styles['Normal']), 
              Paragraph("<b>Érték</b>", styles['Normal'])]]
+    col_widths = [350, 100]
+    if cumulative_percent:
+        data[0].append(Paragraph("<b>Kumulált %</b>", styles['Normal']))
+        col_widths = [270, 100, 80]
+    if comparison_values is not None:
+        data[0] += [Paragraph("<b>Összevetés</b>", styles['Normal']), Paragraph("<b>Változás</b>", styles['Normal'])]
+        col_widths = [col_widths[0] - 170] + col_widths[1:] + [100, 70]
 
     for i in range(len(labels)):
-        val = values[i]
-        if is_cost:
-            formatted_val = f"{val:,.0f}".replace(",", " ") + " Ft"
-        else:
-            formatted_val = f"{int(val)} db"
-        data.append([labels[i], formatted_val])
+        row = [labels[i], _format_value(values[i], is_cost)]
+        if cumulative_percent:
+            row.append(f"{cumulative_percent[i]:.1f} %")
+        if comparison_values is not None:
+            previous = comparison_values[i]
+            change = f"{(values[i] - previous) / previous * 100:+.1f} %" if previous else "-"
+            row += [_format_value(previous, is_cost), change]
+        data.append(row)
 
-    table = Table(data, colWidths=[350, 100])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (-1, -1), FONT_NAME),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    table = Table(data, colWidths=col_widths)
+    # --- Kiugró értékek sorai piros betűvel (a fejléc az első sor), a közös stílus kiegészítéseként ---
+    outlier_rows = [('TEXTCOLOR', (0, i + 1), (-1, i + 1), colors.red) for i, flag in enumerate(outliers or []) if flag]
+    table.setStyle(TableStyle(outlier_rows, parent=context.report_table_style) if outlier_rows
+                   else context.report_table_style)
     
+    elements.append(table)
+    return elements
+
+
+# ----------------------------------------------------------------------
+# TELJES RIPORT (minden szempont egy dokumentumban)
+# - Címoldal tartalomjegyzékkel, szempontonként egy fejezet (diagram + táblázat) új oldalon
+# - A tartalomjegyzék oldalszámaihoz a dokumentum többször tördelődik (multiBuild); a diagramok
+#   (Drawing / PNG) egyszer készülnek el, a további menetek csak újra elhelyezik őket
+# ----------------------------------------------------------------------
+class _BundleDocTemplate(SimpleDocTemplate):
+    """ A fejezetcímeket (Heading1) a tartalomjegyzékbe és a PDF könyvjelzői közé veszi fel. """
+
+    def afterFlowable(self, flowable):
+        if isinstance(flowable, Paragraph) and flowable.style.name == 'Heading1':
+            text = flowable.getPlainText()
+            key = f"section-{self.seq.nextf('section')}"
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(text, key, level=0)
+            self.notify('TOCEntry', (0, text, self.page, key))
+
+
+def bundle_chart_args(reports, chart_types, use_log_scale=False):
+    """ A teljes riport fejezeteinek render_report_chart() paraméterei (a PNG diagramok előrajzolásához is). """
+    return [(report.labels, report.values, report.title, chart_type, use_log_scale, report.cumulative_percent,
+             report.comparison_values, report.comparison_label, report.outliers)
+            for report, chart_type in zip(reports, chart_types)]
+
+
+def cache_report_chart(chart_cache, chart_args):
+    """ Egy fejezet PNG diagramja a cache-be (a teljes riport diagramjainak párhuzamos előrajzolása, pdf_pool.py). """
+    _chart_png(chart_cache, render_report_chart, *chart_args)
+
+
+def generate_bundle_pdf(title, reports, chart_types, use_log_scale=False, chart_cache=None, chart_format='vector'):
+    """ Teljes riport: 'reports' (report_engine.ReportResult lista) fejezetenként, 'chart_types' diagram típusaival. """
+    buffer = BytesIO()
+    doc = _BundleDocTemplate(buffer, pagesize=A4, title=title)
+    context = render_context()
+    styles = context.styles
+
+    toc = TableOfContents()
+    toc.levelStyles = [ParagraphStyle('TOCLevel0', parent=toc.levelStyles[0], fontName=context.font_name)]
+    elements = [Paragraph(escape(title), styles['Title']), Spacer(1, 20),
+                Paragraph("<b>Tartalomjegyzék</b>", styles['Normal']), Spacer(1, 10), toc]
+
+    for report, chart_type in zip(reports, chart_types):
+        elements += [PageBreak(), Paragraph(escape(report.title), styles['Heading1']), Spacer(1, 10)]
+        if not report.labels:
+            elements.append(Paragraph("Nincs adat a megadott időszakban.", styles['Normal']))
+            continue
+        elements += _report_elements(report.labels, report.values, report.title, chart_type, use_log_scale,
+                                     report.cumulative_percent, report.comparison_values, report.comparison_label,
+                                     report.unit, report.outliers, chart_cache, chart_format)
+
+    doc.multiBuild(elements)
+    buffer.seek(0)
+    return buffer
+
+# ----------------------------------------------------------------------
+# KERESZTTÁBLA (PIVOT) RIPORT
+# - Grafikon: a sorkategóriák az X tengelyen, oszlopkategóriánként egy adatsor
+# - Táblázat: sor × oszlop mátrix, kérésre sor- és oszlopösszegekkel (fekvő A4)
+# ----------------------------------------------------------------------
+def generate_pivot_pdf(pivot, chart_type='bar', use_log_scale=False, chart_cache=None, chart_format='vector'):
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
+    elements = []
+
+    context = render_context()
+    styles = context.styles
+
+    # --- CÍMSOR ---
+    elements.append(Paragraph(f"Reklamációs Riport: {pivot.title}", styles['Title']))
+    elements.append(Spacer(1, 20))
+
+    # --- GRAFIKON (kördiagram helyett csoportosított oszlopdiagram): vektoros, vagy Matplotlib PNG ---
+    if chart_format == 'vector' and not use_log_scale:
+        elements.append(pivot_drawing(pivot, context.font_name, chart_type))
+    else:
+        img_buffer = _chart_png(chart_cache, render_pivot_chart, pivot, chart_type, use_log_scale)
+        elements.append(Image(img_buffer, width=700, height=315))
+    elements.append(Spacer(1, 30))
+
+    # --- TÁBLÁZAT ---
+    is_cost = pivot.unit == 'Ft'
+    with_totals = pivot.row_totals is not None
+    header = ["Kategória"] + list(pivot.column_labels) + (["Összesen"] if with_totals else [])
+    data = [[Paragraph(f"<b>{escape(h)}</b>", styles['Normal']) for h in header]]
+
+    for i, row_label in enumerate(pivot.row_labels):
+        row = [row_label] + [_format_value(v, is_cost) for v in pivot.cells[i]]
+        if with_totals:
+            row.append(_format_value(pivot.row_totals[i], is_cost))
+        data.append(row)
+    if with_totals:
+        data.append(["Összesen"] + [_format_value(v, is_cost) for v in pivot.column_totals]
+                    + [_format_value(pivot.grand_total, is_cost)])
+
+    # --- Oszlopszélességek: az első oszlop fix, a többi a fennmaradó helyen osztozik ---
+    first_width = 160
+    value_width = (doc.width - first_width) / max(len(header) - 1, 1)
+    table = Table(data, colWidths=[first_width] + [value_width] * (len(header) - 1), repeatRows=1)
+    if with_totals:
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (-1, 1), (-1, -1), colors.whitesmoke),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.whitesmoke),
+        ], parent=context.pivot_table_style))
+    else:
+        table.setStyle(context.pivot_table_style)
+
     elements.append(table)
     doc.build(elements)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
@@ -0,0 +1,203 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from flask import current_app
+from application.utils.artifact_cache import artifact_cache
+from application.utils.pdf_generator import (
+    generate_report_pdf, generate_pivot_pdf, generate_bundle_pdf, bundle_chart_args, cache_report_chart, warm_up
+)
+
+
+# ----------------------------------------------------------------------
+# PDF GENERÁLÓ FOLYAMATKÉSZLET
+# - A diagram rajzolás és a PDF összeállítás CPU-igényes: külön folyamatokban fut, nem a webszerver
+#   kérést kiszolgáló szálán, így a gunicorn workerek a többi kérést szolgálhatják ki
+# - Webszerver workerenként egy készlet ('spawn': a szálas worker nem forkolható biztonságosan);
+#   PDF_WARM_UP esetén a gunicorn worker indulásakor elindul (gunicorn.conf.py), és minden folyamata előre
+#   betölti az alkalmazást és a betűtípusokat (pdf_generator.warm_up), így az első PDF kérés sem várja meg;
+#   egyébként első használatkor indul. Az alkalmazás importjakor nem indítható: a 'spawn' folyamatok is importálják
+# - Korlátos várakozási sor: ha minden hely foglalt, a kérés rövid várakozás után elutasításra kerül;
+#   a hely a feladat befejeződéséig foglalt (időtúllépés után is, amíg a folyamat dolgozik)
+# - PDF_POOL_WORKERS = 0 esetén (pl. fejlesztéskor) a PDF a kérés szálán készül
+# - A kész PDF-ek és a diagramok a generált fájlok cache-ébe kerülnek (artifact_cache.py):
+#   ismételt kérésnél a PDF egy fájl olvasás, a készlet nem is kapja meg
+# - Teljes riport PNG diagramokkal: a diagramok előbb párhuzamosan, külön feladatokként készülnek
+#   (a cache-be), a PDF összeállítása már onnan olvassa őket
+# ----------------------------------------------------------------------
+
+class PdfRenderUnavailable(Exception):
+    """ A PDF nem készült el: a várakozási sor tele van, lejárt a generálási idő, vagy leállt a generáló folyamat. """
+
+
+def _noop():
+    """ Üres feladat: a készlet folyamatainak elindítására (a folyamat indításkor lefut az initializer). """
+    return os.getpid()
+
+
+def _report_pdf_bytes(args, kwargs):
+    return generate_report_pdf(*args, **kwargs).getvalue()
+
+
+def _pivot_pdf_bytes(args, kwargs):
+    return generate_pivot_pdf(*args, **kwargs).getvalue()
+
+
+def _bundle_pdf_bytes(args, kwargs):
+    return generate_bundle_pdf(*args, **kwargs).getvalue()
+
+
+class PdfRenderPool:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+
+    # --- Készlet indítása (folyamatonként egyszer, fork után újra) ---
+    def _ensure_executor(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            config = current_app.config
+            self._executor = ProcessPoolExecutor(
+                max_workers=config['PDF_POOL_WORKERS'],
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=warm_up,
+                max_tasks_per_child=config['PDF_POOL_MAX_TASKS_PER_CHILD'],
+            )
+            self._slots = threading.BoundedSemaphore(config['PDF_POOL_MAX_PENDING'])
+            self._pid = os.getpid()
+
+    def start(self):
+        """
+        A készlet indítása előre (worker induláskor, alkalmazás kontextusban): folyamatonként egy üres feladat,
+        így a folyamatok elindulnak és lefut a warm_up. Nem várja meg őket; PDF_POOL_WORKERS = 0 esetén nincs hatása.
+        """
+        workers = current_app.config['PDF_POOL_WORKERS']
+        if workers <= 0:
+            return
+        self._ensure_executor()
+        for _ in range(workers):
+            self._executor.submit(_noop)
+
+    def _reset(self, executor):
+        """ Leállt (pl. memóriahiány miatt kilőtt) folyamat után a következő kérés új készletet indít. """
+        with self._lock:
+            if self._executor is executor:
+                self._pid = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, function, args, kwargs, charts=None):
+        """
+        A PDF a generált fájlok cache-éből, vagy a készletben generálva (és eltárolva); visszatérési érték: BytesIO.
+        'charts': a PDF PNG diagramjainak render_report_chart() paraméterei, a generálás előtt párhuzamosan rajzolva.
+        Foglaltság / időtúllépés: PdfRenderUnavailable.
+        """
+        kwargs = {**kwargs, 'chart_format': current_app.config['PDF_CHART_FORMAT']}
+        cache = artifact_cache()
+        if cache is None:
+            return BytesIO(self._generate(function, args, kwargs))
+
+        key = cache.key(function.__name__, args, kwargs)
+        data = cache.get(key, '.pdf')
+        if data is None:
+            if charts and (kwargs['chart_format'] == 'png' or kwargs.get('use_log_scale')):
+                self._prerender_charts(cache, charts)
+            data = self._generate(function, args, {**kwargs, 'chart_cache': cache})
+            cache.put(key, '.pdf', data)
+        return BytesIO(data)
+
+    def _generate(self, function, args, kwargs):
+        """ A PDF tartalma (bytes) a készletben, vagy PDF_POOL_WORKERS = 0 esetén a kérés szálán generálva. """
+        config = current_app.config
+        if config['PDF_POOL_WORKERS'] <= 0:
+            return function(args, kwargs)
+
+        # --- Beküldés; ha a készletet közben leállították (egy másik szál _reset()-je: RuntimeError, vagy ---
+        # --- BrokenProcessPool), egyszer újrapróbálva az új készlettel ---
+        for attempt in range(2):
+            self._ensure_executor()
+            executor, slots = self._executor, self._slots
+            if not slots.acquire(timeout=config['PDF_POOL_QUEUE_TIMEOUT']):
+                raise PdfRenderUnavailable("A PDF generálás jelenleg túlterhelt, kérjük, próbálja újra később.")
+            try:
+                future = self._submit(executor, slots, function, args, kwargs)
+                break
+            except RuntimeError as e:
+                current_app.logger.error(f"PDF generáló készlet nem fogad feladatot, újraindítás: {e}")
+                self._reset(executor)
+        else:
+            raise PdfRenderUnavailable("A PDF generálás átmenetileg nem elérhető, kérjük, próbálja újra később.")
+
+        try:
+            return future.result(timeout=config['PDF_RENDER_TIMEOUT'])
+        except FutureTimeoutError:
+            # --- A már futó feladat nem szakítható meg: a helye a befejeződéséig foglalt marad ---
+            future.cancel()
+            current_app.logger.warning(f"PDF generálás időtúllépés ({config['PDF_RENDER_TIMEOUT']} s)")
+            raise PdfRenderUnavailable("A PDF generálás túl sokáig tartott, kérjük, próbálja újra később.")
+        except BrokenProcessPool as e:
+            # --- A készlet újraindul (a következő kérésnél); a PDF nem a kérés szálán készül el ---
+            current_app.logger.error(f"PDF generáló folyamat leállt, újraindítás: {e}")
+            self._reset(executor)
+            raise PdfRenderUnavailable("A PDF generálás átmenetileg nem elérhető, kérjük, próbálja újra később.")
+
+    @staticmethod
+    def _submit(executor, slots, function, *args):
+        """
+        Feladat beküldése egy már lefoglalt várakozási hellyel; a hely a feladat befejeződésekor
+        (eredmény, hiba vagy visszavonás) szabadul fel, sikertelen beküldéskor azonnal.
+        """
+        try:
+            future = executor.submit(function, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _prerender_charts(self, cache, charts):
+        """
+        PNG diagramok párhuzamosan, diagramonként külön feladatként és külön várakozási hellyel (csak amennyi
+        épp szabad, várakozás nélkül); az eredmény a cache-be kerül. A ki nem küldött, túl lassú vagy hibás
+        diagramokat a PDF generálás rajzolja meg.
+        """
+        config = current_app.config
+        if config['PDF_POOL_WORKERS'] <= 1 or len(charts) < 2:
+            return
+
+        self._ensure_executor()
+        executor, slots = self._executor, self._slots
+        futures = []
+        for chart in charts:
+            if not slots.acquire(blocking=False):
+                break
+            try:
+                futures.append(self._submit(executor, slots, cache_report_chart, cache, chart))
+            except RuntimeError:
+                # --- Leállt készlet (BrokenProcessPool): az újraindítást a PDF generálás (_generate) végzi ---
+                break
+        wait(futures, timeout=config['PDF_RENDER_TIMEOUT'])
+
+    def render_report(self, *args, **kwargs):
+        """ generate_report_pdf() a készletben (azonos paraméterekkel). """
+        return self._render(_report_pdf_bytes, args, kwargs)
+
+    def render_pivot(self, *args, **kwargs):
+        """ generate_pivot_pdf() a készletben (azonos paraméterekkel). """
+        return self._render(_pivot_pdf_bytes, args, kwargs)
+
+    def render_bundle(self, title, reports, chart_types, use_log_scale=False):
+        """ generate_bundle_pdf() a készletben; PNG diagramok esetén azok előbb párhuzamosan. """
+        return self._render(_bundle_pdf_bytes, (title, reports, chart_types), {'use_log_scale': use_log_scale},
+                            charts=bundle_chart_args(reports, chart_types, use_log_scale))
+
+
+# --- Folyamatonkénti példány ---
+pdf_pool = PdfRenderPool()
@@ -0,0 +1,114 @@
+from datetime import date
+from typing import NamedTuple, Optional
+from application import db
+from application.models import Reklamacio, Customer, Product, DefectType, Status, Department, User, Role, Position
+
+
+# ----------------------------------------------------------------------
+# OLVASÁSI MODELLEK (csak olvasó nézetekhez)
+# - Pontosan a megjelenített oszlopok, a megnevezésekkel már összekapcsolva
+# - Kompakt, identitás-térkép nélküli named tuple sorok ORM objektumok helyett
+# ----------------------------------------------------------------------
+
+class ReklamacioRow(NamedTuple):
+    """ Egy reklamáció táblázatsora (lista, dashboard, JSON API-k). """
+    id: int
+    complaint_date: date
+    complaint_number: str
+    customer: str
+    product_name: str
+    product_identifier: str
+    defect: str
+    quantity: int
+    status: str
+    department: str
+    requires_return: bool
+    shipping_date: Optional[date]
+    total_cost: Optional[int]
+    user_surname: str
+    user_forename: str
+
+    def to_json(self):
+        """ JSON-kompatibilis szótár (az API-k és a DataTables táblázatok közös formátuma). """
+        return {
+            "id": self.id,
+            "date": self.complaint_date.strftime('%Y-%m-%d') if self.complaint_date else '-',
+            "customer": self.customer,
+            "product_name": self.product_name,
+            "product_id": self.product_identifier,
+            "defect": self.defect,
+            "quantity": self.quantity,
+            "status": self.status,
+            "complaint_number": self.complaint_number,
+            "department": self.department,
+            "requires_return": self.requires_return,
+            "shipping_date": self.shipping_date.strftime('%Y-%m-%d') if self.shipping_date else '-',
+            "cost": self.total_cost or 0,
+            "user": f"{self.user_surname} {self.user_forename}"
+        }
+
+
+# --- A ReklamacioRow mezőinek megfelelő oszlopok (azonos sorrendben) ---
+REKLAMACIO_ROW_COLUMNS = (
+    Reklamacio.id,
+    Reklamacio.complaint_date,
+    Reklamacio.complaint_number,
+    Customer.display_name,
+    Product.display_name,
+    Reklamacio.product_identifier,
+    DefectType.display_name,
+    Reklamacio.quantity,
+    Status.name,
+    Department.display_name,
+    Reklamacio.requires_return,
+    Reklamacio.shipping_date,
+    Reklamacio.total_cost,
+    User.surname,
+    User.forename,
+)
+
+
+def reklamacio_rows_query(*extra_columns):
+    """
+    Lekérdezés a ReklamacioRow oszlopaira (és az esetleges további oszlopokra, pl. rangsor),
+    a törzsadat táblákkal összekapcsolva. Szűrés, rendezés és lapozás a hívónál.
+    """
+    return db.session.query(*REKLAMACIO_ROW_COLUMNS, *extra_columns)\
+        .select_from(Reklamacio)\
+        .join(Reklamacio.customer)\
+        .join(Reklamacio.product)\
+        .join(Reklamacio.defect_type)\
+        .join(Reklamacio.status)\
+        .join(Reklamacio.department)\
+        .join(Reklamacio.user)
+
+
+def to_reklamacio_rows(results):
+    """ Lekérdezés eredménysorai -> ReklamacioRow lista. """
+    return [ReklamacioRow._make(row) for row in results]
+
+
+# ----------------------------------------------------------------------
+# Felhasználók listája (admin)
+# ----------------------------------------------------------------------
+class UserRow(NamedTuple):
+    """ Egy felhasználó sora a felhasználók táblázatában. """
+    id: int
+    surname: str
+    forename: str
+    username: str
+    email: str
+    position: str
+    role: str
+    is_active: bool
+
+
+def user_rows(is_active):
+    """ Aktív vagy inaktív felhasználók, a beosztás és a szerepkör megnevezésével, ID szerint csökkenő sorrendben. """
+    results = db.session.query(
+        User.id, User.surname, User.forename, User.username, User.email,
+        Position.display_name, Role.display_name, User.is_active
+    ).join(User.position).join(User.role)\
+        .filter(User.is_active == is_active)\
+        .order_by(User.id.desc()).all()
+    return [UserRow._make(row) for row in results]
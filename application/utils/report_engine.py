@@ -0,0 +1,603 @@
+from typing import Callable, NamedTuple, Optional
+from flask import current_app
+from sqlalchemy import func, case, cast, or_, literal_column, union_all, Float
+from application import db
+from application.models import Reklamacio, DefectType, Customer, Product, Status, Department
+from application.utils.cache import shared_cache
+from application.utils.rollup import monthly_totals
+from application.utils.statistics import PercentileCont, z_scores, outlier_flags
+from application.utils.time_buckets import (
+    GRANULARITIES, DEFAULT_GRANULARITY, COMPARISONS, bucket_start, bucket_label, bucket_dates, bucketed_totals,
+    bucketed_values, bucketed_comparison, comparison_period
+)
+
+
+# ----------------------------------------------------------------------
+# RIPORT MOTOR
+# - Dimenziók (mi szerint csoportosítunk) és mérőszámok (mit összesítünk) nyilvántartása
+# - Egy riport szempont = dimenzió + mérőszám; új szempont egyetlen bejegyzés a REPORT_CRITERIA-ban
+# - Az eredmény a megosztott cache-ben tárolódik (szempont, időszak, adatverzió szerint),
+#   így a riport megnyitása utáni PDF letöltés / e-mail küldés nem futtatja újra a lekérdezést
+# - Kategória dimenzióknál a rangsorolás és a csonkítás SQL-ben történik (ablakfüggvények):
+#   legfeljebb N kategória + egy 'Egyéb' tétel, így a válasz mérete a kategóriák számától független
+# - Az időbeli bontás (nap / hét / hónap / negyedév / év) és az üres időszakok kitöltése SQL-ben (time_buckets.py)
+# - Teljes riport (run_report_bundle): minden szempont két lekérdezésben (kategóriák UNION ALL-lal, időszakok együtt)
+# ----------------------------------------------------------------------
+
+class InvalidPivotRequest(ValueError):
+    """ Érvénytelen kereszttábla kérés: ismeretlen bontás, vagy azonos sor- és oszlopdimenzió (400 Bad Request). """
+
+
+class Dimension(NamedTuple):
+    """ Csoportosítási dimenzió: a kategória neve (SQL kifejezés), a hozzá szükséges kapcsolat és a megnevezése. """
+    label: object
+    join: object
+    name: str
+
+
+class Measure(NamedTuple):
+    """
+    Összesített mérőszám: az SQL aggregátumot építő függvény (opcionális szűrőfeltétellel), mértékegység,
+    megnevezés, a havi összesítő megfelelő mérőszáma, és hogy összeadható-e (csak ekkor van kumulált %
+    és a cellákból összeadott részösszeg; az 'Egyéb' tétel nem összeadhatónál újraszámolva).
+    """
+    build: Callable
+    unit: str
+    label: str
+    rollup_measure: Optional[str] = None
+    additive: bool = True
+
+    @property
+    def expression(self):
+        """ Az aggregátum, üres csoportra 0. """
+        return func.coalesce(self.build(None), 0)
+
+    def filtered(self, condition):
+        """ Az aggregátum csak a feltételnek megfelelő sorokra (FILTER (WHERE ...)), üres csoportra 0. """
+        return func.coalesce(self.build(condition), 0)
+
+
+class ReportCriterion(NamedTuple):
+    """ A riport űrlapon választható szempont. """
+    dimension: str
+    measure: str
+    choice_label: str
+    title: str
+
+
+class PivotResult(NamedTuple):
+    """
+    Kétdimenziós (kereszttábla) riport: sorok = a szempont dimenziója, oszlopok = a második dimenzió.
+    'cells[i][j]' a sor- és oszlopkategória metszetének értéke (hiányzó kombináció: 0).
+    Részösszegek kérése esetén a sor-, oszlop- és végösszeg is kitöltött, egyébként None.
+    """
+    criterion: str
+    pivot_by: str
+    title: str
+    unit: str
+    row_labels: list
+    column_labels: list
+    cells: list
+    row_totals: Optional[list]
+    column_totals: Optional[list]
+    grand_total: Optional[float]
+    max_value: float
+
+
+class ReportResult(NamedTuple):
+    """
+    Egy riport eredménye; a mezőnevek a cache-elt JSON kulcsai is.
+    'cumulative_percent': Top-N (Pareto) módban a kategóriák kumulált részesedése (%), egyébként None.
+    'comparison_values' / 'comparison_label': összehasonlításkor az összevetett időszak értékei
+    (a 'labels' sorrendjében) és a megnevezése, egyébként None.
+    'measure_label': a mérőszám megnevezése (a diagram adatsorának felirata).
+    'z_scores' / 'outliers': az értékek z-score-ja és kiugró-e (legalább 3 kategóriánál, az 'Egyéb' tétel nélkül).
+    """
+    criterion: str
+    title: str
+    unit: str
+    labels: list
+    values: list
+    cumulative_percent: Optional[list] = None
+    comparison_values: Optional[list] = None
+    comparison_label: Optional[str] = None
+    measure_label: Optional[str] = None
+    z_scores: Optional[list] = None
+    outliers: Optional[list] = None
+
+
+class _Row(NamedTuple):
+    """
+    A riport egy sora a lekérdezés után: címke, érték, kumulált % és összevetett érték (ha van).
+    'is_other': az összevont 'Egyéb' tétel (a lekérdezés jelzője, nem a címke alapján: lehet 'Egyéb' nevű kategória is).
+    """
+    label: str
+    value: float
+    share: Optional[float] = None
+    previous: Optional[float] = None
+    is_other: bool = False
+
+
+# --- Dimenziók ('period': időbeli bontás a választott időszak típussal, lásd time_buckets.py) ---
+DIMENSIONS = {
+    'defect_type': Dimension(DefectType.display_name, Reklamacio.defect_type, 'Hiba típus'),
+    'customer': Dimension(Customer.display_name, Reklamacio.customer, 'Vevő'),
+    'product': Dimension(Product.display_name, Reklamacio.product, 'Termék'),
+    'status': Dimension(Status.display_name, Reklamacio.status, 'Státusz'),
+    'department': Dimension(Department.display_name, Reklamacio.department, 'Üzemegység'),
+    'period': Dimension(None, None, 'Időszak'),
+}
+
+def _aggregate(function, *arguments):
+    """ Measure.build egy aggregátum függvényhez; szűrőfeltétel esetén FILTER (WHERE ...) kiegészítéssel. """
+    def build(condition):
+        expression = function(*arguments)
+        return expression.filter(condition) if condition is not None else expression
+    return build
+
+
+def _ratio(numerator, denominator):
+    """ Measure.build két aggregátum hányadosához (nulla nevezőnél NULL). """
+    def build(condition):
+        return cast(numerator(condition), Float) / func.nullif(denominator(condition), 0)
+    return build
+
+
+# --- Mérőszámok (a percentilisek és az egységköltség nem összeadhatók) ---
+MEASURES = {
+    'count': Measure(_aggregate(func.count, Reklamacio.id), 'db', 'Reklamációk száma', 'count'),
+    'cost': Measure(_aggregate(func.sum, Reklamacio.total_cost), 'Ft', 'Összesített költség (HUF)', 'cost'),
+    'median_cost': Measure(_aggregate(PercentileCont, Reklamacio.total_cost, 0.5), 'Ft',
+                           'Medián költség (HUF)', additive=False),
+    'p90_cost': Measure(_aggregate(PercentileCont, Reklamacio.total_cost, 0.9), 'Ft',
+                        'Költség 90. percentilis (HUF)', additive=False),
+    'cost_per_unit': Measure(_ratio(_aggregate(func.sum, Reklamacio.total_cost), _aggregate(func.sum, Reklamacio.quantity)),
+                             'Ft', 'Egységre jutó költség (HUF/db)', additive=False),
+}
+
+# --- Riport szempontok (az űrlap választéka is ebből készül, ebben a sorrendben) ---
+# --- Időbeli szempontoknál a címben a {period} helyére az időszak típus melléknévi alakja kerül ---
+REPORT_CRITERIA = {
+    'defect_type': ReportCriterion('defect_type', 'count', 'Hiba típusa szerint', 'Hiba típusok szerint'),
+    'customer': ReportCriterion('customer', 'count', 'Vevő szerint', 'Vevők szerint'),
+    'product': ReportCriterion('product', 'count', 'Termék szerint', 'Termékek szerint'),
+    'status': ReportCriterion('status', 'count', 'Státusz szerint', 'Státusz szerint'),
+    'department': ReportCriterion('department', 'count', 'Üzemegység szerint', 'Üzemegységek szerint'),
+    'monthly_cost': ReportCriterion('period', 'cost', 'Össz. költség időbeli bontásban', '{period} költségbontás'),
+    'monthly_count': ReportCriterion('period', 'count', 'Össz. hiba időbeli bontásban', '{period} hibaszám alakulása'),
+}
+
+
+# --- A csonkított kategóriák összevont tételének neve ---
+OTHER_LABEL = "Egyéb"
+
+# --- Top-N választék a riport űrlapon (0: minden kategória, a REPORT_MAX_CATEGORIES korlátig) ---
+TOP_N_CHOICES = [(0, 'Összes (a korlát felett: Egyéb)'), (5, 'Top 5'), (10, 'Top 10'), (20, 'Top 20')]
+
+
+def top_n_value(value):
+    """ Top-N érték a kérés (szöveges) adatából: csak a TOP_N_CHOICES értékei, minden más 0 (összes kategória). """
+    try:
+        top_n = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    return top_n if top_n in dict(TOP_N_CHOICES) else 0
+
+
+def report_choices():
+    """ (kulcs, felirat) párok a ReportFilterForm csoportosítási mezőjéhez. """
+    return [(key, criterion.choice_label) for key, criterion in REPORT_CRITERIA.items()]
+
+
+def pivot_choices():
+    """ (kulcs, felirat) párok a kereszttábla második dimenziójához (üres: egydimenziós riport). """
+    return [('', 'Nincs')] + [(key, dimension.name) for key, dimension in DIMENSIONS.items()]
+
+
+def measure_choices():
+    """ (kulcs, felirat) párok a mérőszám mezőhöz (üres: a szempont saját mérőszáma). """
+    return [('', 'A szempont szerint')] + [(key, measure.label) for key, measure in MEASURES.items()]
+
+
+def _resolve_measure(criterion, measure_key):
+    """ A riport mérőszáma: a választott, ha van, egyébként a szempont saját mérőszáma. """
+    return MEASURES[measure_key or criterion.measure]
+
+
+# ----------------------------------------------------------------------
+# Lekérdezés
+# ----------------------------------------------------------------------
+def _ranked_rows(dimension, measure, start, end, limit, period=None):
+    """
+    A dimenzió kategóriái érték szerint csökkenő sorrendben, az első 'limit' után egyetlen 'Egyéb' tétellel.
+    Egy lekérdezés: GROUP BY -> ablakfüggvények (sorszám, futó és teljes összeg) -> összevonás a rang szerint.
+    Nem összeadható mérőszámnál (medián, egységköltség) kumulált % nélkül; az 'Egyéb' értéke a csonkított kategóriák
+    reklamációiból újraszámolva (a rangsor a reklamációkhoz kapcsolva, a mérőszám rangcsoportonként).
+    'period' (ComparisonPeriod): az összevetett időszak értéke ugyanebben a lekérdezésben, feltételes aggregálással.
+    Visszatérési érték: _Row lista.
+    """
+    in_current = Reklamacio.complaint_date.between(start, end)
+    label = dimension.label.label('label')
+    if period:
+        in_previous = Reklamacio.complaint_date.between(period.start, period.end)
+        columns = [label, measure.filtered(in_current).label('value'), measure.filtered(in_previous).label('previous')]
+        condition = or_(in_current, in_previous)
+    else:
+        columns = [label, measure.expression.label('value'), literal_column('0').label('previous')]
+        condition = in_current
+
+    grouped = db.session.query(*columns).select_from(Reklamacio)
+    if dimension.join is not None:
+        grouped = grouped.join(dimension.join)
+    grouped = grouped.filter(condition).group_by(dimension.label).subquery()
+
+    ranking = (grouped.c.value.desc(), grouped.c.label)
+    ranked = db.session.query(
+        grouped.c.label,
+        grouped.c.value,
+        grouped.c.previous,
+        func.row_number().over(order_by=ranking).label('rank'),
+        func.sum(grouped.c.value).over(order_by=ranking, rows=(None, 0)).label('running'),
+        func.sum(grouped.c.value).over().label('total'),
+    ).subquery()
+
+    # --- A korlát literálként: a SELECT és a GROUP BY kifejezése így azonos (PostgreSQL) ---
+    bucket = case(
+        (ranked.c.rank <= literal_column(str(int(limit))), ranked.c.rank),
+        else_=literal_column(str(int(limit) + 1))
+    ).label('bucket')
+
+    if not measure.additive:
+        values = [measure.filtered(in_current), measure.filtered(in_previous)] if period \
+            else [measure.expression, literal_column('0')]
+        query = db.session.query(bucket, func.min(ranked.c.label), *values, _other_flag(ranked, limit))\
+            .select_from(Reklamacio)
+        if dimension.join is not None:
+            query = query.join(dimension.join)
+        rows = query.join(ranked, ranked.c.label == dimension.label).filter(condition)\
+            .group_by(bucket).order_by(bucket).all()
+        return [_Row(OTHER_LABEL if is_other else (str(category) if category else "Nincs adat"), float(value or 0),
+                     previous=float(previous or 0) if period else None, is_other=bool(is_other))
+                for _, category, value, previous, is_other in rows]
+
+    rows = db.session.query(
+        bucket, func.min(ranked.c.label), func.sum(ranked.c.value),
+        func.max(ranked.c.running), func.max(ranked.c.total), func.sum(ranked.c.previous), _other_flag(ranked, limit)
+    ).group_by(bucket).order_by(bucket).all()
+    return _collapsed_rows(rows, bool(period))
+
+
+def _other_flag(ranked, limit):
+    """ Összevont sorban: 1, ha a csoport a 'limit' utáni rangokat tartalmazza (az 'Egyéb' tétel), egyébként 0. """
+    return func.max(case((ranked.c.rank > literal_column(str(int(limit))), 1), else_=0)).label('is_other')
+
+
+def _collapsed_rows(rows, with_previous):
+    """
+    A rang szerint összevont lekérdezés sorai (rang, címke, érték, futó összeg, teljes összeg, összevetett érték,
+    'Egyéb' jelző) _Row-ként.
+    """
+    results = []
+    for rank, category, total_value, running, total, previous, is_other in rows:
+        if is_other:
+            category = OTHER_LABEL
+        share = float(running) / float(total) * 100 if total else 0.0
+        results.append(_Row(
+            str(category) if category else "Nincs adat",
+            float(total_value or 0),
+            round(share, 1),
+            float(previous or 0) if with_previous else None,
+            bool(is_other)
+        ))
+    return results
+
+
+def _by_name(rows):
+    """ Név szerinti sorrend, az 'Egyéb' tétel (ha van) a végén; kumulált % csak Pareto módban. """
+    return sorted((row._replace(share=None) for row in rows), key=lambda row: (row.is_other, row.label))
+
+
+def _period_rows(measure, granularity, start, end, period=None):
+    """
+    Időszakonkénti értékek a [start, end] tartomány minden időszakára (üres időszak: 0).
+    Havi bontásnál a havi összesítőből (az időszakok sora SQL-ben), egyébként időszak-sorozat LEFT JOIN-nal;
+    összehasonlításkor a két idősor egy lekérdezésben (time_buckets.bucketed_comparison).
+    """
+    if period:
+        return [_Row(bucket_label(granularity, day), value, previous=previous)
+                for day, value, previous in bucketed_comparison(granularity, start, end, period, measure.filtered)]
+
+    if granularity == 'month' and measure.rollup_measure:
+        totals = monthly_totals(start, end, measure.rollup_measure)
+        labels = [bucket_label('month', day) for day in bucket_dates('month', start, end)]
+        return [_Row(label, totals.get(label, 0.0)) for label in labels]
+
+    return [_Row(bucket_label(granularity, day), value)
+            for day, value in bucketed_totals(granularity, start, end, measure.expression)]
+
+
+def _dimension_label(key, granularity):
+    """ A dimenzió címke kifejezése; az időbeli bontásnál az időszak kezdőnapja (time_buckets.py). """
+    if key == 'period':
+        return bucket_start(granularity)
+    return DIMENSIONS[key].label
+
+
+def _dimension_name(key, granularity):
+    """ A dimenzió megnevezése; időbeli bontásnál az időszak típusa (pl. 'Hét'). """
+    if key == 'period':
+        return GRANULARITIES[granularity].name
+    return DIMENSIONS[key].name
+
+
+def _criterion_title(criterion, granularity, measure_key=None):
+    title = criterion.title.format(period=GRANULARITIES[granularity].adjective)
+    if measure_key and measure_key != criterion.measure:
+        title = f"{title} – {MEASURES[measure_key].label}"
+    return title
+
+
+def run_pivot(criterion_key, pivot_key, start, end, with_subtotals=False, granularity=DEFAULT_GRANULARITY,
+              measure_key=None):
+    """
+    Kereszttábla a szempont dimenziója × a második dimenzió szerint, egyetlen GROUP BY lekérdezéssel
+    (a kategóriák számától független lekérdezésszám). Részösszegek PostgreSQL-en GROUP BY CUBE-bal,
+    az adatbázisban számolva; más adatbázison a cellák összegéből (nem összeadható mérőszámnál nincs).
+    'measure_key': a szempont mérőszáma helyett választott mérőszám (MEASURES kulcsa).
+    """
+    criterion = REPORT_CRITERIA[criterion_key]
+    if pivot_key not in DIMENSIONS:
+        raise InvalidPivotRequest(f"Ismeretlen bontás: {pivot_key}")
+    if pivot_key == criterion.dimension:
+        raise InvalidPivotRequest("A bontás nem lehet azonos a csoportosítás szempontjával")
+    measure = _resolve_measure(criterion, measure_key)
+    row_label = _dimension_label(criterion.dimension, granularity)
+    column_label = _dimension_label(pivot_key, granularity)
+    use_cube = with_subtotals and db.session.get_bind().dialect.name == 'postgresql'
+
+    columns = [row_label, column_label, measure.expression]
+    if use_cube:
+        columns += [func.grouping(row_label), func.grouping(column_label)]
+    query = db.session.query(*columns).select_from(Reklamacio)
+    for key in (criterion.dimension, pivot_key):
+        if DIMENSIONS[key].join is not None:
+            query = query.join(DIMENSIONS[key].join)
+    query = query.filter(Reklamacio.complaint_date.between(start, end))
+    if use_cube:
+        query = query.group_by(func.cube(row_label, column_label))
+    else:
+        query = query.group_by(row_label, column_label)
+
+    def category(key, value):
+        if value is None:
+            return "Nincs adat"
+        return bucket_label(granularity, value) if key == 'period' else str(value)
+
+    # --- Eredménysorok szétválogatása: cellák és (CUBE esetén) részösszegek ---
+    cells, row_sums, column_sums, grand_total = {}, {}, {}, None
+    for row in query.all():
+        row_key = category(criterion.dimension, row[0])
+        column_key = category(pivot_key, row[1])
+        value = float(row[2] or 0)
+        row_grouped, column_grouped = (row[3], row[4]) if use_cube else (0, 0)
+        if row_grouped and column_grouped:
+            grand_total = value
+        elif column_grouped:
+            row_sums[row_key] = value
+        elif row_grouped:
+            column_sums[column_key] = value
+        else:
+            cells[(row_key, column_key)] = value
+
+    # --- Tengelyek: az időszakok a teljes tartományra (SQL-ben előállítva, üresen 0), a kategóriák ábécérendben ---
+    def axis(key, position):
+        if key == 'period':
+            return [bucket_label(granularity, day) for day in bucket_dates(granularity, start, end)]
+        return sorted({pair[position] for pair in cells})
+
+    row_labels = axis(criterion.dimension, 0)
+    column_labels = axis(pivot_key, 1)
+    matrix = [[cells.get((r, c), 0.0) for c in column_labels] for r in row_labels]
+
+    row_totals = column_totals = None
+    if with_subtotals:
+        if use_cube:
+            row_totals = [row_sums.get(r, 0.0) for r in row_labels]
+            column_totals = [column_sums.get(c, 0.0) for c in column_labels]
+            grand_total = grand_total or 0.0
+        elif measure.additive:
+            row_totals = [sum(values) for values in matrix]
+            column_totals = [sum(values) for values in zip(*matrix)] if matrix else [0.0] * len(column_labels)
+            grand_total = sum(row_totals)
+
+    return PivotResult(
+        criterion=criterion_key,
+        pivot_by=pivot_key,
+        title=f"{_criterion_title(criterion, granularity, measure_key)} / {_dimension_name(pivot_key, granularity)} bontásban",
+        unit=measure.unit,
+        row_labels=row_labels,
+        column_labels=column_labels,
+        cells=matrix,
+        row_totals=row_totals,
+        column_totals=column_totals,
+        grand_total=grand_total,
+        max_value=max((v for values in matrix for v in values), default=0.0),
+    )
+
+
+def get_pivot(criterion_key, pivot_key, start, end, with_subtotals=False, granularity=DEFAULT_GRANULARITY,
+              measure_key=None):
+    """ run_pivot() eredménye a workerek között megosztott cache-ből. """
+    data = shared_cache.get_or_set(
+        f"pivot:{criterion_key}:{pivot_key}:{start}:{end}:{int(bool(with_subtotals))}:{granularity}:{measure_key or ''}",
+        current_app.config['REPORT_CACHE_TTL'],
+        lambda: run_pivot(criterion_key, pivot_key, start, end, with_subtotals, granularity, measure_key)._asdict()
+    )
+    return PivotResult(**data)
+
+
+def run_report(criterion_key, start, end, top_n=0, granularity=DEFAULT_GRANULARITY, compare=None, measure_key=None):
+    """
+    A riport kiszámítása cache nélkül. Ismeretlen szempont esetén KeyError.
+    'top_n' > 0: Pareto mód (a legnagyobb N kategória érték szerint, 'Egyéb' tétel, kumulált %);
+    egyébként név szerinti sorrend, legfeljebb REPORT_MAX_CATEGORIES kategória, a többi 'Egyéb' tétel (a címben
+    jelölve). Időbeli bontásra nem vonatkozik.
+    'granularity': az időbeli szempontok időszak típusa (GRANULARITIES kulcsa).
+    'compare': összehasonlítás az előző időszakkal ('previous') vagy az előző évvel ('year'), egy lekérdezésben.
+    'measure_key': a szempont mérőszáma helyett választott mérőszám (pl. medián költség, MEASURES kulcsa).
+    A kiugró értékek (|z| >= REPORT_OUTLIER_Z_THRESHOLD) a lekérdezett értékekből, NumPy-val.
+    """
+    criterion = REPORT_CRITERIA[criterion_key]
+    measure = _resolve_measure(criterion, measure_key)
+    period = comparison_period(compare, start, end, granularity) if compare else None
+
+    if criterion.dimension == 'period':
+        rows = _period_rows(measure, granularity, start, end, period)
+    elif top_n:
+        rows = _ranked_rows(DIMENSIONS[criterion.dimension], measure, start, end,
+                            min(top_n, current_app.config['REPORT_MAX_CATEGORIES']), period)
+    else:
+        rows = _by_name(_ranked_rows(DIMENSIONS[criterion.dimension], measure, start, end,
+                                     current_app.config['REPORT_MAX_CATEGORIES'], period))
+    return _report_result(criterion_key, rows, granularity, top_n, compare, period, measure_key)
+
+
+def _report_result(criterion_key, rows, granularity, top_n=0, compare=None, period=None, measure_key=None):
+    """ ReportResult a lekérdezett sorokból: kiugró értékek, cím, összevetés megnevezése. """
+    criterion = REPORT_CRITERIA[criterion_key]
+    measure = _resolve_measure(criterion, measure_key)
+
+    # --- Kiugró értékek: az 'Egyéb' tétel nélkül, legalább 3 kategóriánál ---
+    scores = outliers = None
+    measured = [row.value for row in rows if not row.is_other]
+    if len(measured) >= 3:
+        measured_scores = iter(z_scores(measured))
+        scores = [None if row.is_other else next(measured_scores) for row in rows]
+        flags = outlier_flags([score or 0 for score in scores], current_app.config['REPORT_OUTLIER_Z_THRESHOLD'])
+        outliers = flags if any(flags) else None
+
+    title = _criterion_title(criterion, granularity, measure_key)
+    if top_n and criterion.dimension != 'period':
+        title = f"{title} (Top {top_n})"
+    elif any(row.is_other for row in rows):
+        # --- 'Összes' választásnál is legfeljebb REPORT_MAX_CATEGORIES kategória: a csonkítás a címben jelölve ---
+        title = f"{title} (a {len(rows) - 1} legnagyobb, a többi: {OTHER_LABEL})"
+    if period:
+        title = f"{title}, {COMPARISONS[compare][1]}"
+
+    return ReportResult(
+        criterion=criterion_key,
+        title=title,
+        unit=measure.unit,
+        labels=[row.label for row in rows],
+        values=[row.value for row in rows],
+        cumulative_percent=[row.share for row in rows] if rows and rows[0].share is not None else None,
+        comparison_values=[row.previous for row in rows] if period else None,
+        comparison_label=(f"{COMPARISONS[compare][0]} ({period.start.strftime('%Y.%m.%d')} - "
+                          f"{period.end.strftime('%Y.%m.%d')})") if period else None,
+        measure_label=measure.label,
+        z_scores=scores,
+        outliers=outliers,
+    )
+
+
+def get_report(criterion_key, start, end, top_n=0, granularity=DEFAULT_GRANULARITY, compare=None,
+               measure_key=None):
+    """ run_report() eredménye a workerek között megosztott cache-ből (íráskor érvénytelenül). """
+    data = shared_cache.get_or_set(
+        f"report:{criterion_key}:{start}:{end}:{top_n}:{granularity}:{compare or ''}:{measure_key or ''}",
+        current_app.config['REPORT_CACHE_TTL'],
+        lambda: run_report(criterion_key, start, end, top_n, granularity, compare, measure_key)._asdict()
+    )
+    return ReportResult(**data)
+
+
+# ----------------------------------------------------------------------
+# Teljes riport (minden szempont egy dokumentumban)
+# ----------------------------------------------------------------------
+def _bundle_category_rows(criterion_keys, start, end, limit):
+    """
+    A kategória szempontok (saját, összeadható mérőszámukkal) egyetlen lekérdezésben: szempontonkénti GROUP BY-ok
+    UNION ALL-lal, majd a rangsorolás és az 'Egyéb' összevonás szempontonként (ablakfüggvények PARTITION BY-jal),
+    mint a _ranked_rows-ban. Visszatérési érték: {szempont kulcs: _Row lista}.
+    """
+    in_current = Reklamacio.complaint_date.between(start, end)
+    selects = []
+    for key in criterion_keys:
+        criterion = REPORT_CRITERIA[key]
+        dimension = DIMENSIONS[criterion.dimension]
+        select = db.select(
+            literal_column(f"'{key}'").label('criterion'),
+            dimension.label.label('label'),
+            MEASURES[criterion.measure].expression.label('value'),
+        ).select_from(Reklamacio)
+        if dimension.join is not None:
+            select = select.join(dimension.join)
+        selects.append(select.where(in_current).group_by(dimension.label))
+    grouped = union_all(*selects).subquery()
+
+    partition = grouped.c.criterion
+    ranking = (grouped.c.value.desc(), grouped.c.label)
+    ranked = db.session.query(
+        grouped.c.criterion,
+        grouped.c.label,
+        grouped.c.value,
+        func.row_number().over(partition_by=partition, order_by=ranking).label('rank'),
+        func.sum(grouped.c.value).over(partition_by=partition, order_by=ranking, rows=(None, 0)).label('running'),
+        func.sum(grouped.c.value).over(partition_by=partition).label('total'),
+    ).subquery()
+
+    bucket = case(
+        (ranked.c.rank <= literal_column(str(int(limit))), ranked.c.rank),
+        else_=literal_column(str(int(limit) + 1))
+    ).label('bucket')
+    rows = db.session.query(
+        ranked.c.criterion, bucket, func.min(ranked.c.label), func.sum(ranked.c.value),
+        func.max(ranked.c.running), func.max(ranked.c.total), literal_column('0'), _other_flag(ranked, limit)
+    ).group_by(ranked.c.criterion, bucket).order_by(ranked.c.criterion, bucket).all()
+
+    by_criterion = {key: [] for key in criterion_keys}
+    for row in rows:
+        by_criterion[row[0]].append(row[1:])
+    return {key: _collapsed_rows(ranked_rows, False) for key, ranked_rows in by_criterion.items()}
+
+
+def _bundle_period_rows(criterion_keys, granularity, start, end):
+    """ Az időbeli szempontok idősorai egyetlen lekérdezésben (time_buckets.bucketed_values). Visszatérési érték: {kulcs: _Row lista}. """
+    expressions = [MEASURES[REPORT_CRITERIA[key].measure].expression for key in criterion_keys]
+    series = bucketed_values(granularity, start, end, expressions)
+    return {key: [_Row(bucket_label(granularity, day), values[i]) for day, values in series]
+            for i, key in enumerate(criterion_keys)}
+
+
+def run_report_bundle(start, end, granularity=DEFAULT_GRANULARITY):
+    """
+    Minden riport szempont (REPORT_CRITERIA sorrendjében) a saját mérőszámával, név szerinti sorrendben,
+    legfeljebb REPORT_MAX_CATEGORIES kategóriával; az egyenkénti run_report() hívásokkal azonos eredmények,
+    de a szempontok számától független, két lekérdezéssel. Visszatérési érték: ReportResult lista.
+    """
+    period_keys = [key for key, criterion in REPORT_CRITERIA.items() if criterion.dimension == 'period']
+    category_keys = [key for key in REPORT_CRITERIA if key not in period_keys]
+
+    rows = {}
+    if category_keys:
+        rows.update({key: _by_name(category_rows) for key, category_rows in _bundle_category_rows(
+            category_keys, start, end, current_app.config['REPORT_MAX_CATEGORIES']).items()})
+    if period_keys:
+        rows.update(_bundle_period_rows(period_keys, granularity, start, end))
+    return [_report_result(key, rows[key], granularity) for key in REPORT_CRITERIA]
+
+
+def get_report_bundle(start, end, granularity=DEFAULT_GRANULARITY):
+    """ run_report_bundle() eredménye a workerek között megosztott cache-ből. """
+    data = shared_cache.get_or_set(
+        f"report_bundle:{start}:{end}:{granularity}",
+        current_app.config['REPORT_CACHE_TTL'],
+        lambda: [report._asdict() for report in run_report_bundle(start, end, granularity)]
+    )
+    return [ReportResult(**report) for report in data]
+
+
+def bundle_chart_type(criterion_key):
+    """ A teljes riport diagram típusa: időbeli szempontnál vonal-, egyébként oszlopdiagram. """
+    return 'line' if REPORT_CRITERIA[criterion_key].dimension == 'period' else 'bar'
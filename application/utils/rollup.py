@@ -0,0 +1,232 @@
+from datetime import date, timedelta
+from sqlalchemy import func, case, cast, and_, insert, update, Integer
+from sqlalchemy.dialects import postgresql, sqlite
+from application import db
+from application.models import Reklamacio, ComplaintMonthlyRollup
+from application.utils.cache import invalidate_complaint_data
+from application.utils.helpers import add_months
+
+
+# --- Az összesítő tábla kulcs- és értékoszlopai ---
+ROLLUP_KEY_COLUMNS = ('year', 'month', 'department_id', 'customer_id', 'product_id', 'defect_type_id', 'status_id')
+ROLLUP_VALUE_COLUMNS = ('complaint_count', 'quantity_sum', 'cost_sum', 'return_count')
+# --- A status_id-ből származó jelző: nem kulcs, csak beszúráskor kap értéket ---
+ROLLUP_FLAG_COLUMNS = ('counts_in_stats',)
+# --- INSERT ... ON CONFLICT DO UPDATE támogatás dialektusonként; a többinél a hónap újraszámolása ---
+UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+# ----------------------------------------------------------------------
+# Összesítő sor kulcsa és értékei egy reklamációhoz
+# ----------------------------------------------------------------------
+def rollup_snapshot(reklamacio):
+    """
+    A reklamáció aktuális hozzájárulása az összesítő táblához (kulcs + értékek).
+    Módosítás és törlés előtt kell elkészíteni, hogy a régi sor levonható legyen.
+    """
+    values = {
+        'year': reklamacio.complaint_date.year,
+        'month': reklamacio.complaint_date.month,
+        'department_id': reklamacio.department_id,
+        'customer_id': reklamacio.customer_id,
+        'product_id': reklamacio.product_id,
+        'defect_type_id': reklamacio.defect_type_id,
+        'status_id': reklamacio.status_id,
+        'counts_in_stats': reklamacio.counts_in_stats,
+        'complaint_count': 1,
+        'quantity_sum': reklamacio.quantity or 0,
+        'cost_sum': reklamacio.total_cost or 0,
+        'return_count': 1 if reklamacio.requires_return else 0,
+    }
+    return values
+
+
+# ----------------------------------------------------------------------
+# Inkrementális karbantartás (upsert)
+# ----------------------------------------------------------------------
+def _apply_delta(snapshot, sign):
+    """
+    Hozzáadja (sign=1) vagy levonja (sign=-1) a snapshot értékeit az összesítő táblából.
+    Dialektus-specifikus INSERT ... ON CONFLICT DO UPDATE, így több worker egyidejű írása is konzisztens.
+    Upsert nélküli adatbázison a snapshot hónapját számolja újra a complaints táblából (recompute_rollup_month).
+    """
+    upsert = UPSERT_INSERTS.get(db.session.get_bind().dialect.name)
+    if upsert is None:
+        recompute_rollup_month(snapshot['year'], snapshot['month'])
+        return
+
+    table = ComplaintMonthlyRollup.__table__
+    row = {col: snapshot[col] for col in ROLLUP_KEY_COLUMNS + ROLLUP_FLAG_COLUMNS}
+    row.update({col: sign * snapshot[col] for col in ROLLUP_VALUE_COLUMNS})
+
+    stmt = upsert(table).values(**row)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c[col] for col in ROLLUP_KEY_COLUMNS],
+        set_={col: table.c[col] + stmt.excluded[col] for col in ROLLUP_VALUE_COLUMNS}
+    )
+    db.session.execute(stmt)
+
+    # --- Kiürült sorok eltávolítása levonás után ---
+    if sign < 0:
+        db.session.execute(
+            table.delete().where(
+                and_(*[table.c[col] == snapshot[col] for col in ROLLUP_KEY_COLUMNS]),
+                table.c.complaint_count <= 0
+            )
+        )
+
+
+def rollup_add(reklamacio):
+    """
+    Új vagy módosított reklamáció hozzáadása az összesítőhöz.
+    Előtte flush-olja a munkamenetet, hogy az újonnan létrehozott kapcsolatok ID-jai kitöltődjenek.
+    """
+    db.session.flush()
+    _apply_delta(rollup_snapshot(reklamacio), 1)
+
+
+def rollup_remove(snapshot):
+    """ Korábban elkészített snapshot levonása az összesítőből (módosítás vagy törlés esetén). """
+    _apply_delta(snapshot, -1)
+
+
+# ----------------------------------------------------------------------
+# Teljes újraépítés
+# ----------------------------------------------------------------------
+def _rollup_insert(*conditions):
+    """ INSERT ... SELECT: a feltételeknek megfelelő reklamációk összesítő sorai a complaints táblából. """
+    year = cast(func.extract('year', Reklamacio.complaint_date), Integer)
+    month = cast(func.extract('month', Reklamacio.complaint_date), Integer)
+    dimensions = [Reklamacio.department_id, Reklamacio.customer_id, Reklamacio.product_id,
+                  Reklamacio.defect_type_id, Reklamacio.status_id, Reklamacio.counts_in_stats]
+
+    source = db.select(
+        year, month, *dimensions,
+        func.count(Reklamacio.id),
+        func.coalesce(func.sum(Reklamacio.quantity), 0),
+        func.coalesce(func.sum(Reklamacio.total_cost), 0),
+        func.count(case((Reklamacio.requires_return == True, Reklamacio.id)))
+    ).where(*conditions).group_by(year, month, *dimensions)
+
+    return insert(ComplaintMonthlyRollup.__table__).from_select(
+        list(ROLLUP_KEY_COLUMNS + ROLLUP_FLAG_COLUMNS + ROLLUP_VALUE_COLUMNS), source
+    )
+
+
+def rebuild_rollup():
+    """
+    Az összesítő tábla teljes újraépítése a complaints táblából egyetlen INSERT ... SELECT utasítással.
+    A tranzakció lezárása a hívó feladata. Visszatérési érték: a létrehozott sorok száma.
+    """
+    table = ComplaintMonthlyRollup.__table__
+    db.session.execute(table.delete())
+    db.session.execute(_rollup_insert())
+    return db.session.query(func.count()).select_from(table).scalar()
+
+
+def recompute_rollup_month(year, month):
+    """
+    Egy hónap összesítő sorainak újraszámolása a complaints táblából (a rebuild_rollup egy hónapra szűkítve).
+    Előtte flush-olja a munkamenetet, hogy a függő módosítások és törlések is beszámítsanak.
+    A tranzakció lezárása a hívó feladata.
+    """
+    db.session.flush()
+    table = ComplaintMonthlyRollup.__table__
+    first_day = date(year, month, 1)
+    db.session.execute(table.delete().where(table.c.year == year, table.c.month == month))
+    db.session.execute(_rollup_insert(
+        Reklamacio.complaint_date >= first_day,
+        Reklamacio.complaint_date < add_months(first_day, 1)
+    ))
+
+
+# ----------------------------------------------------------------------
+# Státusz kizárása / visszavétele a statisztikákba
+# ----------------------------------------------------------------------
+def set_status_stats_exclusion(status, excluded):
+    """
+    Beállítja a státusz 'excluded_from_stats' jelzőjét, és a denormalizált 'counts_in_stats'
+    jelzőt a státuszú reklamációkon és az összesítő sorain is frissíti (két tömeges UPDATE,
+    újraépítés nélkül, mert a jelző a status_id-ből származik). Commitol és érvényteleníti a cache-t.
+    Visszatérési érték: az érintett reklamációk száma.
+    """
+    status.excluded_from_stats = excluded
+    affected = db.session.execute(
+        update(Reklamacio).where(Reklamacio.status_id == status.id).values(counts_in_stats=not excluded)
+    ).rowcount
+    db.session.execute(
+        update(ComplaintMonthlyRollup).where(ComplaintMonthlyRollup.status_id == status.id)
+        .values(counts_in_stats=not excluded)
+    )
+    db.session.commit()
+    invalidate_complaint_data()
+    return affected
+
+
+# ----------------------------------------------------------------------
+# Havi összegek lekérdezése (teljes hónapok az összesítőből, töredékhónapok a nyers táblából)
+# ----------------------------------------------------------------------
+MONTHLY_MEASURES = {
+    'count': (ComplaintMonthlyRollup.complaint_count, func.count(Reklamacio.id)),
+    'cost': (ComplaintMonthlyRollup.cost_sum, func.sum(Reklamacio.total_cost)),
+}
+
+
+def split_month_range(start, end):
+    """
+    A [start, end] zárt dátumtartományt felbontja teljes hónapokra és töredékekre.
+    Visszatérési érték: (teljes hónapok [kezdet, vég) tartománya vagy None, töredék [kezdet, vég) tartományok listája)
+    """
+    end_exclusive = end + timedelta(days=1)
+    full_start = start if start.day == 1 else add_months(start, 1)
+    full_end = add_months(end_exclusive, 0)
+
+    if full_start >= full_end:
+        return None, [(start, end_exclusive)]
+
+    partial_ranges = []
+    if start < full_start:
+        partial_ranges.append((start, full_start))
+    if full_end < end_exclusive:
+        partial_ranges.append((full_end, end_exclusive))
+    return (full_start, full_end), partial_ranges
+
+
+def monthly_totals(start, end, measure):
+    """
+    Havi bontású darabszám vagy költség a [start, end] időszakra, {'ÉÉÉÉ-HH': érték} alakban.
+    A teljes hónapokat az összesítő táblából olvassa, így a futásidő nem nő a reklamációk számával;
+    csak az időszak eleji és végi töredékhónapok érintik a complaints táblát.
+    """
+    rollup_column, raw_aggregate = MONTHLY_MEASURES[measure]
+    full_range, partial_ranges = split_month_range(start, end)
+    totals = {}
+
+    # --- Teljes hónapok: összesítő tábla ---
+    if full_range:
+        period = ComplaintMonthlyRollup.year * 12 + ComplaintMonthlyRollup.month - 1
+        first = full_range[0].year * 12 + full_range[0].month - 1
+        last = full_range[1].year * 12 + full_range[1].month - 1
+        rows = db.session.query(ComplaintMonthlyRollup.year, ComplaintMonthlyRollup.month, func.sum(rollup_column))\
+            .filter(
+                ComplaintMonthlyRollup.year.between(full_range[0].year, full_range[1].year),
+                period >= first,
+                period < last
+            ).group_by(ComplaintMonthlyRollup.year, ComplaintMonthlyRollup.month).all()
+        for y, m, value in rows:
+            totals[f"{int(y):04d}-{int(m):02d}"] = float(value or 0)
+
+    # --- Töredékhónapok: nyers tábla, félig nyitott dátumtartományokkal ---
+    year = cast(func.extract('year', Reklamacio.complaint_date), Integer)
+    month = cast(func.extract('month', Reklamacio.complaint_date), Integer)
+    for range_start, range_end in partial_ranges:
+        rows = db.session.query(year, month, raw_aggregate)\
+            .filter(
+                Reklamacio.complaint_date >= range_start,
+                Reklamacio.complaint_date < range_end
+            ).group_by(year, month).all()
+        for y, m, value in rows:
+            key = f"{int(y):04d}-{int(m):02d}"
+            totals[key] = totals.get(key, 0.0) + float(value or 0)
+
+    return totals
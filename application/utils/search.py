@@ -0,0 +1,95 @@
+from sqlalchemy import or_, case, func, literal, literal_column
+from application import db
+from application.models import Reklamacio
+from application.utils.read_models import ReklamacioRow, reklamacio_rows_query
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓ KERESÉS (teljes szöveges + töredék / elírás tűrő)
+# - PostgreSQL: complaints.search_vector (generált tsvector, 'hu_unaccent' konfiguráció,
+#   GIN index) + pg_trgm trigram indexek a reklamációszámon, termékazonosítón és leíráson
+# - Más adatbázison (pl. SQLite fejlesztéshez): ILIKE részszöveg keresés, index nélkül
+# ----------------------------------------------------------------------
+
+# --- Szövegkeresési konfiguráció: magyar szótövezés ékezetek nélkül (lásd migráció) ---
+TEXT_SEARCH_CONFIG = 'hu_unaccent'
+
+# --- Csak PostgreSQL-en létező, generált oszlop (a modell nem képezi le) ---
+SEARCH_VECTOR = literal_column('complaints.search_vector')
+
+# --- Részszöveg keresés mezői (trigram indexek) ---
+TEXT_COLUMNS = (Reklamacio.complaint_number, Reklamacio.product_identifier, Reklamacio.description)
+
+# --- Ennél rövidebb kifejezésre a trigram index nem használható ---
+MIN_TERM_LENGTH = 2
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+def _is_postgres():
+    return db.session.get_bind().dialect.name == 'postgresql'
+
+
+def _tsquery(term):
+    """ Felhasználói keresőkifejezés tsquery-vé alakítása (idézőjel, OR, -kizárás támogatással). """
+    return func.websearch_to_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'"), term)
+
+
+def match_condition(term):
+    """
+    WHERE feltétel: a reklamáció illeszkedik-e a kifejezésre.
+    PostgreSQL-en szótövezett teljes szöveges egyezés, részszöveg (ILIKE) vagy trigram hasonlóság
+    (elírások: reklamációszám, termékazonosító, leírás szavai); máshol csak részszöveg.
+    """
+    fragments = [column.icontains(term, autoescape=True) for column in TEXT_COLUMNS]
+    if not _is_postgres():
+        return or_(*fragments)
+
+    return or_(
+        SEARCH_VECTOR.op('@@')(_tsquery(term)),
+        *fragments,
+        Reklamacio.complaint_number.op('%')(term),
+        Reklamacio.product_identifier.op('%')(term),
+        literal(term).op('<%')(Reklamacio.description),
+    )
+
+
+def rank_expression(term):
+    """ Relevancia: szöveges rangsor + a legjobb trigram hasonlóság (PostgreSQL), egyébként pontos egyezés előnyben. """
+    if not _is_postgres():
+        return case(
+            (Reklamacio.complaint_number == term, 2.0),
+            (Reklamacio.product_identifier == term, 1.5),
+            else_=1.0
+        )
+
+    return func.ts_rank_cd(SEARCH_VECTOR, _tsquery(term)) + func.greatest(
+        func.similarity(Reklamacio.complaint_number, term),
+        func.similarity(Reklamacio.product_identifier, term),
+        func.word_similarity(term, Reklamacio.description),
+    )
+
+
+def search_reklamaciok(term, limit=DEFAULT_SEARCH_LIMIT):
+    """
+    Relevancia szerint rendezett találatok ('rank' mezővel kiegészített táblázatsorok).
+    Egyenlő relevancia esetén a frissebb reklamáció kerül előre.
+    """
+    term = (term or '').strip()
+    if len(term) < MIN_TERM_LENGTH:
+        return []
+    limit = min(max(limit, 1), MAX_SEARCH_LIMIT)
+
+    rank = rank_expression(term).label('rank')
+    rows = reklamacio_rows_query(rank)\
+        .filter(match_condition(term))\
+        .order_by(rank.desc(), Reklamacio.complaint_date.desc(), Reklamacio.id.desc())\
+        .limit(limit).all()
+
+    results = []
+    for *columns, score in rows:
+        row = ReklamacioRow._make(columns).to_json()
+        row['rank'] = round(float(score or 0), 4)
+        results.append(row)
+    return results
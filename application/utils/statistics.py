@@ -0,0 +1,80 @@
+import sqlite3
+import numpy as np
+from sqlalchemy import event, Float, literal_column
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+# ----------------------------------------------------------------------
+# STATISZTIKAI SEGÉDFÜGGVÉNYEK A RIPORTOKHOZ
+# - Percentilis (medián, p90) aggregátum: PostgreSQL percentile_cont WITHIN GROUP,
+#   SQLite-on azonos nevű, NumPy-val számoló alkalmazás-szintű aggregátum függvény
+# - Kiugró értékek jelzése z-score alapján (NumPy, a csoportosított értékeken)
+# ----------------------------------------------------------------------
+
+class PercentileCont(FunctionElement):
+    """ Folytonos percentilis aggregátum: PercentileCont(oszlop, 0.5) = medián. """
+    type = Float()
+    name = 'percentile_cont'
+    inherit_cache = True
+
+    def __init__(self, column, fraction):
+        # --- A hányad literálként: a lekérdezés szövege (és így a SELECT / GROUP BY egyezés) nem függ paramétertől ---
+        super().__init__(column, literal_column(repr(float(fraction))))
+
+
+@compiles(PercentileCont, 'postgresql')
+def _percentile_cont_postgresql(element, compiler, **kw):
+    column, fraction = list(element.clauses)
+    return (f"percentile_cont({compiler.process(fraction, **kw)}) "
+            f"WITHIN GROUP (ORDER BY {compiler.process(column, **kw)})")
+
+
+@compiles(PercentileCont)
+def _percentile_cont_default(element, compiler, **kw):
+    return f"percentile_cont({compiler.process(element.clauses, **kw)})"
+
+
+class _SqlitePercentile:
+    """ SQLite aggregátum: percentile_cont(érték, hányad), lineáris interpolációval (mint a PostgreSQL-é). """
+
+    def __init__(self):
+        self.values = []
+        self.fraction = 0.5
+
+    def step(self, value, fraction):
+        self.fraction = fraction
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        if not self.values:
+            return None
+        return float(np.percentile(np.asarray(self.values, dtype=float), self.fraction * 100))
+
+
+@event.listens_for(Engine, 'connect')
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    """ Új SQLite kapcsolatnál a percentile_cont aggregátum regisztrálása (PostgreSQL-en beépített). """
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_aggregate('percentile_cont', 2, _SqlitePercentile)
+
+
+# ----------------------------------------------------------------------
+# Kiugró értékek
+# ----------------------------------------------------------------------
+def z_scores(values):
+    """ Az értékek z-score-ja (eltérés az átlagtól szórásegységben); azonos értékeknél mind 0. """
+    data = np.asarray(values, dtype=float)
+    if data.size == 0:
+        return []
+    std = data.std()
+    if std == 0:
+        return [0.0] * data.size
+    return np.round((data - data.mean()) / std, 2).tolist()
+
+
+def outlier_flags(scores, threshold):
+    """ Kiugró-e az érték: |z| >= küszöb. """
+    return (np.abs(np.asarray(scores, dtype=float)) >= threshold).tolist()
@@ -0,0 +1,277 @@
+from datetime import date, timedelta
+from typing import NamedTuple
+from sqlalchemy import func, cast, case, or_, Date, DateTime, Integer, literal, literal_column
+from application import db
+from application.models import Reklamacio
+from application.utils.helpers import add_months
+
+
+# ----------------------------------------------------------------------
+# IDŐSZAKOS BONTÁS (nap / hét / hónap / negyedév / év)
+# - A reklamáció dátumából az időszak kezdőnapja SQL kifejezéssel (bucket_start)
+# - Az időszakok teljes sora SQL-ben: PostgreSQL generate_series, SQLite rekurzív CTE
+# - Az üres időszakok a sorozatra kapcsolt LEFT JOIN-nal kapnak 0 értéket, Python ciklus nélkül
+# - Összehasonlító időszak (előző időszak / előző év): a két idősor egy lekérdezésben,
+#   feltételes aggregálással, az összevetett időszak dátumait az aktuális időszakra tolva
+# - Az 'előző időszak' teljes hónapokból / negyedévekből / évekből álló tartománynál a megelőző azonos számú
+#   naptári időszak (febr. 1-29. -> jan. 1-31.), egyébként az azonos hosszú, közvetlenül előző napok
+# - Hónapos eltolásnál a hónap vége a cél hónap végére kerül (febr. 29. + 1 év = febr. 28.), mindkét adatbázison
+# ----------------------------------------------------------------------
+
+class Granularity(NamedTuple):
+    """ Időszak típus: megnevezés, melléknév a riport címéhez, PostgreSQL lépésköz, SQLite dátum módosító. """
+    name: str
+    adjective: str
+    interval: str
+    sqlite_step: str
+
+
+GRANULARITIES = {
+    'day': Granularity('Nap', 'Napi', '1 day', '+1 day'),
+    'week': Granularity('Hét', 'Heti', '1 week', '+7 days'),
+    'month': Granularity('Hónap', 'Havi', '1 month', '+1 month'),
+    'quarter': Granularity('Negyedév', 'Negyedéves', '3 months', '+3 months'),
+    'year': Granularity('Év', 'Éves', '1 year', '+1 year'),
+}
+
+DEFAULT_GRANULARITY = 'month'
+
+
+class ComparisonPeriod(NamedTuple):
+    """ Összevetett időszak: határai és az aktuális időszakhoz képesti eltolása (hónap vagy nap). """
+    start: date
+    end: date
+    months: int
+    days: int
+
+
+# --- Összehasonlítás típusai: megnevezés és a riport címének kiegészítése ---
+COMPARISONS = {
+    'previous': ('Előző időszak', 'előző időszakkal összevetve'),
+    'year': ('Előző év', 'előző évvel összevetve'),
+}
+
+
+def granularity_choices():
+    """ (kulcs, felirat) párok a ReportFilterForm időszak mezőjéhez. """
+    return [(key, granularity.name) for key, granularity in GRANULARITIES.items()]
+
+
+def comparison_choices():
+    """ (kulcs, felirat) párok a ReportFilterForm összehasonlítás mezőjéhez (üres: nincs összehasonlítás). """
+    return [('', 'Nincs')] + [(key, name) for key, (name, _) in COMPARISONS.items()]
+
+
+def _is_postgres():
+    return db.session.get_bind().dialect.name == 'postgresql'
+
+
+# ----------------------------------------------------------------------
+# Időszak kezdőnapja és címkéje (Python oldalon, egy-egy dátumra)
+# ----------------------------------------------------------------------
+def floor_date(granularity, day):
+    """ A nap időszakának kezdőnapja (hét: hétfő). """
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'quarter':
+        return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+    if granularity == 'year':
+        return date(day.year, 1, 1)
+    return add_months(day, 0)
+
+
+def bucket_label(granularity, day):
+    """ Megjelenítési címke az időszak kezdőnapjából, pl. '2024-03-05', '2024-W10', '2024-03', '2024 Q1', '2024'. """
+    if isinstance(day, str):
+        day = date.fromisoformat(day[:10])
+    if granularity == 'day':
+        return day.isoformat()
+    if granularity == 'week':
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if granularity == 'quarter':
+        return f"{day.year} Q{(day.month - 1) // 3 + 1}"
+    if granularity == 'year':
+        return str(day.year)
+    return day.strftime('%Y-%m')
+
+
+def _month_end(day):
+    """ A nap hónapjának utolsó napja. """
+    return add_months(day, 1) - timedelta(days=1)
+
+
+def shift_months(day, months):
+    """ A nap 'months' hónappal eltolva; a cél hónapban nem létező nap a hónap utolsó napja (jan. 31. + 1 = febr. 28/29.). """
+    first = add_months(day, months)
+    return min(first + timedelta(days=day.day - 1), _month_end(first))
+
+
+# --- Naptári időszakok hossza hónapban (a napos / heti bontás napban igazodik) ---
+_PERIOD_MONTHS = {'month': 1, 'quarter': 3, 'year': 12}
+
+
+def _whole_period_months(granularity, start, end):
+    """ Ha a [start, end] tartomány teljes (hónap / negyedév / év) időszakokból áll: a hossza hónapban, egyébként 0. """
+    step = _PERIOD_MONTHS.get(granularity)
+    if not step or start != floor_date(granularity, start) or end != _month_end(end):
+        return 0
+    months = (end.year - start.year) * 12 + end.month - start.month + 1
+    return months if months % step == 0 else 0
+
+
+def comparison_period(kind, start, end, granularity=DEFAULT_GRANULARITY):
+    """
+    Az összevetett időszak. 'year': egy évvel korábban (hónap végi határ a cél hónap végére igazítva).
+    'previous': teljes naptári időszakokból álló tartománynál (a választott bontás szerint) a megelőző azonos
+    számú naptári időszak, egyébként az azonos hosszú, közvetlenül előző napok.
+    """
+    if kind == 'year':
+        months = 12
+    else:
+        months = _whole_period_months(granularity, start, end)
+    if months:
+        previous_end = _month_end(shift_months(end, -months)) if end == _month_end(end) else shift_months(end, -months)
+        return ComparisonPeriod(shift_months(start, -months), previous_end, months, 0)
+    length = (end - start).days + 1
+    return ComparisonPeriod(start - timedelta(days=length), start - timedelta(days=1), 0, length)
+
+
+# ----------------------------------------------------------------------
+# SQL kifejezések
+# ----------------------------------------------------------------------
+def bucket_start(granularity, column=Reklamacio.complaint_date):
+    """
+    Az oszlop dátumának időszak-kezdőnapja SQL-ben (PostgreSQL: date, SQLite: 'ÉÉÉÉ-HH-NN' szöveg).
+    A paraméterek literálként kerülnek be, hogy a SELECT és a GROUP BY kifejezése azonos legyen.
+    """
+    if _is_postgres():
+        return cast(func.date_trunc(literal_column(f"'{granularity}'"), column), Date)
+
+    if granularity == 'day':
+        return func.date(column)
+    if granularity == 'week':
+        # --- A következő (vagy aznapi) vasárnap - 6 nap = a hét hétfője ---
+        return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+    if granularity == 'quarter':
+        months_back = (cast(func.strftime(literal_column("'%m'"), column), Integer) - literal_column('1')) % literal_column('3')
+        return func.date(column, literal_column("'start of month'"),
+                         func.printf(literal_column("'-%d months'"), months_back))
+    if granularity == 'year':
+        return func.date(column, literal_column("'start of year'"))
+    return func.date(column, literal_column("'start of month'"))
+
+
+def _date_literal(day):
+    """ Dátum literálként (a SELECT és a GROUP BY kifejezésében is azonos szöveg). """
+    return literal_column(f"'{day.isoformat()}'")
+
+
+def shift_forward(period, column=Reklamacio.complaint_date):
+    """
+    Az oszlop dátuma az összevetett időszak eltolásával előre tolva (az aktuális időszakba), mint shift_months():
+    a PostgreSQL hónap intervalluma a hónap végére igazít; SQLite-on ('+N months' átcsordulna a következő hónapba)
+    a cél hónap első napjától a nap sorszáma, legfeljebb a cél hónap utolsó napja.
+    """
+    amount = f"{period.months} months" if period.months else f"{period.days} days"
+    if _is_postgres():
+        return cast(column + literal_column(f"interval '{amount}'"), Date)
+    if not period.months:
+        return func.date(column, literal_column(f"'+{amount}'"))
+
+    first = func.date(column, literal_column("'start of month'"), literal_column(f"'+{amount}'"))
+    day_offset = func.printf(literal_column("'+%d days'"),
+                             cast(func.strftime(literal_column("'%d'"), column), Integer) - literal_column('1'))
+    return func.min(func.date(first, day_offset), func.date(first, literal_column("'+1 month'"), literal_column("'-1 day'")))
+
+
+def bucket_series(granularity, start, end):
+    """
+    Az időszakok kezdőnapjainak sora a [start, end] tartományra, 'bucket' oszlopú részlekérdezésként.
+    PostgreSQL: generate_series; más adatbázison rekurzív CTE.
+    """
+    first = floor_date(granularity, start)
+    step = GRANULARITIES[granularity]
+
+    if _is_postgres():
+        series = func.generate_series(
+            cast(literal(first), DateTime), cast(literal(end), DateTime),
+            literal_column(f"interval '{step.interval}'")
+        )
+        return db.select(cast(series, Date).label('bucket')).subquery()
+
+    series = db.select(func.date(literal(first.isoformat())).label('bucket')).cte(recursive=True)
+    next_bucket = func.date(series.c.bucket, literal_column(f"'{step.sqlite_step}'"))
+    series = series.union_all(db.select(next_bucket).where(next_bucket <= end.isoformat()))
+    return db.select(series.c.bucket).subquery()
+
+
+# ----------------------------------------------------------------------
+# Lekérdezések
+# ----------------------------------------------------------------------
+def bucket_dates(granularity, start, end):
+    """ Az időszakok kezdőnapjai (date lista) a [start, end] tartományra, SQL-ben előállítva. """
+    series = bucket_series(granularity, start, end)
+    rows = db.session.query(series.c.bucket).order_by(series.c.bucket).all()
+    return [_as_date(bucket) for bucket, in rows]
+
+
+def bucketed_totals(granularity, start, end, measure_expression):
+    """
+    A mérőszám időszakonként a [start, end] tartományra, minden időszakkal (üres időszak: 0).
+    Egyetlen lekérdezés: időszak-sorozat LEFT JOIN a reklamációk időszakonkénti összesítésére.
+    Visszatérési érték: [(időszak kezdőnapja, érték), ...] időrendben.
+    """
+    return [(day, values[0]) for day, values in bucketed_values(granularity, start, end, [measure_expression])]
+
+
+def bucketed_values(granularity, start, end, measure_expressions):
+    """
+    Több mérőszám időszakonként, egyetlen lekérdezésben (mint bucketed_totals).
+    Visszatérési érték: [(időszak kezdőnapja, [érték, ...]), ...] időrendben, a mérőszámok sorrendjében.
+    """
+    bucket = bucket_start(granularity)
+    grouped = db.session.query(
+        bucket.label('bucket'),
+        *[expression.label(f'value_{i}') for i, expression in enumerate(measure_expressions)]
+    ).filter(Reklamacio.complaint_date.between(start, end)).group_by(bucket).subquery()
+
+    series = bucket_series(granularity, start, end)
+    values = [func.coalesce(grouped.c[f'value_{i}'], 0) for i in range(len(measure_expressions))]
+    rows = db.session.query(series.c.bucket, *values)\
+        .outerjoin(grouped, grouped.c.bucket == series.c.bucket)\
+        .order_by(series.c.bucket).all()
+    return [(_as_date(row[0]), [float(value or 0) for value in row[1:]]) for row in rows]
+
+
+def _as_date(value):
+    """ Az SQLite szövegként, a PostgreSQL dátumként adja vissza az időszak kezdőnapját. """
+    return date.fromisoformat(value[:10]) if isinstance(value, str) else value
+
+
+def bucketed_comparison(granularity, start, end, period, measure_for):
+    """
+    Az aktuális és az összevetett időszak idősora egyetlen lekérdezésben: az összevetett időszak sorai
+    eltolt dátummal kerülnek az aktuális időszak időszakaiba, a két értéket feltételes aggregálás adja.
+    'measure_for(feltétel)': a feltételre szűrt aggregátum kifejezés (lásd Measure.filtered).
+    Visszatérési érték: [(időszak kezdőnapja, aktuális érték, összevetett érték), ...] időrendben.
+    """
+    in_current = Reklamacio.complaint_date >= _date_literal(start)
+    aligned = case((in_current, Reklamacio.complaint_date), else_=shift_forward(period))
+    bucket = bucket_start(granularity, aligned)
+    grouped = db.session.query(
+        bucket.label('bucket'),
+        measure_for(in_current).label('value'),
+        measure_for(~in_current).label('previous')
+    ).filter(or_(
+        Reklamacio.complaint_date.between(start, end),
+        Reklamacio.complaint_date.between(period.start, period.end)
+    )).group_by(bucket).subquery()
+
+    series = bucket_series(granularity, start, end)
+    rows = db.session.query(series.c.bucket, func.coalesce(grouped.c.value, 0), func.coalesce(grouped.c.previous, 0))\
+        .outerjoin(grouped, grouped.c.bucket == series.c.bucket)\
+        .order_by(series.c.bucket).all()
+    return [(_as_date(bucket), float(value or 0), float(previous or 0)) for bucket, value, previous in rows]
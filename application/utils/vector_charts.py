@@ -0,0 +1,228 @@
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.charts.legends import Legend
+from reportlab.graphics.widgets.markers import makeMarker
+from reportlab.lib.colors import Color
+
+
+# ----------------------------------------------------------------------
+# VEKTOROS DIAGRAMOK (ReportLab Drawing)
+# - A diagram a PDF része lesz vektorgrafikaként: nincs raszterizálás és PNG tömörítés,
+#   kisebb fájl, gyorsabb generálás, tetszőleges nagyításnál is éles
+# - Oszlop-, vonal- és kördiagram, összevetett időszakkal, Pareto vonallal és kiugró értékekkel
+# - Logaritmikus skálához a Matplotlib PNG útvonal marad (pdf_generator.py)
+# ----------------------------------------------------------------------
+
+BAR_COLOR = Color(54/255, 162/255, 235/255, 0.7)
+EDGE_COLOR = Color(54/255, 162/255, 235/255, 1.0)
+COMPARISON_COLOR = Color(150/255, 150/255, 150/255, 0.8)
+OUTLIER_COLOR = Color(220/255, 53/255, 69/255, 0.8)
+PARETO_COLOR = Color(255/255, 99/255, 132/255, 1.0)
+GRID_COLOR = Color(0.85, 0.85, 0.85)
+
+# --- Színes paletta kördiagramhoz és a kereszttábla adatsoraihoz ---
+PALETTE = [
+    Color(54/255, 162/255, 235/255, 0.6), Color(255/255, 99/255, 132/255, 0.6),
+    Color(255/255, 206/255, 86/255, 0.6), Color(75/255, 192/255, 192/255, 0.6),
+    Color(153/255, 102/255, 255/255, 0.6), Color(255/255, 159/255, 64/255, 0.6)
+]
+
+# --- Ennél több kategóriánál csak minden n-edik felirat jelenik meg az X tengelyen ---
+MAX_CATEGORY_LABELS = 30
+
+
+def _number_format(value):
+    """ Tengelyfelirat: egész szám ezres tagolással. """
+    return f"{value:,.0f}".replace(",", " ")
+
+
+def _thinned(labels):
+    """ Kategóriafeliratok, sok kategóriánál ritkítva (a többi üres). """
+    step = max(1, -(-len(labels) // MAX_CATEGORY_LABELS))
+    return [str(label) if i % step == 0 else '' for i, label in enumerate(labels)]
+
+
+def _new_drawing(width, height, title, font_name):
+    drawing = Drawing(width, height)
+    drawing.add(String(width / 2, height - 16, title, fontName=font_name, fontSize=12, textAnchor='middle'))
+    return drawing
+
+
+def _no_data(drawing, font_name):
+    """ Üres adatsor: a ReportLab diagramok nem rajzolhatók adat nélkül, helyettük felirat. """
+    drawing.add(String(drawing.width / 2, drawing.height / 2, "Nincs megjeleníthető adat",
+                       fontName=font_name, fontSize=10, textAnchor='middle'))
+    return drawing
+
+
+def _style_axes(chart, labels, font_name):
+    """ Közös tengelybeállítások: elforgatott, ritkított kategóriafeliratok, szaggatott rácsvonalak. """
+    chart.categoryAxis.categoryNames = _thinned(labels)
+    chart.categoryAxis.visibleTicks = len(labels) <= MAX_CATEGORY_LABELS
+    chart.categoryAxis.labels.fontName = font_name
+    chart.categoryAxis.labels.fontSize = 7
+    chart.categoryAxis.labels.angle = 30
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.categoryAxis.labels.dy = -2
+    chart.valueAxis.labels.fontName = font_name
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = _number_format
+    chart.valueAxis.visibleGrid = True
+    chart.valueAxis.gridStrokeColor = GRID_COLOR
+    chart.valueAxis.gridStrokeDashArray = (3, 2)
+    chart.valueAxis.forceZero = True
+
+
+def _legend(x, y, items, font_name, column_maximum=12):
+    """ Jelmagyarázat; 'column_maximum' = 1 esetén egy sorban, egymás mellett. """
+    legend = Legend()
+    legend.x, legend.y = x, y
+    legend.fontName = font_name
+    legend.fontSize = 7
+    legend.alignment = 'right'
+    legend.columnMaximum = column_maximum
+    legend.colorNamePairs = items
+    return legend
+
+
+def report_drawing(labels, values, title, font_name, chart_type='bar', cumulative_percent=None,
+                   comparison_values=None, comparison_label=None, outliers=None, width=480, height=260):
+    """ Egydimenziós riport diagramja ReportLab Drawing-ként (a PNG kép helyére illeszthető flowable). """
+    drawing = _new_drawing(width, height, title, font_name)
+    if not values:
+        return _no_data(drawing, font_name)
+    plot_x, plot_y, plot_width, plot_height = 50, 60, width - 100, height - 90
+    if comparison_values is not None:
+        plot_height -= 16
+
+    # --- KÖRDIAGRAM: feliratok oldalt, a részesedéssel ---
+    if chart_type == 'pie':
+        # --- Csupa nulla érték: nincs mit felosztani (a ReportLab Pie nullával osztana) ---
+        if not any(value > 0 for value in values):
+            return _no_data(drawing, font_name)
+        total = sum(values) or 1
+        pie = Pie()
+        pie.x, pie.y = width / 2 - (height - 70) / 2, 15
+        pie.width = pie.height = height - 70
+        pie.data = [max(value, 0) for value in values]
+        pie.labels = [f"{label} ({value / total * 100:.1f}%)" for label, value in zip(labels, values)]
+        pie.startAngle = 140
+        pie.sideLabels = len(labels) <= MAX_CATEGORY_LABELS
+        pie.simpleLabels = not pie.sideLabels
+        pie.slices.strokeColor = Color(1, 1, 1)
+        pie.slices.strokeWidth = 0.5
+        pie.slices.fontName = font_name
+        pie.slices.fontSize = 7
+        for i in range(len(values)):
+            pie.slices[i].fillColor = PALETTE[i % len(PALETTE)]
+            if len(labels) > MAX_CATEGORY_LABELS:
+                pie.slices[i].label_visible = False
+        drawing.add(pie)
+        return drawing
+
+    series = [list(values)] + ([list(comparison_values)] if comparison_values is not None else [])
+    outlier_series = [value if flag else None for value, flag in zip(values, outliers or [])]
+
+    # --- VONALDIAGRAM ---
+    if chart_type == 'line':
+        chart = HorizontalLineChart()
+        chart.x, chart.y, chart.width, chart.height = plot_x, plot_y, plot_width, plot_height
+        # --- Kiugró értékek: külön, vonal nélküli adatsor piros pontokkal (a többi pont helyén None) ---
+        chart.data = series + ([outlier_series] if any(outlier_series) else [])
+        chart.joinedLines = 1
+        chart.lines[0].strokeColor = EDGE_COLOR
+        chart.lines[0].strokeWidth = 1.5
+        chart.lines[0].symbol = makeMarker('FilledCircle', size=3, fillColor=EDGE_COLOR, strokeColor=EDGE_COLOR)
+        if comparison_values is not None:
+            chart.lines[1].strokeColor = COMPARISON_COLOR
+            chart.lines[1].strokeWidth = 1.5
+            chart.lines[1].strokeDashArray = (4, 2)
+        if any(outlier_series):
+            outlier_line = chart.lines[len(series)]
+            outlier_line.strokeColor = None
+            outlier_line.symbol = makeMarker('FilledCircle', size=6, fillColor=OUTLIER_COLOR, strokeColor=OUTLIER_COLOR)
+        _style_axes(chart, labels, font_name)
+        drawing.add(chart)
+
+    # --- OSZLOPDIAGRAM (alapértelmezett) ---
+    else:
+        chart = VerticalBarChart()
+        chart.x, chart.y, chart.width, chart.height = plot_x, plot_y, plot_width, plot_height
+        chart.data = series
+        chart.barSpacing = 0
+        chart.groupSpacing = 2 if len(labels) > MAX_CATEGORY_LABELS else 6
+        chart.bars.strokeWidth = 0.5 if len(labels) <= MAX_CATEGORY_LABELS else 0
+        chart.bars[0].fillColor = BAR_COLOR
+        chart.bars[0].strokeColor = EDGE_COLOR
+        if comparison_values is not None:
+            chart.bars[1].fillColor = COMPARISON_COLOR
+            chart.bars[1].strokeColor = COMPARISON_COLOR
+        elif outliers:
+            for i, flag in enumerate(outliers):
+                if flag:
+                    chart.bars[(0, i)].fillColor = OUTLIER_COLOR
+        _style_axes(chart, labels, font_name)
+        drawing.add(chart)
+
+        # --- Pareto: kumulált részesedés vonala a jobb oldali (0-100%) tengelyen ---
+        if cumulative_percent:
+            pareto = HorizontalLineChart()
+            pareto.x, pareto.y, pareto.width, pareto.height = plot_x, plot_y, plot_width, plot_height
+            pareto.data = [list(cumulative_percent)]
+            pareto.joinedLines = 1
+            pareto.lines[0].strokeColor = PARETO_COLOR
+            pareto.lines[0].strokeWidth = 1.5
+            pareto.lines[0].symbol = makeMarker('FilledCircle', size=3, fillColor=PARETO_COLOR, strokeColor=PARETO_COLOR)
+            pareto.categoryAxis.visible = False
+            pareto.valueAxis.valueMin, pareto.valueAxis.valueMax, pareto.valueAxis.valueStep = 0, 105, 20
+            pareto.valueAxis.joinAxis = pareto.categoryAxis
+            pareto.valueAxis.joinAxisMode = 'right'
+            pareto.valueAxis.labels.fontName = font_name
+            pareto.valueAxis.labels.fontSize = 7
+            pareto.valueAxis.labels.boxAnchor = 'w'
+            pareto.valueAxis.labels.dx = 8
+            pareto.valueAxis.labelTextFormat = '%d%%'
+            drawing.add(pareto)
+
+    # --- Jelmagyarázat az összevetett időszakhoz: a cím alatt, egy sorban ---
+    if comparison_values is not None:
+        drawing.add(_legend(plot_x, height - 28, [
+            (EDGE_COLOR if chart_type == 'line' else BAR_COLOR, "Aktuális időszak"),
+            (COMPARISON_COLOR, comparison_label or "Összevetés"),
+        ], font_name, column_maximum=1))
+    return drawing
+
+
+def pivot_drawing(pivot, font_name, chart_type='bar', width=700, height=315):
+    """ Kereszttábla diagramja: oszlopkategóriánként egy adatsor (csoportosított oszlop vagy vonal), jelmagyarázattal. """
+    drawing = _new_drawing(width, height, pivot.title, font_name)
+    if not pivot.row_labels:
+        return _no_data(drawing, font_name)
+    series = [[row[j] for row in pivot.cells] for j in range(len(pivot.column_labels))] or [[0] * len(pivot.row_labels)]
+
+    chart = HorizontalLineChart() if chart_type == 'line' else VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = 50, 60, width - 200, height - 90
+    chart.data = series
+    for j in range(len(pivot.column_labels)):
+        color = PALETTE[j % len(PALETTE)]
+        if chart_type == 'line':
+            chart.lines[j].strokeColor = color
+            chart.lines[j].strokeWidth = 1.5
+            chart.lines[j].symbol = makeMarker('FilledCircle', size=3, fillColor=color, strokeColor=color)
+        else:
+            chart.bars[j].fillColor = color
+            chart.bars[j].strokeColor = color
+    if chart_type == 'line':
+        chart.joinedLines = 1
+    else:
+        chart.barSpacing = 0
+        chart.groupSpacing = 6
+    _style_axes(chart, pivot.row_labels, font_name)
+    drawing.add(chart)
+
+    drawing.add(_legend(width - 140, height - 30, [
+        (PALETTE[j % len(PALETTE)], str(label)) for j, label in enumerate(pivot.column_labels)
+    ], font_name))
+    return drawing
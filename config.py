@@ -5,6 +5,7 @@ biztonságos beolvasása.
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -38,3 +39,33 @@ PASSWORD_RESET_TOKEN_EXPIRY = int(os.environ.get('PASSWORD_RESET_TOKEN_EXPIRY',
 
 # --- Értesítési beállítások ---
 REKLAMACIOS_KOR_EMAIL = os.environ.get('REKLAMACIOS_KOR_EMAIL')
+
+# --- Megosztott cache (gunicorn workerek között, SQLite fájlban) ---
+CACHE_DIR = os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'reklamaciokezelo-cache'))
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 60))  # Érvényességi idő (másodperc)
+REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', 600))  # Riport eredmények érvényessége (másodperc)
+CACHE_STATS_FLUSH_INTERVAL = int(os.environ.get('CACHE_STATS_FLUSH_INTERVAL', 30))  # Találat / hiány számlálók kiírása a közös táblába (másodperc)
+REPORT_MAX_CATEGORIES = int(os.environ.get('REPORT_MAX_CATEGORIES', 50))  # Egy riport legfeljebb ennyi kategóriája, a többi az 'Egyéb' tételbe kerül
+REPORT_OUTLIER_Z_THRESHOLD = float(os.environ.get('REPORT_OUTLIER_Z_THRESHOLD', 2.0))  # Ennél nagyobb abszolút z-score-ú kategória kiugrónak jelölve
+
+# --- PDF generálás: betűtípusok és stílusok előtöltése az alkalmazás indulásakor (webszerver workerekben) ---
+PDF_WARM_UP = os.environ.get('PDF_WARM_UP', 'false').lower() in ('true', 'on', '1')
+
+# --- PDF generáló folyamatkészlet (webszerver workerenként; 0: a PDF a kérés szálán készül) ---
+PDF_POOL_WORKERS = int(os.environ.get('PDF_POOL_WORKERS', 2))
+PDF_POOL_MAX_PENDING = int(os.environ.get('PDF_POOL_MAX_PENDING', 8))  # Egyszerre futó / várakozó PDF kérések workerenként
+PDF_POOL_QUEUE_TIMEOUT = float(os.environ.get('PDF_POOL_QUEUE_TIMEOUT', 5))  # Várakozás szabad helyre, utána elutasítás (másodperc)
+PDF_POOL_MAX_TASKS_PER_CHILD = int(os.environ.get('PDF_POOL_MAX_TASKS_PER_CHILD', 200))  # Ennyi PDF után a folyamat újraindul (memória)
+PDF_RENDER_TIMEOUT = float(os.environ.get('PDF_RENDER_TIMEOUT', 60))  # Egy PDF generálásának felső korlátja (másodperc)
+PDF_CHART_FORMAT = os.environ.get('PDF_CHART_FORMAT', 'vector')  # 'vector': ReportLab grafika, 'png': Matplotlib kép
+
+# --- Generált fájlok (diagram PNG, riport PDF) cache-e, tartalom szerint címezve (0 bájt: kikapcsolva) ---
+ARTIFACT_CACHE_DIR = os.environ.get('ARTIFACT_CACHE_DIR', os.path.join(CACHE_DIR, 'artifacts'))
+ARTIFACT_CACHE_MAX_BYTES = int(os.environ.get('ARTIFACT_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # Teljes méret felső korlátja (bájt)
+ARTIFACT_CACHE_MAX_AGE = int(os.environ.get('ARTIFACT_CACHE_MAX_AGE', 7 * 24 * 3600))  # Ennyi ideje nem használt fájl törlődik (másodperc)
+
+# --- Élő dashboard frissítés (Server-Sent Events) ---
+DATA_CHANGE_POLL_INTERVAL = float(os.environ.get('DATA_CHANGE_POLL_INTERVAL', 1.0))  # Adatverzió figyelése (másodperc)
+SSE_HEARTBEAT_INTERVAL = int(os.environ.get('SSE_HEARTBEAT_INTERVAL', 15))  # Életjel küldése (másodperc)
+SSE_MAX_DURATION = int(os.environ.get('SSE_MAX_DURATION', 300))  # Egy stream maximális hossza, utána a böngésző újracsatlakozik
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', 4))  # Egyidejű streamek workerenként (a gunicorn --threads értéke alatt), felette 503
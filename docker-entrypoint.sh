@@ -6,4 +6,10 @@ if [ "$#" -gt 0 ]; then
   exec "$@"
 fi
 flask --app application db upgrade
-exec gunicorn -w 2 -b 0.0.0.0:8000 application:app
+# --- Szálas workerek: a hosszú életű SSE streamek (dashboard) ne foglaljanak le egy teljes workert ---
+# --- Egy stream egy szálat foglal: workerenként legfeljebb SSE_MAX_STREAMS (alapértelmezés 4 a 8 szálból), ---
+# --- így 2 workerrel 8 élő dashboard; a többi lekérdezéssel frissül, a többi kérésnek mindig marad szál ---
+# --- A PDF betűtípusok és stílusok, valamint a PDF folyamatkészlet a worker indulásakor töltődnek be ---
+# --- (gunicorn.conf.py; a CLI parancsoknál nem) ---
+export PDF_WARM_UP="${PDF_WARM_UP:-true}"
+exec gunicorn -c gunicorn.conf.py -w 2 -k gthread --threads 8 -b 0.0.0.0:8000 application:app
@@ -0,0 +1,12 @@
+# ----------------------------------------------------------------------
+# GUNICORN BEÁLLÍTÁSOK (a docker-entrypoint.sh parancssori kapcsolói mellett)
+# - Worker indulásakor (az alkalmazás betöltése után) a PDF folyamatkészlet elindul és előre betölti
+#   az alkalmazást és a betűtípusokat (PDF_WARM_UP), így az első PDF kérés nem várja meg a folyamatok indulását
+# ----------------------------------------------------------------------
+
+def post_worker_init(worker):
+    from application import app
+    from application.utils.pdf_pool import pdf_pool
+    if app.config['PDF_WARM_UP']:
+        with app.app_context():
+            pdf_pool.start()
@@ -0,0 +1,72 @@
+"""Complaint full text search
+
+Revision ID: e5b27c9d4f18
+Revises: c3f81d5e7a92
+Create Date: 2026-10-18 14:41:53.702196
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b27c9d4f18'
+down_revision = 'c3f81d5e7a92'
+branch_labels = None
+depends_on = None
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    # --- Csak PostgreSQL: más adatbázison (SQLite fejlesztés) a keresés ILIKE-kal, index nélkül fut (search.py) ---
+    if not _is_postgres():
+        logger.info("Teljes szöveges keresés: nem PostgreSQL adatbázis, kihagyva")
+        return
+
+    # --- Kiterjesztések: ékezetmentesítés és trigram hasonlóság ---
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # --- Szövegkeresési konfiguráció: magyar szótövezés ékezetmentesítés után ---
+    op.execute("CREATE TEXT SEARCH CONFIGURATION hu_unaccent ( COPY = pg_catalog.hungarian )")
+    op.execute(
+        "ALTER TEXT SEARCH CONFIGURATION hu_unaccent "
+        "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, hungarian_stem"
+    )
+
+    # --- Generált tsvector oszlop: reklamációszám és termékazonosító (A), leírás (B) súllyal ---
+    op.execute("""
+        ALTER TABLE complaints ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('hu_unaccent'::regconfig, coalesce(complaint_number, '')), 'A') ||
+            setweight(to_tsvector('hu_unaccent'::regconfig, coalesce(product_identifier, '')), 'A') ||
+            setweight(to_tsvector('hu_unaccent'::regconfig, coalesce(description, '')), 'B')
+        ) STORED
+    """)
+    op.create_index('ix_complaints_search_vector', 'complaints', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+
+    # --- Trigram indexek: részszöveg (ILIKE) és elírás tűrő (%, <%) keresés ---
+    op.create_index('ix_complaints_complaint_number_trgm', 'complaints', ['complaint_number'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'complaint_number': 'gin_trgm_ops'})
+    op.create_index('ix_complaints_product_identifier_trgm', 'complaints', ['product_identifier'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'product_identifier': 'gin_trgm_ops'})
+    op.create_index('ix_complaints_description_trgm', 'complaints', ['description'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if not _is_postgres():
+        return
+
+    op.drop_index('ix_complaints_description_trgm', table_name='complaints')
+    op.drop_index('ix_complaints_product_identifier_trgm', table_name='complaints')
+    op.drop_index('ix_complaints_complaint_number_trgm', table_name='complaints')
+    op.drop_index('ix_complaints_search_vector', table_name='complaints')
+    op.drop_column('complaints', 'search_vector')
+    op.execute("DROP TEXT SEARCH CONFIGURATION IF EXISTS hu_unaccent")
@@ -0,0 +1,111 @@
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+# --- Tesztkörnyezet: saját SQLite adatbázis és cache könyvtár, PDF a teszt szálán (az alkalmazás importja előtt) ---
+_TEST_DIR = tempfile.mkdtemp(prefix='reklamaciokezelo-test-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_TEST_DIR, 'test.db')}"
+os.environ['SECRET_KEY'] = 'test'
+os.environ['CACHE_DIR'] = os.path.join(_TEST_DIR, 'cache')
+os.environ['PDF_POOL_WORKERS'] = '0'
+os.environ['PDF_WARM_UP'] = 'false'
+os.environ['ARTIFACT_CACHE_MAX_BYTES'] = '0'
+
+import pytest
+from sqlalchemy import event
+from application import app as flask_app, db, bcrypt
+from application.models import (
+    Role, Position, User, Status, Department, Customer, Product, DefectType, Reklamacio
+)
+from application.utils.rollup import rebuild_rollup
+
+
+# ----------------------------------------------------------------------
+# ALKALMAZÁS ÉS ADATBÁZIS
+# - Tesztenként üres adatbázis (create_all / drop_all); a pytest-flask 'client' fixture ezt az alkalmazást használja
+# ----------------------------------------------------------------------
+@pytest.fixture
+def app(tmp_path):
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False, CACHE_DIR=str(tmp_path / 'cache'))
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def super_user(app):
+    """ Bejelentkezésre kész super_user (jelszó: 'pw') a szükséges szerepkörökkel és törzsadatokkal. """
+    roles = {name: Role(name=name, display_name=name) for name in ('admin', 'user', 'super_user')}
+    position = Position(name='operator', display_name='Operátor')
+    db.session.add_all(list(roles.values()) + [position])
+    user = User(surname='Teszt', forename='Elek', username='teszt', email='teszt@example.com',
+                password=bcrypt.generate_password_hash('pw').decode('utf-8'),
+                role=roles['super_user'], position=position)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def logged_in_client(client, super_user):
+    response = client.post('/login', data={'email': super_user.email, 'password': 'pw'})
+    assert response.status_code == 302
+    return client
+
+
+@pytest.fixture
+def make_complaints(super_user):
+    """ 'count' reklamáció véletlenszerű (de ismételhető) törzsadatokkal az elmúlt 'days' napban; az összesítő újraépítve. """
+    def make(count, days=400, seed=1, lookups=5):
+        rnd = random.Random(seed)
+        reference = {}
+        for model in (Department, Customer, Product, DefectType, Status):
+            rows = model.query.all()
+            if not rows:
+                rows = [model(name=f"{model.__name__}{i}", display_name=f"{model.__name__} {i}") for i in range(lookups)]
+                db.session.add_all(rows)
+            reference[model] = rows
+        db.session.flush()
+
+        offset = Reklamacio.query.count()
+        today = date.today()
+        for i in range(offset, offset + count):
+            day = today - timedelta(days=rnd.randint(0, days))
+            db.session.add(Reklamacio(
+                complaint_date=day, complaint_number=f"R-{i}", product_identifier=f"P{i}",
+                quantity=rnd.randint(1, 9), requires_return=rnd.random() < 0.3, description=f"Hibaleírás {i}",
+                shipping_date=day, total_cost=rnd.randint(0, 100000), user=super_user,
+                department=rnd.choice(reference[Department]), customer=rnd.choice(reference[Customer]),
+                product=rnd.choice(reference[Product]), defect_type=rnd.choice(reference[DefectType]),
+                status=rnd.choice(reference[Status]),
+            ))
+        db.session.flush()
+        rebuild_rollup()
+        db.session.commit()
+    return make
+
+
+# ----------------------------------------------------------------------
+# LEKÉRDEZÉSEK SZÁMLÁLÁSA
+# ----------------------------------------------------------------------
+@pytest.fixture
+def count_queries(app):
+    """ Környezetkezelő: a blokkban kiadott SQL utasítások listája (before_cursor_execute). """
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+    return counting
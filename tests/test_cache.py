@@ -0,0 +1,37 @@
+from application.utils.cache import shared_cache
+
+
+# ----------------------------------------------------------------------
+# MEGOSZTOTT CACHE
+# - A találat csak olvas: a számlálók memóriában, a közös táblába időnként kerülnek
+# ----------------------------------------------------------------------
+def _traced_statements():
+    statements = []
+    shared_cache._connection().set_trace_callback(statements.append)
+    return statements
+
+
+def test_cache_hit_does_not_write(app):
+    app.config['CACHE_STATS_FLUSH_INTERVAL'] = 3600
+    before = shared_cache.stats()
+    assert shared_cache.get_or_set('teszt', 60, lambda: {'ertek': 1}) == {'ertek': 1}
+
+    statements = _traced_statements()
+    for _ in range(50):
+        assert shared_cache.get_or_set('teszt', 60, lambda: {'ertek': 2}) == {'ertek': 1}
+    shared_cache._connection().set_trace_callback(None)
+
+    assert not [s for s in statements if s.lstrip().upper().startswith(('UPDATE', 'INSERT', 'DELETE', 'BEGIN'))]
+    stats = shared_cache.stats()
+    assert stats['hits'] - before['hits'] == 50
+    assert stats['misses'] - before['misses'] == 1
+
+
+def test_cache_counters_flushed_to_shared_table(app):
+    app.config['CACHE_STATS_FLUSH_INTERVAL'] = 0
+    shared_cache.get_or_set('teszt', 60, lambda: 1)
+    shared_cache.get_or_set('teszt', 60, lambda: 1)
+
+    stored = dict(shared_cache._connection().execute("SELECT name, value FROM cache_meta").fetchall())
+    assert stored['hits'] >= 1 and stored['misses'] >= 1
+    assert shared_cache._pending_counters() == {'hits': 0, 'misses': 0}
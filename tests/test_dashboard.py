@@ -0,0 +1,32 @@
+from datetime import date
+from application.models import Reklamacio
+from application.utils.helpers import get_dashboard_stats
+
+
+# ----------------------------------------------------------------------
+# DASHBOARD STATISZTIKÁK
+# - Egyetlen lekérdezés a havi összesítőből, a reklamációk számától függetlenül
+# ----------------------------------------------------------------------
+def test_dashboard_stats_single_query(make_complaints, count_queries):
+    for total in (5, 500):
+        make_complaints(total - Reklamacio.query.count(), seed=total)
+        with count_queries() as statements:
+            get_dashboard_stats()
+        assert len(statements) == 1, statements
+
+
+def test_dashboard_stats_match_complaints(make_complaints):
+    make_complaints(300)
+    stats = get_dashboard_stats()
+
+    today = date.today()
+    complaints = Reklamacio.query.filter(Reklamacio.counts_in_stats.is_(True)).all()
+    this_month = [r for r in complaints if (r.complaint_date.year, r.complaint_date.month) == (today.year, today.month)]
+    this_year = [r for r in complaints if r.complaint_date.year == today.year]
+
+    assert stats.count == len(this_month)
+    assert stats.cost == sum(r.total_cost for r in this_month)
+    assert stats.year_cost == sum(r.total_cost for r in this_year)
+    assert stats.return_count == sum(1 for r in this_year if r.requires_return)
+    assert stats.monthly_data['counts'][-1] == len(this_month)
+    assert sum(d['count'] for d in stats.dept_data) == len(this_year)
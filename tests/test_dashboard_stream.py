@@ -0,0 +1,24 @@
+from application.utils.events import dashboard_streams
+
+
+# ----------------------------------------------------------------------
+# ÉLŐ DASHBOARD STREAM
+# - Workerenként legfeljebb SSE_MAX_STREAMS nyitott stream, felette 503; lezáráskor a hely felszabadul
+# ----------------------------------------------------------------------
+def test_stream_limit_per_worker(app, logged_in_client):
+    app.config.update(SSE_MAX_STREAMS=1, SSE_MAX_DURATION=1, SSE_HEARTBEAT_INTERVAL=1)
+
+    # --- Egy másik, még nyitott stream foglalja a worker egyetlen helyét ---
+    assert dashboard_streams.try_acquire(1)
+    try:
+        rejected = logged_in_client.get('/api/stream/dashboard')
+        assert rejected.status_code == 503
+        assert rejected.headers['Retry-After'] == '1'
+    finally:
+        dashboard_streams.release()
+
+    response = logged_in_client.get('/api/stream/dashboard')
+    assert response.status_code == 200
+    assert b'event: dashboard' in response.data
+    response.close()
+    assert dashboard_streams.active == 0
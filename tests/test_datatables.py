@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import event
+from werkzeug.datastructures import MultiDict
+from application import db
+from application.models import Reklamacio, Customer, Product
+from application.utils.datatables import reklamaciok_datatable
+
+
+# ----------------------------------------------------------------------
+# REKLAMÁCIÓ LISTA KERESÉS (DataTables)
+# - Kifejezésenként ID halmazok uniója: saját szöveges mezők, törzsadat megnevezések, azonosító
+# ----------------------------------------------------------------------
+def _search(value, length=100):
+    result = reklamaciok_datatable(MultiDict({'draw': '1', 'start': '0', 'length': str(length), 'search[value]': value}))
+    return result['recordsFiltered'], {row['id'] for row in result['data']}
+
+
+def _expected(predicate):
+    ids = {r.id for r in Reklamacio.query.all() if predicate(r)}
+    return len(ids), ids
+
+
+@pytest.fixture
+def complaints(make_complaints):
+    make_complaints(60)
+    Customer.query.filter_by(name='Customer1').one().display_name = 'Hungarocell Kft'
+    Product.query.filter_by(name='Product2').one().display_name = 'Polisztirol lap'
+    db.session.commit()
+
+
+def test_search_by_lookup_name(complaints):
+    assert _search('hungarocell') == _expected(lambda r: r.customer.display_name == 'Hungarocell Kft')
+
+
+def test_search_by_own_text_field(complaints):
+    assert _search('R-17') == _expected(lambda r: 'r-17' in r.complaint_number.lower())
+
+
+def test_search_terms_must_all_match(complaints):
+    assert _search('hungarocell polisztirol') == _expected(
+        lambda r: r.customer.display_name == 'Hungarocell Kft' and r.product.display_name == 'Polisztirol lap'
+    )
+
+
+def test_search_by_id(complaints):
+    target = Reklamacio.query.order_by(Reklamacio.id).offset(7).first()
+    assert target.id in _search(f"#{target.id}")[1]
+
+
+def test_lookup_branch_uses_foreign_key_index(complaints):
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        _search('hungarocell')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    connection = db.session.connection()
+    plan = [row[-1] for statement, parameters in captured if 'complaints' in statement
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()]
+    assert any('USING INDEX ix_complaints_customer_id' in line or 'USING COVERING INDEX ix_complaints_customer_id' in line
+               for line in plan), plan
@@ -0,0 +1,45 @@
+import sqlite3
+import pytest
+from application.utils.cache import shared_cache
+from application.utils.helpers import get_dashboard_stats
+
+
+# ----------------------------------------------------------------------
+# FELTÉTELES VÁLASZOK (ETag / 304)
+# - Nem olvasható adatverziónál (cache hiba) nincs validátor és nincs 304: mindig friss, teljes válasz
+# ----------------------------------------------------------------------
+URL = '/api/dashboard-stats'
+
+
+@pytest.fixture
+def stats_client(logged_in_client, make_complaints):
+    make_complaints(10, days=20)
+    return logged_in_client
+
+
+def _broken_connection():
+    raise sqlite3.OperationalError('unable to open database file')
+
+
+def test_unchanged_data_not_modified(stats_client):
+    first = stats_client.get(URL)
+    assert first.status_code == 200 and first.headers.get('ETag')
+
+    second = stats_client.get(URL, headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+
+
+def test_unreadable_version_always_full_response(stats_client, make_complaints, monkeypatch):
+    first = stats_client.get(URL)
+    etag, last_modified = first.headers['ETag'], first.headers['Last-Modified']
+
+    monkeypatch.setattr(shared_cache, '_connection', _broken_connection)
+    assert shared_cache.data_version() == (None, None)
+    make_complaints(5, days=20)
+
+    for headers in ({'If-None-Match': etag}, {'If-Modified-Since': last_modified}):
+        response = stats_client.get(URL, headers=headers)
+        assert response.status_code == 200
+        assert 'ETag' not in response.headers and 'Last-Modified' not in response.headers
+        assert response.json != first.json
+        assert response.json['year_cost'] == get_dashboard_stats().year_cost
@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import event
+from werkzeug.datastructures import MultiDict
+from application import db
+from application.utils.helpers import get_recent_reklamaciok
+from application.utils.keyset import reklamaciok_page
+from application.utils.report_engine import run_report
+
+
+# ----------------------------------------------------------------------
+# INDEXEK A GYAKORI LEKÉRDEZÉSEKHEZ (9a4e6b1f0c27 migráció, Reklamacio.__table_args__)
+# - A lista, a legfrissebb reklamációk és a riportok lekérdezéseinek EXPLAIN QUERY PLAN kimenete
+# ----------------------------------------------------------------------
+def _query_plan(call):
+    """ A hívás során kiadott utasítások végrehajtási tervének sorai (SQLite EXPLAIN QUERY PLAN), egy listában. """
+    captured = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+    connection = db.session.connection()
+    return [row[-1] for statement, parameters in captured
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()]
+
+
+@pytest.fixture
+def complaints(make_complaints):
+    make_complaints(500)
+
+
+def test_recent_uses_date_id_index(complaints):
+    plan = _query_plan(get_recent_reklamaciok)
+    assert any('complaints USING INDEX ix_complaints_date_desc_id_desc' in line for line in plan), plan
+    assert not any('TEMP B-TREE FOR ORDER BY' in line for line in plan), plan
+
+
+@pytest.mark.parametrize('args', [{}, {'date_from': (date.today() - timedelta(days=60)).isoformat()}])
+def test_listing_uses_date_id_index(complaints, args):
+    plan = _query_plan(lambda: reklamaciok_page(MultiDict(args)))
+    assert any('complaints USING INDEX ix_complaints_date_desc_id_desc' in line for line in plan), plan
+    assert not any('TEMP B-TREE FOR ORDER BY' in line for line in plan), plan
+
+
+@pytest.mark.parametrize('criterion, index', [
+    ('customer', 'ix_complaints_date_customer'),
+    ('product', 'ix_complaints_date_product'),
+    ('defect_type', 'ix_complaints_date_defect_type'),
+    ('status', 'ix_complaints_date_status'),
+    ('department', 'ix_complaints_date_department'),
+])
+def test_report_uses_date_fk_index(complaints, criterion, index):
+    plan = _query_plan(lambda: run_report(criterion, date.today() - timedelta(days=30), date.today()))
+    assert any(f'complaints USING COVERING INDEX {index}' in line for line in plan), plan
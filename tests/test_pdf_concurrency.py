@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from reportlab import rl_config
+from application.utils.pdf_generator import generate_report_pdf
+
+
+# ----------------------------------------------------------------------
+# PÁRHUZAMOS PDF GENERÁLÁS (gthread worker szálai)
+# - Szálanként eltérő cím és kategóriák; minden eredmény a saját, sorosan generált párjával bájtra azonos
+#   (ReportLab invariant mód: időbélyeg és dokumentum azonosító nélkül), vagyis a szálak nem keverik
+#   egymás diagramját, címét vagy táblázatát
+# ----------------------------------------------------------------------
+THREADS = 8
+
+
+def _report_args(i):
+    labels = [f"Kategória {i}-{j}" for j in range(5)]
+    values = [float((i + 1) * (j + 1)) for j in range(5)]
+    return labels, values, f"Szál {i} riportja"
+
+
+@pytest.fixture(autouse=True)
+def invariant_pdf(monkeypatch):
+    monkeypatch.setattr(rl_config, 'invariant', 1)
+
+
+@pytest.mark.parametrize('chart_format', ['png', 'vector'])
+def test_concurrent_report_pdfs_are_isolated(chart_format):
+    def render(i):
+        return generate_report_pdf(*_report_args(i), chart_type='bar', chart_format=chart_format).getvalue()
+
+    expected = [render(i) for i in range(THREADS)]
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(render, list(range(THREADS)) * 3))
+
+    assert len(set(expected)) == THREADS
+    for n, pdf in enumerate(results):
+        assert pdf.startswith(b'%PDF-') and pdf.rstrip().endswith(b'%%EOF')
+        assert pdf == expected[n % THREADS]
@@ -0,0 +1,139 @@
+import os
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from application.utils.pdf_pool import PdfRenderPool, PdfRenderUnavailable
+
+
+# ----------------------------------------------------------------------
+# PDF KÉSZLET: várakozási helyek
+# - A hely a feladat befejeződéséig foglalt (időtúllépés után is); leállt készletnél nincs helyi generálás
+# - A diagramok előrajzolása feladatonként foglal helyet, csak a szabad helyek erejéig
+# - A készlet helyett kézzel lezárható Future-öket visszaadó végrehajtó
+# ----------------------------------------------------------------------
+class ManualExecutor:
+
+    def __init__(self):
+        self.futures = []
+        self.shut_down = False
+
+    def submit(self, function, *args):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+MAX_PENDING = 2
+
+
+@pytest.fixture
+def pool(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_POOL_WORKERS', 2)
+    monkeypatch.setitem(app.config, 'PDF_POOL_QUEUE_TIMEOUT', 0.05)
+    monkeypatch.setitem(app.config, 'PDF_RENDER_TIMEOUT', 0.05)
+    pool = PdfRenderPool()
+    pool._executor, pool._slots, pool._pid = ManualExecutor(), threading.BoundedSemaphore(MAX_PENDING), os.getpid()
+    return pool
+
+
+def _free_slots(pool):
+    return pool._slots._value
+
+
+def test_slot_held_until_timed_out_task_finishes(pool):
+    with pytest.raises(PdfRenderUnavailable):
+        pool._generate(print, (), {})
+    assert _free_slots(pool) == MAX_PENDING - 1
+
+    pool._executor.futures[0].set_result(b'%PDF-')
+    assert _free_slots(pool) == MAX_PENDING
+
+
+def test_full_queue_rejected_while_tasks_run(pool):
+    for _ in range(MAX_PENDING):
+        with pytest.raises(PdfRenderUnavailable):
+            pool._generate(print, (), {})
+    with pytest.raises(PdfRenderUnavailable, match='túlterhelt'):
+        pool._generate(print, (), {})
+    assert len(pool._executor.futures) == MAX_PENDING
+
+
+def test_broken_pool_reset_without_inline_render(pool):
+    executor = pool._executor
+
+    def fail_after_submit():
+        executor.futures[0].set_exception(BrokenProcessPool('kilőtt folyamat'))
+
+    timer = threading.Timer(0.01, fail_after_submit)
+    timer.start()
+    rendered = []
+    with pytest.raises(PdfRenderUnavailable, match='nem elérhető'):
+        pool._generate(lambda args, kwargs: rendered.append(1), (), {})
+    timer.join()
+
+    assert not rendered
+    assert executor.shut_down and pool._pid is None
+    assert _free_slots(pool) == MAX_PENDING
+
+
+def test_prerender_takes_one_slot_per_chart(pool):
+    pool._prerender_charts(cache=None, charts=['a', 'b', 'c'])
+    futures = pool._executor.futures
+    assert len(futures) == MAX_PENDING
+    assert _free_slots(pool) == 0
+
+    for future in futures:
+        future.set_result(None)
+    assert _free_slots(pool) == MAX_PENDING
+
+
+def test_start_submits_one_task_per_process(pool):
+    pool.start()
+    assert len(pool._executor.futures) == 2
+    assert _free_slots(pool) == MAX_PENDING
+
+
+def test_start_without_pool_workers(pool, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PDF_POOL_WORKERS', 0)
+    pool.start()
+    assert not pool._executor.futures
+
+
+class ShutDownExecutor(ManualExecutor):
+    """ Egy másik szál _reset()-je által már leállított készlet. """
+
+    def submit(self, function, *args):
+        raise RuntimeError('cannot schedule new futures after shutdown')
+
+
+def _replace_executor_on_restart(pool, monkeypatch, executor):
+    """ A készlet újraindítása (_ensure_executor a _reset után) a megadott végrehajtóval. """
+    def ensure():
+        if pool._pid != os.getpid():
+            pool._executor, pool._slots, pool._pid = executor, threading.BoundedSemaphore(MAX_PENDING), os.getpid()
+    monkeypatch.setattr(pool, '_ensure_executor', ensure)
+
+
+def test_submit_after_shutdown_retried_on_new_pool(pool, monkeypatch):
+    old_slots = pool._slots
+    pool._executor = ShutDownExecutor()
+    fresh = ManualExecutor()
+    _replace_executor_on_restart(pool, monkeypatch, fresh)
+    threading.Timer(0.01, lambda: fresh.futures[0].set_result(b'%PDF-')).start()
+
+    assert pool._generate(print, (), {}) == b'%PDF-'
+    assert pool._executor is fresh
+    assert old_slots._value == MAX_PENDING
+
+
+def test_submit_after_shutdown_twice_unavailable(pool, monkeypatch):
+    pool._executor = ShutDownExecutor()
+    _replace_executor_on_restart(pool, monkeypatch, ShutDownExecutor())
+    with pytest.raises(PdfRenderUnavailable, match='nem elérhető'):
+        pool._generate(print, (), {})
+    assert _free_slots(pool) == MAX_PENDING
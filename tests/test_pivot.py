@@ -0,0 +1,45 @@
+from datetime import date, timedelta
+import pytest
+from application.forms import ReportFilterForm
+from application.utils.report_engine import run_pivot, InvalidPivotRequest
+
+
+# ----------------------------------------------------------------------
+# KERESZTTÁBLA: a bontás nem lehet azonos a csoportosítás dimenziójával
+# ----------------------------------------------------------------------
+START, END = date.today() - timedelta(days=30), date.today()
+
+
+@pytest.mark.parametrize('criterion, pivot_key', [('customer', 'customer'), ('monthly_count', 'period'), ('status', 'nincs')])
+def test_run_pivot_rejects_invalid_dimension(app, criterion, pivot_key):
+    with pytest.raises(InvalidPivotRequest):
+        run_pivot(criterion, pivot_key, START, END)
+
+
+def test_run_pivot_accepts_distinct_dimensions(make_complaints):
+    make_complaints(20, days=30)
+    pivot = run_pivot('customer', 'product', START, END)
+    assert sum(map(sum, pivot.cells)) == 20
+
+
+def _report_fields(**overrides):
+    fields = {'start_date': START.isoformat(), 'end_date': END.isoformat(), 'group_by': 'customer',
+              'pivot_by': 'customer', 'subtotals': 'false', 'chart_type': 'bar'}
+    fields.update(overrides)
+    return fields
+
+
+def test_form_rejects_same_dimension(app):
+    with app.test_request_context(method='POST', data=_report_fields()):
+        form = ReportFilterForm()
+        assert not form.validate()
+        assert 'pivot_by' in form.errors
+
+
+@pytest.mark.parametrize('url, extra', [
+    ('/reports/download', {}),
+    ('/reports/send_email', {'recipient_email': 'cimzett@example.com'}),
+])
+def test_routes_return_400_for_same_dimension(logged_in_client, url, extra):
+    response = logged_in_client.post(url, data=_report_fields(**extra))
+    assert response.status_code == 400
@@ -0,0 +1,35 @@
+import pytest
+from application.models import Reklamacio
+from application.utils.cache import invalidate_complaint_data
+
+
+# ----------------------------------------------------------------------
+# ÁLLANDÓ LEKÉRDEZÉSSZÁM (N+1 lekérdezések nélkül)
+# - A lista, a részletes (módosító) oldal és a legfrissebb reklamációk API ugyanannyi SQL utasítással
+#   válaszol 5 és 500 reklamáció esetén (Reklamacio.LOAD_PROFILES, read_models.py)
+# ----------------------------------------------------------------------
+ENDPOINTS = {
+    'list': lambda reklamacio_id: '/api/reklamaciok/datatable?draw=1&start=0&length=25&order[0][column]=0&order[0][dir]=desc',
+    'keyset': lambda reklamacio_id: '/api/reklamaciok?limit=50',
+    'detail': lambda reklamacio_id: f'/reklamacio/modositas/{reklamacio_id}',
+    'recent': lambda reklamacio_id: '/api/recent-reklamaciok',
+}
+
+
+def _statement_count(client, count_queries, url):
+    # --- A megosztott cache ürítése: mindkét méretnél a lekérdezés fut (nem a cache-elt eredmény) ---
+    invalidate_complaint_data()
+    with count_queries() as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+def test_constant_query_count(logged_in_client, make_complaints, count_queries, endpoint):
+    counts = []
+    for total in (5, 500):
+        make_complaints(total - Reklamacio.query.count(), seed=total)
+        url = ENDPOINTS[endpoint](Reklamacio.query.order_by(Reklamacio.id.desc()).first().id)
+        counts.append(_statement_count(logged_in_client, count_queries, url))
+    assert counts[0] == counts[1], counts
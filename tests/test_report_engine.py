@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from application import db
+from application.models import Customer, Reklamacio
+from application.utils.report_engine import run_report, run_report_bundle, top_n_value, OTHER_LABEL
+
+
+# ----------------------------------------------------------------------
+# 'EGYÉB' TÉTEL: a lekérdezés jelzője szerint, nem a címke alapján
+# - Egy valódi 'Egyéb' nevű vevő nem olvad össze a csonkított kategóriákkal, és nem kerül a lista végére
+# ----------------------------------------------------------------------
+START, END = date.today() - timedelta(days=30), date.today()
+
+
+@pytest.fixture
+def other_named_customer(app, make_complaints):
+    """ A legtöbb reklamációjú vevő neve 'Egyéb' (Top-N módban is az első helyen áll). """
+    make_complaints(300, days=30, lookups=8)
+    top_customer_id = db.session.query(Reklamacio.customer_id).group_by(Reklamacio.customer_id)\
+        .order_by(db.func.count().desc(), Reklamacio.customer_id).limit(1).scalar()
+    db.session.get(Customer, top_customer_id).display_name = OTHER_LABEL
+    db.session.commit()
+
+
+def test_real_other_category_sorted_by_name(app, other_named_customer, monkeypatch):
+    monkeypatch.setitem(app.config, 'REPORT_MAX_CATEGORIES', 20)
+    report = run_report('customer', START, END)
+    assert report.labels == sorted(report.labels)
+    assert report.labels.count(OTHER_LABEL) == 1
+    assert report.z_scores is not None and None not in report.z_scores
+
+
+def test_truncated_bucket_kept_apart_from_real_category(other_named_customer):
+    full = run_report('customer', START, END)
+    real_value = full.values[full.labels.index(OTHER_LABEL)]
+
+    report = run_report('customer', START, END, top_n=7)
+    assert len(report.labels) == 8
+    assert report.labels[0] == report.labels[-1] == OTHER_LABEL
+    assert report.values[0] == real_value
+    assert len(report.z_scores) == len(report.labels)
+    assert report.z_scores[-1] is None and None not in report.z_scores[:-1]
+    assert sum(report.values) == sum(full.values)
+
+
+def test_bundle_matches_single_report(app, other_named_customer, monkeypatch):
+    monkeypatch.setitem(app.config, 'REPORT_MAX_CATEGORIES', 5)
+    bundle = {report.criterion: report for report in run_report_bundle(START, END)}
+    assert bundle['customer'] == run_report('customer', START, END)
+
+
+# ----------------------------------------------------------------------
+# 'ÖSSZES' VÁLASZTÁS: legfeljebb REPORT_MAX_CATEGORIES kategória, a többi 'Egyéb' (a címben jelölve)
+# ----------------------------------------------------------------------
+@pytest.fixture
+def many_customers(app, make_complaints, monkeypatch):
+    monkeypatch.setitem(app.config, 'REPORT_MAX_CATEGORIES', 50)
+    make_complaints(1200, days=30, lookups=60)
+    assert db.session.query(Reklamacio.customer_id).distinct().count() > 50
+
+
+def test_all_categories_capped_with_other_row(many_customers):
+    report = run_report('customer', START, END)
+    assert len(report.labels) == 51
+    assert report.labels[-1] == OTHER_LABEL
+    assert report.labels[:-1] == sorted(report.labels[:-1])
+    assert sum(report.values) == Reklamacio.query.count()
+    assert '50 legnagyobb' in report.title
+
+
+def test_non_additive_other_row_recomputed(many_customers):
+    costs = {}
+    for complaint in Reklamacio.query.all():
+        costs.setdefault(complaint.customer.display_name, []).append(complaint.total_cost)
+    ranking = sorted(costs, key=lambda name: (-np.percentile(costs[name], 50), name))
+    tail = [cost for name in ranking[50:] for cost in costs[name]]
+
+    report = run_report('customer', START, END, measure_key='median_cost')
+    assert len(report.labels) == 51 and report.labels[-1] == OTHER_LABEL
+    assert set(report.labels[:-1]) == set(ranking[:50])
+    assert report.values[-1] == pytest.approx(np.percentile(tail, 50))
+    assert report.z_scores[-1] is None
+
+
+# ----------------------------------------------------------------------
+# TOP-N A KÉRÉSBŐL: csak a választék értékei, minden más 0
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize('value, expected', [
+    ('5', 5), ('20', 20), (10, 10), ('0', 0), ('', 0), (None, 0), ('-5', 0), ('7', 0), ('abc', 0), ('1e3', 0),
+])
+def test_top_n_value(value, expected):
+    assert top_n_value(value) == expected
+
+
+@pytest.mark.parametrize('top_n', ['-5', 'abc', '7'])
+def test_email_route_ignores_invalid_top_n(logged_in_client, make_complaints, monkeypatch, top_n):
+    make_complaints(30, days=20)
+    sent = []
+    monkeypatch.setattr('application.routes.send_report_email',
+                        lambda recipient, pdf, filename, title, date_range: sent.append(title) or True)
+    response = logged_in_client.post('/reports/send_email', data={
+        'recipient_email': 'cimzett@example.com', 'start_date': START.isoformat(), 'end_date': END.isoformat(),
+        'group_by': 'customer', 'top_n': top_n, 'chart_type': 'bar',
+    })
+    assert response.status_code == 302
+    assert len(sent) == 1 and 'Top' not in sent[0]
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from datetime import date, timedelta
+import pytest
+from application import db
+from application.models import Reklamacio, ComplaintMonthlyRollup, Status
+from application.utils import rollup
+from application.utils.helpers import add_months
+from application.utils.rollup import (
+    rollup_add, rollup_remove, rollup_snapshot, rebuild_rollup, monthly_totals, split_month_range
+)
+
+
+# ----------------------------------------------------------------------
+# HAVI ÖSSZESÍTŐ
+# - Havi összegek: teljes hónapok az összesítőből, töredékhónapok a nyers táblából, egyezés a nyers adatokkal
+# - Inkrementális karbantartás upserttel és upsert nélküli adatbázison (a hónap újraszámolása)
+# ----------------------------------------------------------------------
+def _raw_totals(start, end, measure):
+    totals = defaultdict(float)
+    for reklamacio in Reklamacio.query.filter(Reklamacio.complaint_date.between(start, end)):
+        key = reklamacio.complaint_date.strftime('%Y-%m')
+        totals[key] += 1 if measure == 'count' else float(reklamacio.total_cost or 0)
+    return dict(totals)
+
+
+def _ranges():
+    """ Közepén kezdődő és végződő, egy hónapon belüli és hónaphatárokra illeszkedő időszakok. """
+    month = add_months(date.today(), -10)
+    return [
+        (month.replace(day=15), add_months(month, 6).replace(day=10)),
+        (month.replace(day=5), month.replace(day=20)),
+        (month.replace(day=20), add_months(month, 1).replace(day=3)),
+        (month, add_months(month, 4) - timedelta(days=1)),
+    ]
+
+
+@pytest.mark.parametrize('measure', ['count', 'cost'])
+def test_monthly_totals_match_raw_data(make_complaints, measure):
+    make_complaints(600, days=400)
+    for start, end in _ranges():
+        totals = monthly_totals(start, end, measure)
+        raw = _raw_totals(start, end, measure)
+        assert totals.keys() == raw.keys()
+        for key, value in raw.items():
+            assert totals[key] == pytest.approx(value)
+
+
+def test_mid_month_range_reads_partial_months_from_raw_table(make_complaints):
+    make_complaints(600, days=400)
+    start, end = _ranges()[0]
+    full_range, partial_ranges = split_month_range(start, end)
+    assert full_range == (add_months(start, 1), add_months(end, 0))
+    assert partial_ranges == [(start, add_months(start, 1)), (add_months(end, 0), end + timedelta(days=1))]
+
+    # --- A töredékhónapok csak az időszakba eső napokat számolják (nem a teljes hónap összesítő sorát) ---
+    totals = monthly_totals(start, end, 'count')
+    first_key, last_key = start.strftime('%Y-%m'), end.strftime('%Y-%m')
+    whole_first = Reklamacio.query.filter(Reklamacio.complaint_date >= add_months(start, 0),
+                                          Reklamacio.complaint_date < add_months(start, 1)).count()
+    assert 0 < totals[first_key] < whole_first
+    assert totals[first_key] == Reklamacio.query.filter(Reklamacio.complaint_date >= start,
+                                                        Reklamacio.complaint_date < add_months(start, 1)).count()
+    assert totals[last_key] == Reklamacio.query.filter(Reklamacio.complaint_date >= add_months(end, 0),
+                                                       Reklamacio.complaint_date <= end).count()
+
+
+def _rollup_rows():
+    table = ComplaintMonthlyRollup.__table__
+    return sorted(tuple(row) for row in db.session.execute(db.select(
+        *[table.c[col] for col in rollup.ROLLUP_KEY_COLUMNS + rollup.ROLLUP_FLAG_COLUMNS + rollup.ROLLUP_VALUE_COLUMNS]
+    )))
+
+
+@pytest.mark.parametrize('upsert', [True, False], ids=['upsert', 'recompute'])
+def test_incremental_maintenance_matches_rebuild(make_complaints, monkeypatch, upsert):
+    make_complaints(200, days=120)
+    if not upsert:
+        monkeypatch.setattr(rollup, 'UPSERT_INSERTS', {})
+    complaints = Reklamacio.query.order_by(Reklamacio.id).all()
+
+    # --- Új reklamáció (a routes.py új reklamáció útvonalához hasonlóan) ---
+    template = complaints[0]
+    new_complaint = Reklamacio(
+        complaint_date=date.today(), complaint_number='R-uj', product_identifier='P-uj', quantity=4,
+        requires_return=True, description='Új', shipping_date=date.today(), total_cost=1234, user=template.user,
+        department=template.department, customer=template.customer, product=template.product,
+        defect_type=template.defect_type, status=template.status,
+    )
+    db.session.add(new_complaint)
+    rollup_add(new_complaint)
+
+    # --- Módosítás: másik hónapba és másik státuszba kerül ---
+    edited = complaints[1]
+    before = rollup_snapshot(edited)
+    edited.complaint_date = add_months(edited.complaint_date, -2)
+    edited.status = Status.query.filter(Status.id != edited.status_id).first()
+    edited.total_cost = (edited.total_cost or 0) + 500
+    rollup_remove(before)
+    rollup_add(edited)
+
+    # --- Törlés ---
+    deleted = complaints[2]
+    before = rollup_snapshot(deleted)
+    db.session.delete(deleted)
+    rollup_remove(before)
+    db.session.commit()
+
+    incremental = _rollup_rows()
+    rebuild_rollup()
+    db.session.commit()
+    assert incremental == _rollup_rows()
@@ -0,0 +1,106 @@
+from datetime import date, timedelta
+import numpy as np
+import pytest
+from application import db
+from application.models import Customer, Reklamacio
+from application.utils.report_engine import run_report
+from application.utils.statistics import PercentileCont, z_scores, outlier_flags
+
+
+# ----------------------------------------------------------------------
+# STATISZTIKAI MÉRŐSZÁMOK ÉS KIUGRÓ ÉRTÉKEK
+# - Medián / p90: az SQLite aggregátum (és a riport mérőszámai) a numpy.percentile eredményével azonos
+# - Egységköltség nulla darabszámnál: 0, nem nullával osztás
+# - Kiugró értékek: egy kategóriánál nincs, azonos értékeknél minden z-score 0
+# ----------------------------------------------------------------------
+START, END = date.today() - timedelta(days=60), date.today()
+
+
+def _costs_by_customer():
+    costs = {}
+    for complaint in Reklamacio.query.all():
+        costs.setdefault(complaint.customer.display_name, []).append(complaint.total_cost)
+    return costs
+
+
+def _assign_customers(names):
+    """ A reklamációk vevője sorban a megadott nevű vevők közül (egyenletes elosztás). """
+    customers = [Customer.query.filter_by(name=name).one() for name in names]
+    for i, complaint in enumerate(Reklamacio.query.order_by(Reklamacio.id)):
+        complaint.customer = customers[i % len(customers)]
+    db.session.commit()
+
+
+@pytest.mark.parametrize('fraction', [0.0, 0.25, 0.5, 0.9, 1.0])
+def test_percentile_aggregate_matches_numpy(make_complaints, fraction):
+    make_complaints(101, days=60, seed=7)
+    costs = [c.total_cost for c in Reklamacio.query.all()]
+    result = db.session.query(PercentileCont(Reklamacio.total_cost, fraction)).scalar()
+    assert result == pytest.approx(np.percentile(costs, fraction * 100))
+
+
+def test_percentile_of_empty_group_is_null(app):
+    assert db.session.query(PercentileCont(Reklamacio.total_cost, 0.5)).scalar() is None
+
+
+@pytest.mark.parametrize('measure_key, fraction', [('median_cost', 50), ('p90_cost', 90)])
+def test_percentile_measures_match_numpy(make_complaints, measure_key, fraction):
+    make_complaints(200, days=60, seed=3)
+    expected = {name: np.percentile(costs, fraction) for name, costs in _costs_by_customer().items()}
+
+    report = run_report('customer', START, END, measure_key=measure_key)
+    assert dict(zip(report.labels, report.values)) == pytest.approx(expected)
+
+
+def test_cost_per_unit_with_zero_quantity(make_complaints):
+    make_complaints(40, days=60, lookups=2)
+    zero, other = (Customer.query.filter_by(name=name).one() for name in ('Customer0', 'Customer1'))
+    for complaint in Reklamacio.query.filter_by(customer=zero):
+        complaint.quantity = 0
+    db.session.commit()
+    others = Reklamacio.query.filter_by(customer=other).all()
+
+    report = run_report('customer', START, END, measure_key='cost_per_unit')
+    values = dict(zip(report.labels, report.values))
+    assert values[zero.display_name] == 0
+    assert values[other.display_name] == pytest.approx(
+        sum(c.total_cost for c in others) / sum(c.quantity for c in others))
+
+
+def test_no_outliers_for_single_category(make_complaints):
+    make_complaints(10, days=60, lookups=1)
+    report = run_report('customer', START, END)
+    assert report.labels == [Customer.query.one().display_name]
+    assert report.z_scores is None and report.outliers is None
+
+
+def test_no_outliers_for_zero_variance(make_complaints):
+    make_complaints(12, days=60, lookups=4)
+    _assign_customers(['Customer0', 'Customer1', 'Customer2', 'Customer3'])
+    report = run_report('customer', START, END)
+    assert report.values == [3, 3, 3, 3]
+    assert report.z_scores == [0.0, 0.0, 0.0, 0.0]
+    assert report.outliers is None
+
+
+def test_outlier_flagged(make_complaints):
+    make_complaints(30, days=60, lookups=10)
+    _assign_customers(['Customer0'] * 12 + [f"Customer{i}" for i in range(1, 10)] * 2)
+    outlier = Customer.query.filter_by(name='Customer0').one().display_name
+    report = run_report('customer', START, END)
+    assert report.outliers == [label == outlier for label in report.labels]
+
+
+@pytest.mark.parametrize('values, expected', [
+    ([], []),
+    ([5], [0.0]),
+    ([2, 2, 2], [0.0, 0.0, 0.0]),
+    ([1, 2, 3], [-1.22, 0.0, 1.22]),
+])
+def test_z_scores(values, expected):
+    assert z_scores(values) == expected
+
+
+def test_outlier_flags_threshold():
+    assert outlier_flags([-2.5, -1.0, 0.0, 2.0, 1.99], 2.0) == [True, False, False, True, False]
+    assert outlier_flags([], 2.0) == []
@@ -0,0 +1,79 @@
+from datetime import date
+import pytest
+from application import db
+from application.models import Reklamacio
+from application.utils.report_engine import run_report
+from application.utils.time_buckets import ComparisonPeriod, comparison_period, shift_forward, shift_months
+
+
+# ----------------------------------------------------------------------
+# ÖSSZEHASONLÍTÓ IDŐSZAKOK
+# - 'previous': teljes naptári időszakoknál a megelőző naptári időszak, egyébként azonos hosszú napok
+# - 'year': egy évvel korábban; a hónapos eltolás SQL-ben is a hónap végére igazít (szökőév)
+# ----------------------------------------------------------------------
+@pytest.mark.parametrize('kind, start, end, granularity, expected', [
+    ('previous', date(2024, 2, 1), date(2024, 2, 29), 'month', (date(2024, 1, 1), date(2024, 1, 31), 1, 0)),
+    ('previous', date(2024, 3, 1), date(2024, 3, 31), 'month', (date(2024, 2, 1), date(2024, 2, 29), 1, 0)),
+    ('previous', date(2024, 1, 1), date(2024, 3, 31), 'quarter', (date(2023, 10, 1), date(2023, 12, 31), 3, 0)),
+    ('previous', date(2024, 1, 1), date(2024, 3, 31), 'month', (date(2023, 10, 1), date(2023, 12, 31), 3, 0)),
+    ('previous', date(2024, 1, 1), date(2024, 12, 31), 'year', (date(2023, 1, 1), date(2023, 12, 31), 12, 0)),
+    ('previous', date(2024, 2, 1), date(2024, 3, 31), 'quarter', (date(2023, 12, 3), date(2024, 1, 31), 0, 60)),
+    ('previous', date(2024, 2, 10), date(2024, 2, 29), 'month', (date(2024, 1, 21), date(2024, 2, 9), 0, 20)),
+    ('previous', date(2024, 2, 1), date(2024, 2, 29), 'day', (date(2024, 1, 3), date(2024, 1, 31), 0, 29)),
+    ('previous', date(2024, 3, 4), date(2024, 3, 17), 'week', (date(2024, 2, 19), date(2024, 3, 3), 0, 14)),
+    ('year', date(2024, 2, 1), date(2024, 2, 29), 'month', (date(2023, 2, 1), date(2023, 2, 28), 12, 0)),
+    ('year', date(2025, 2, 1), date(2025, 2, 28), 'month', (date(2024, 2, 1), date(2024, 2, 29), 12, 0)),
+    ('year', date(2024, 2, 29), date(2024, 3, 10), 'day', (date(2023, 2, 28), date(2023, 3, 10), 12, 0)),
+])
+def test_comparison_period(kind, start, end, granularity, expected):
+    assert comparison_period(kind, start, end, granularity) == ComparisonPeriod(*expected)
+
+
+@pytest.mark.parametrize('day, months, expected', [
+    (date(2024, 1, 31), 1, date(2024, 2, 29)),
+    (date(2023, 1, 31), 1, date(2023, 2, 28)),
+    (date(2024, 2, 29), 12, date(2025, 2, 28)),
+    (date(2024, 2, 29), -12, date(2023, 2, 28)),
+    (date(2024, 3, 31), -1, date(2024, 2, 29)),
+    (date(2024, 5, 15), -3, date(2024, 2, 15)),
+])
+def test_shift_months(day, months, expected):
+    assert shift_months(day, months) == expected
+
+
+DATES = [date(2023, 1, 31), date(2023, 2, 28), date(2024, 1, 31), date(2024, 2, 28), date(2024, 2, 29),
+         date(2024, 3, 31), date(2024, 12, 31), date(2025, 2, 28)]
+
+
+@pytest.fixture
+def dated_complaints(make_complaints):
+    """ Egy-egy reklamáció a DATES napjain. """
+    make_complaints(len(DATES), days=10)
+    for complaint, day in zip(Reklamacio.query.order_by(Reklamacio.id), DATES):
+        complaint.complaint_date = day
+    db.session.commit()
+
+
+@pytest.mark.parametrize('months', [1, 3, 12])
+def test_sql_month_shift_matches_python(dated_complaints, months):
+    shifted = shift_forward(ComparisonPeriod(None, None, months, 0))
+    rows = db.session.query(Reklamacio.complaint_date, shifted).order_by(Reklamacio.complaint_date).all()
+    assert [date.fromisoformat(str(value)[:10]) for _, value in rows] == [shift_months(day, months) for day in DATES]
+
+
+def test_previous_month_comparison_uses_calendar_month(dated_complaints):
+    report = run_report('monthly_count', date(2024, 2, 1), date(2024, 2, 29), granularity='month', compare='previous')
+    assert report.labels == ['2024-02']
+    assert report.values == [2] and report.comparison_values == [1]
+    assert '2024.01.01 - 2024.01.31' in report.comparison_label
+
+
+def test_year_comparison_over_leap_day(dated_complaints):
+    report = run_report('monthly_count', date(2025, 2, 1), date(2025, 2, 28), granularity='day', compare='year')
+    values = dict(zip(report.labels, zip(report.values, report.comparison_values)))
+    assert values['2025-02-28'] == (1, 2)
+    assert sum(report.comparison_values) == 2
+
+    report = run_report('monthly_count', date(2024, 2, 1), date(2024, 2, 29), granularity='day', compare='year')
+    values = dict(zip(report.labels, zip(report.values, report.comparison_values)))
+    assert values['2024-02-28'] == (1, 1) and values['2024-02-29'] == (1, 0)
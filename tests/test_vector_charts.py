@@ -0,0 +1,81 @@
+import pytest
+from application.utils.pdf_generator import generate_report_pdf, generate_pivot_pdf
+from application.utils.report_engine import PivotResult
+from application.utils.vector_charts import report_drawing, pivot_drawing
+from reportlab.graphics.shapes import String
+
+
+# ----------------------------------------------------------------------
+# PDF DIAGRAMOK (alapértelmezett: vektoros, logaritmikus skálánál Matplotlib PNG)
+# - Minden diagram típus 0, 1 és sok kategóriával, nulla értékekkel is; az eredmény érvényes PDF
+# ----------------------------------------------------------------------
+CATEGORY_COUNTS = [0, 1, 80]
+
+
+def _report_data(count, with_zero=False):
+    labels = [f"Kategória {i}" for i in range(count)]
+    values = [float(0 if with_zero and i % 3 == 0 else (i % 7 + 1) * 10) for i in range(count)]
+    return labels, values
+
+
+def _assert_pdf(buffer):
+    data = buffer.getvalue()
+    assert data.startswith(b'%PDF-')
+    assert data.rstrip().endswith(b'%%EOF')
+    assert b'/Type /Page' in data
+
+
+@pytest.mark.parametrize('chart_type', ['bar', 'line', 'pie'])
+@pytest.mark.parametrize('count', CATEGORY_COUNTS)
+@pytest.mark.parametrize('use_log_scale', [False, True])
+@pytest.mark.parametrize('with_zero', [False, True])
+def test_report_chart(app, chart_type, count, use_log_scale, with_zero):
+    labels, values = _report_data(count, with_zero)
+    _assert_pdf(generate_report_pdf(labels, values, "Teszt riport", chart_type, use_log_scale, unit='db'))
+
+
+@pytest.mark.parametrize('chart_type', ['bar', 'line'])
+@pytest.mark.parametrize('count', CATEGORY_COUNTS)
+def test_report_chart_with_comparison_pareto_and_outliers(app, chart_type, count):
+    labels, values = _report_data(count, with_zero=True)
+    total = sum(values) or 1
+    cumulative = [round(sum(values[:i + 1]) / total * 100, 1) for i in range(count)]
+    outliers = [i == 1 for i in range(count)]
+    _assert_pdf(generate_report_pdf(labels, values, "Összevetés", chart_type, cumulative_percent=cumulative,
+                                    outliers=outliers, unit='Ft'))
+    _assert_pdf(generate_report_pdf(labels, values, "Összevetés", chart_type, comparison_values=values[::-1],
+                                    comparison_label="Előző időszak", outliers=outliers, unit='Ft'))
+
+
+def _pivot(rows, columns, with_zero=False):
+    cells = [[0.0 if with_zero and (i + j) % 2 else float(i + j + 1) for j in range(columns)] for i in range(rows)]
+    return PivotResult(
+        criterion='customer', pivot_by='status', title="Kereszttábla", unit='db',
+        row_labels=[f"Vevő {i}" for i in range(rows)], column_labels=[f"Státusz {j}" for j in range(columns)],
+        cells=cells, row_totals=None, column_totals=None, grand_total=None,
+        max_value=max((max(row) for row in cells if row), default=0.0),
+    )
+
+
+@pytest.mark.parametrize('chart_type', ['bar', 'line'])
+@pytest.mark.parametrize('rows, columns', [(0, 0), (1, 1), (1, 3), (40, 8)])
+@pytest.mark.parametrize('use_log_scale', [False, True])
+def test_pivot_chart(app, chart_type, rows, columns, use_log_scale):
+    _assert_pdf(generate_pivot_pdf(_pivot(rows, columns, with_zero=True), chart_type, use_log_scale))
+
+
+def _texts(drawing):
+    return [item.text for item in drawing.contents if isinstance(item, String)]
+
+
+@pytest.mark.parametrize('chart_type', ['bar', 'line', 'pie'])
+def test_empty_report_drawing_has_no_data_label(chart_type):
+    assert "Nincs megjeleníthető adat" in _texts(report_drawing([], [], "Üres", 'Helvetica', chart_type))
+
+
+def test_zero_pie_drawing_has_no_data_label():
+    assert "Nincs megjeleníthető adat" in _texts(report_drawing(["A", "B"], [0.0, 0.0], "Nulla", 'Helvetica', 'pie'))
+
+
+def test_empty_pivot_drawing_has_no_data_label():
+    assert "Nincs megjeleníthető adat" in _texts(pivot_drawing(_pivot(0, 0), 'Helvetica'))